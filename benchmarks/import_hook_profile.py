@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Import-hook overhead benchmark and startup profiler.
+
+Generates a package tree of synthetic modules (see `synthetic.py`) and
+measures the end-to-end time to import all of it in a fresh interpreter:
+
+- plain: regular imports, no bytecode cache (cold start of a fresh deploy)
+- plain_pyc: regular imports from a warm `__pycache__`
+- zvic: imports through `install_import_hook`
+
+For the zvic mode the time is also broken down into the phases of the hook:
+`find_spec`, read, parse, transform (`AnnotateCallsTransformer`), strip
+(`strip_constrain_calls`), compile and exec. The one-off cost of importing
+zvic itself is reported separately (import_zvic) and excluded from totals. Every mode runs `--repeat` times, each in a new
+subprocess; min and median per figure are written as JSON.
+
+Usage:
+    python benchmarks/import_hook_profile.py [--modules 20] [--functions 50]
+        [--repeat 5] [--output profile.json]
+"""
+
+import argparse
+import ast
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import UTC, datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+PACKAGE = "startup_bench"
+MODES = ("plain", "plain_pyc", "zvic")
+
+
+def write_package(root: Path, n_modules: int, n_functions: int) -> list[str]:
+    """Write a package with `n_modules` modules in subpackages of ten and
+    return the dotted names of all modules to import."""
+    sys.path.insert(0, str(BENCH_DIR))
+    from synthetic import module_source
+
+    source = module_source(n_functions, "a")
+    pkg = root / PACKAGE
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    names = [PACKAGE]
+    for i in range(n_modules):
+        sub = f"sub{i // 10}"
+        if not (pkg / sub).exists():
+            (pkg / sub).mkdir()
+            (pkg / sub / "__init__.py").write_text("", encoding="utf-8")
+            names.append(f"{PACKAGE}.{sub}")
+        (pkg / sub / f"m{i}.py").write_text(source, encoding="utf-8")
+        names.append(f"{PACKAGE}.{sub}.m{i}")
+    return names
+
+
+# --- child process ---------------------------------------------------------
+
+phases: dict[str, float] = defaultdict(float)
+
+
+class _Timer:
+    def __init__(self, phase: str):
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        phases[self.phase] += time.perf_counter() - self.start
+
+
+def _profiling_finder(allow_roots: list[str]):
+    from zvic.annotation_constraints import AnnotateCallsTransformer
+    from zvic.ast_utils import strip_constrain_calls
+    from zvic.import_hook import ZvicFinder, ZvicLoader
+
+    class ProfilingLoader(ZvicLoader):
+        # Mirrors ZvicLoader.exec_module step by step, timing each step.
+        def exec_module(self, module):
+            with _Timer("read"):
+                source = Path(self.path).read_text(encoding="utf-8")
+            with _Timer("parse"):
+                tree = ast.parse(source, filename=self.path)
+            with _Timer("transform"):
+                tree = AnnotateCallsTransformer().visit(tree)
+                ast.fix_missing_locations(tree)
+            with _Timer("strip"):
+                strip_constrain_calls(tree)
+                ast.fix_missing_locations(tree)
+            with _Timer("compile"):
+                code = compile(tree, self.path, "exec")
+            module.__dict__["__file__"] = self.path
+            with _Timer("exec"):
+                exec(code, module.__dict__)  # noqa: S102
+
+    class ProfilingFinder(ZvicFinder):
+        def find_spec(self, fullname, path, target=None):
+            with _Timer("find_spec"):
+                spec = super().find_spec(fullname, path, target)
+            if spec is not None:
+                spec.loader = ProfilingLoader(fullname, spec.origin)
+            return spec
+
+    return ProfilingFinder(allow_roots=allow_roots)
+
+
+def child(mode: str, root: str, names: list[str]) -> dict:
+    sys.path.insert(0, str(REPO_ROOT / "src"))
+    sys.path.insert(0, root)
+    # The synthetic modules import zvic themselves; import it up front in
+    # every mode so the totals only cover the generated package.
+    with _Timer("import_zvic"):
+        import zvic  # noqa: F401
+    if mode == "zvic":
+        sys.meta_path.insert(0, _profiling_finder([root]))
+    start = time.perf_counter()
+    for name in names:
+        __import__(name)
+    total = time.perf_counter() - start
+    return {"total_s": total, "phases_s": dict(phases)}
+
+
+# --- parent process --------------------------------------------------------
+
+
+def run_child(mode: str, root: Path, manifest: Path) -> dict:
+    env = dict(os.environ)
+    if mode == "plain_pyc":
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        flags = []
+    else:
+        flags = ["-B"]
+    out = subprocess.run(
+        [sys.executable, *flags, __file__, "--child", mode, str(root), str(manifest)],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    ).stdout
+    return json.loads(out)
+
+
+def _clear_pycache(root: Path) -> None:
+    for cache in root.rglob("__pycache__"):
+        for f in cache.iterdir():
+            f.unlink()
+        cache.rmdir()
+
+
+def _summary(values: list[float]) -> dict:
+    return {"min_s": min(values), "median_s": statistics.median(values)}
+
+
+def profile(n_modules: int, n_functions: int, repeat: int) -> dict:
+    report: dict = {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "modules": n_modules,
+        "functions_per_module": n_functions,
+        "repeat": repeat,
+        "modes": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="zvic-startup-") as tmp:
+        root = Path(tmp)
+        names = write_package(root, n_modules, n_functions)
+        manifest = root / "manifest.json"
+        manifest.write_text(json.dumps(names), encoding="utf-8")
+        for mode in MODES:
+            _clear_pycache(root)
+            if mode == "plain_pyc":
+                run_child(mode, root, manifest)  # warm the bytecode cache
+            runs = [run_child(mode, root, manifest) for _ in range(repeat)]
+            entry = {"total": _summary([r["total_s"] for r in runs])}
+            phase_names = sorted({p for r in runs for p in r["phases_s"]})
+            if phase_names:
+                entry["phases"] = {
+                    p: _summary([r["phases_s"].get(p, 0.0) for r in runs])
+                    for p in phase_names
+                }
+            report["modes"][mode] = entry
+            print(
+                f"{mode:>10} total min={entry['total']['min_s']:.4f}s",
+                file=sys.stderr,
+            )
+    plain = report["modes"]["plain"]["total"]["min_s"]
+    report["zvic_overhead_ratio"] = report["modes"]["zvic"]["total"]["min_s"] / plain
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--child"]:
+        _, mode, root, manifest = argv
+        names = json.loads(Path(manifest).read_text(encoding="utf-8"))
+        print(json.dumps(child(mode, root, names)))
+        return 0
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--modules", type=int, default=20)
+    p.add_argument("--functions", type=int, default=50, help="Functions per module")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--output", type=Path, help="Write JSON here instead of stdout")
+    args = p.parse_args(argv)
+    report = profile(args.modules, args.functions, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Benchmark suite for the ZVIC compatibility checker.
+
+Generates synthetic modules of increasing size (see `synthetic.py`) and times
+the main entry points on them:
+
+- import_hook: importing version A through `install_import_hook`
+- load_module: `load_module` of version A
+- canonicalize: `canonicalize` of version A (cold signature cache)
+- is_compatible: `is_compatible(mod_a, mod_b)` (cold caches)
+- are_params_compatible: all function pairs of A and B
+- is_type_compatible: all parameter type pairs of A and B (cold verdict cache)
+
+Every benchmark runs `--repeat` times per size; the minimum and median wall
+times are written as JSON (default: stdout) for regression tracking.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 10 100 1000 10000]
+        [--repeat 3] [--only is_compatible ...] [--output results.json]
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import module_source
+
+from zvic import (
+    are_params_compatible,
+    canonicalize,
+    install_import_hook,
+    is_type_compatible,
+    load_module,
+)
+from zvic.compatibility import is_compatible
+from zvic.compatibility_protocols import clear_protocol_cache
+from zvic.compatibility_types import type_verdicts
+from zvic.exception import SignatureIncompatible
+from zvic.main import clear_signature_cache, uninstall_import_hook
+from zvic.type_registry import clear_type_registry
+from zvic.utils import prepare_params
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+
+def clear_caches() -> None:
+    clear_signature_cache()
+    clear_protocol_cache()
+    clear_type_registry()
+    type_verdicts.clear()
+
+
+def _functions(mod) -> dict[str, Callable]:
+    return {
+        name: obj
+        for name, obj in vars(mod).items()
+        if inspect.isfunction(obj) and obj.__module__ == mod.__name__
+    }
+
+
+class Workload:
+    """Synthetic version A/B sources of one size, written to a temp dir."""
+
+    def __init__(self, root: Path, size: int):
+        self.size = size
+        self.root = root
+        self.path_a = root / f"bench_a_{size}.py"
+        self.path_b = root / f"bench_b_{size}.py"
+        self.path_a.write_text(module_source(size, "a"), encoding="utf-8")
+        self.path_b.write_text(module_source(size, "b"), encoding="utf-8")
+        self._loads = 0
+        self.mod_a = self.load("a")
+        self.mod_b = self.load("b")
+        funcs_a, funcs_b = _functions(self.mod_a), _functions(self.mod_b)
+        self.signature_pairs = [
+            (inspect.signature(funcs_a[n]), inspect.signature(funcs_b[n]))
+            for n in sorted(funcs_a)
+        ]
+        self.type_pairs = []
+        for n in sorted(funcs_a):
+            a_params = prepare_params(inspect.signature(funcs_a[n]), funcs_a[n])
+            b_params = prepare_params(inspect.signature(funcs_b[n]), funcs_b[n])
+            for group in ("posonly", "pos_or_kw", "kwonly"):
+                for a_p, b_p in zip(getattr(a_params, group), getattr(b_params, group)):
+                    self.type_pairs.append((a_p["type"], b_p["type"]))
+
+    def load(self, version: str):
+        # A fresh module name per load so nothing is shared between repeats.
+        self._loads += 1
+        path = self.path_a if version == "a" else self.path_b
+        return load_module(path, f"bench_{version}_{self.size}_{self._loads}")
+
+
+def bench_import_hook(w: Workload) -> None:
+    # Module names must not start with "zvic": the hook never transforms those.
+    name = w.path_a.stem
+    sys.modules.pop(name, None)
+    install_import_hook(allow_roots=[str(w.root)])
+    try:
+        importlib.import_module(name)
+    finally:
+        uninstall_import_hook()
+        sys.modules.pop(name, None)
+
+
+def bench_load_module(w: Workload) -> None:
+    w.load("a")
+
+
+def bench_canonicalize(w: Workload) -> None:
+    clear_signature_cache()
+    canonicalize(w.mod_a)
+
+
+def bench_is_compatible(w: Workload) -> None:
+    clear_caches()
+    is_compatible(w.mod_a, w.mod_b)
+
+
+def bench_are_params_compatible(w: Workload) -> None:
+    for a_sig, b_sig in w.signature_pairs:
+        are_params_compatible(a_sig, b_sig)
+
+
+def bench_is_type_compatible(w: Workload) -> None:
+    type_verdicts.clear()
+    for a, b in w.type_pairs:
+        try:
+            is_type_compatible(a, b)
+        except SignatureIncompatible:
+            pass
+
+
+BENCHMARKS: dict[str, Callable[[Workload], None]] = {
+    "import_hook": bench_import_hook,
+    "load_module": bench_load_module,
+    "canonicalize": bench_canonicalize,
+    "is_compatible": bench_is_compatible,
+    "are_params_compatible": bench_are_params_compatible,
+    "is_type_compatible": bench_is_type_compatible,
+}
+
+
+def timed(fn: Callable[[Workload], None], w: Workload, repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(w)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run(sizes, repeat: int, only=None) -> dict:
+    selected = {k: v for k, v in BENCHMARKS.items() if not only or k in only}
+    results = []
+    with tempfile.TemporaryDirectory(prefix="zvic-bench-") as tmp:
+        sys.path.insert(0, tmp)
+        try:
+            for size in sizes:
+                w = Workload(Path(tmp), size)
+                for name, fn in selected.items():
+                    times = timed(fn, w, repeat)
+                    results.append(
+                        {
+                            "benchmark": name,
+                            "size": size,
+                            "repeat": repeat,
+                            "min_s": min(times),
+                            "median_s": statistics.median(times),
+                        }
+                    )
+                    print(
+                        f"{name:>24} n={size:<6} min={min(times):.4f}s",
+                        file=sys.stderr,
+                    )
+        finally:
+            sys.path.remove(tmp)
+    return {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS))
+    p.add_argument("--output", type=Path, help="Write JSON here instead of stdout")
+    args = p.parse_args(argv)
+    report = run(args.sizes, args.repeat, args.only)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
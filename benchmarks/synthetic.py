@@ -0,0 +1,107 @@
+"""Synthetic modules for the ZVIC benchmarks.
+
+`module_source(n, version)` renders a module with `n` functions cycling through
+a fixed set of signature shapes (positional-only, keyword-only, defaults,
+constrained, generic, class-typed), plus one class and one enum per ten
+functions. Version "b" is a compatible evolution of version "a": it widens
+types, drops constraints, appends optional parameters and adds enum members
+and methods, so `is_compatible(a, b)` walks the whole module without raising.
+Constraints only appear in version A, which keeps CrossHair out of the timings.
+"""
+
+SHAPES = (
+    "plain",
+    "posonly",
+    "kwonly",
+    "defaults",
+    "constrained",
+    "generic",
+    "classtyped",
+)
+
+HEADER = """\
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping, Sequence
+from enum import Enum
+from typing import Annotated  # also injected by the transform of constrained modules
+
+from zvic import _
+
+
+class Base:
+    pass
+
+
+class Item(Base):
+    pass
+
+"""
+
+
+def _function(i: int, shape: str, version: str) -> str:
+    b = version == "b"
+    if shape == "plain":
+        return f"def f{i}(a: int, b: str) -> int:\n    return a\n"
+    if shape == "posonly":
+        return f"def f{i}(a: int, /, b: float) -> float:\n    return b\n"
+    if shape == "kwonly":
+        extra = ", flag: bool = False" if b else ""
+        return f'def f{i}(a: int, *, key: str = "x"{extra}) -> str:\n    return key\n'
+    if shape == "defaults":
+        extra = ", d: int = 0" if b else ""
+        return (
+            f"def f{i}(a: int, b: int = 1, c: list[int] | None = None{extra}) -> int:\n"
+            "    return a + b\n"
+        )
+    if shape == "constrained":
+        if b:
+            return f"def f{i}(a: int, b: int) -> int:\n    return a\n"
+        return f"def f{i}(a: int(_ > 0), b: int(_ < 100)) -> int:\n    return a\n"
+    if shape == "generic":
+        a_type = "Mapping[str, Sequence[Base]]" if b else "dict[str, list[Item]]"
+        return (
+            f"def f{i}(a: {a_type}, cb: Callable[[int], str] | None = None) -> list[int]:\n"
+            "    return []\n"
+        )
+    if shape == "classtyped":
+        a_type = "Base" if b else "Item"
+        return (
+            f"def f{i}(a: {a_type}, b: int | None = None) -> None:\n    return None\n"
+        )
+    raise ValueError(shape)
+
+
+def _class(i: int, version: str) -> str:
+    src = (
+        f"class C{i}:\n"
+        f"    def __init__(self, value: int = 0):\n"
+        f"        self.value = value\n\n"
+        f"    def get(self, scale: int) -> int:\n"
+        f"        return self.value * scale\n\n"
+        f"    @classmethod\n"
+        f"    def make(cls, value: int) -> C{i}:\n"
+        f"        return cls(value)\n"
+    )
+    if version == "b":
+        src += "\n    def reset(self) -> None:\n        self.value = 0\n"
+    return src
+
+
+def _enum(i: int, version: str) -> str:
+    members = ["RED = 1", "GREEN = 2", "BLUE = 3"]
+    if version == "b":
+        members.append("ALPHA = 4")
+    body = "".join(f"    {m}\n" for m in members)
+    return f"class E{i}(Enum):\n{body}"
+
+
+def module_source(n_functions: int, version: str = "a") -> str:
+    """Render a synthetic module with `n_functions` functions."""
+    parts = [HEADER]
+    for i in range(n_functions):
+        parts.append(_function(i, SHAPES[i % len(SHAPES)], version))
+        if i % 10 == 0:
+            parts.append(_class(i, version))
+            parts.append(_enum(i, version))
+    return "\n\n".join(parts)
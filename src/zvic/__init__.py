@@ -1,4 +1,5 @@
-from .compatibility import is_compatible
+from .batch import PairResult, check_many
+from .compatibility import SymbolResult, is_compatible, iter_compatibility
 from .compatibility_params import are_params_compatible
 from .compatibility_types import is_type_compatible
 from .exception import SignatureIncompatible
@@ -27,4 +28,8 @@ __all__ = [
     "SignatureIncompatible",
     "is_type_compatible",
     "load_module",
+    "check_many",
+    "PairResult",
+    "iter_compatibility",
+    "SymbolResult",
 ]
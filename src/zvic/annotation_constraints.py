@@ -6,6 +6,9 @@ Rewrites any Call inside a type annotation as Annotated[BaseType, MetaExpr].
 """
 
 import ast
+import copy
+
+from .constraint import parse_constraint
 
 
 class AnnotateCallsTransformer(ast.NodeTransformer):
@@ -50,7 +53,9 @@ class AnnotateCallsTransformer(ast.NodeTransformer):
                             else None
                         )
                         if constraint:
-                            param_constraint = str(constraint).replace("_", arg.arg)
+                            param_constraint = (
+                                parse_constraint(str(constraint)).rename(arg.arg).source
+                            )
                             # Only update the AST constant for outer collection-level
                             # calls (e.g., list[...] (len(_) == 3)). Detect this
                             # when the original annotation was a Call whose func is
@@ -143,22 +148,42 @@ class AnnotateCallsTransformer(ast.NodeTransformer):
                     for param_name, param_type, _ in constraints
                     if param_type
                 ]
+                # One fused assertion per call covers every parameter
+                # constraint, including relations between parameters (e.g.
+                # `hi: int(_ > lo)`). Its message is only evaluated on
+                # failure and names the first constraint that does not hold.
+                tests = [
+                    parse_constraint(constraint, param_name).node()
+                    for param_name, _, constraint in constraints
+                ]
+                messages = [
+                    ast.JoinedStr(
+                        values=[
+                            ast.Constant(
+                                value=f"'{constraint}' not satisfied for {param_name}="
+                            ),
+                            ast.FormattedValue(
+                                value=ast.Name(id=param_name, ctx=ast.Load()),
+                                conversion=-1,
+                            ),
+                        ]
+                    )
+                    for param_name, _, constraint in constraints
+                ]
+                msg = messages[-1]
+                for test, message in zip(tests[-2::-1], messages[-2::-1]):
+                    msg = ast.IfExp(
+                        test=ast.UnaryOp(op=ast.Not(), operand=copy.deepcopy(test)),
+                        body=message,
+                        orelse=msg,
+                    )
                 constraint_asserts = [
                     ast.Assert(
-                        test=ast.parse(str(constraint), mode="eval").body,
-                        msg=ast.JoinedStr(
-                            values=[
-                                ast.Constant(
-                                    value=f"'{constraint}' not satisfied for {param_name}="
-                                ),
-                                ast.FormattedValue(
-                                    value=ast.Name(id=param_name, ctx=ast.Load()),
-                                    conversion=-1,
-                                ),
-                            ]
-                        ),
+                        test=tests[0]
+                        if len(tests) == 1
+                        else ast.BoolOp(op=ast.And(), values=tests),
+                        msg=msg,
                     )
-                    for param_name, _, constraint in constraints
                 ]
             # Compose new body: docstring (as true docstring), type asserts, constraint asserts, then rest
             new_body = []
@@ -182,8 +207,10 @@ class AnnotateCallsTransformer(ast.NodeTransformer):
         if return_constraint or return_type:
             # Replace _ with a unique variable name
             ret_var = "__return__"
-            constraint_expr_str = (
-                return_constraint.replace("_", ret_var) if return_constraint else None
+            return_expr = (
+                parse_constraint(return_constraint).rename(ret_var)
+                if return_constraint
+                else None
             )
 
             # Recursively transform all return statements in the function body
@@ -231,10 +258,9 @@ class AnnotateCallsTransformer(ast.NodeTransformer):
                         )
                     # Constraint assertion for return value
                     if return_constraint and __debug__:
-                        expr_ast = ast.parse(str(constraint_expr_str), mode="eval")
                         asserts.append(
                             ast.Assert(
-                                test=expr_ast.body,
+                                test=return_expr.node(),
                                 msg=ast.JoinedStr(
                                     values=[
                                         ast.Constant(
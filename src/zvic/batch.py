@@ -0,0 +1,128 @@
+"""Batch compatibility checks over many (A, B) pairs.
+
+    for result in check_many([("old/a.py", "new/a.py"), (mod_a, mod_b)]):
+        if not result.compatible:
+            print(result.index, result.error)
+
+Pairs run on a worker pool and results are yielded as they complete. Work is
+shared across the whole batch: each path is loaded once, identical pairs are
+checked once, and the process-wide verdict caches (type pairs, protocol
+conformance, CrossHair results) coalesce concurrent checks of the same key, so
+a type or constraint pair that recurs in many modules is analysed once.
+
+Workers hold `analysis_lock` shared while they load and check a pair, so no
+worker runs module or constraint code while CrossHair has the builtins
+patched for another worker's analysis.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from os import PathLike
+from pathlib import Path
+from types import ModuleType
+from typing import Any, NamedTuple
+
+from .compatibility import is_compatible
+from .crosshair_inprocess import analysis_lock
+from .main import load_module
+
+
+class PairResult(NamedTuple):
+    # Position of the pair in the input.
+    index: int
+    a: Any
+    b: Any
+    # SignatureIncompatible if B breaks A, CompatibilityUnknown if the pair's
+    # time budget ran out first, any other exception raised while loading or
+    # checking the pair, or None if B is compatible.
+    error: BaseException | None
+
+    @property
+    def compatible(self) -> bool:
+        return self.error is None
+
+
+class _ModuleLoader:
+    """Loads each path once per batch, even when requested concurrently."""
+
+    def __init__(self):
+        self._modules: dict[Path, ModuleType] = {}
+        self._locks: dict[Path, threading.Lock] = {}
+        self._names = itertools.count()
+        self._lock = threading.Lock()
+
+    def __call__(self, obj: Any) -> Any:
+        if not isinstance(obj, str | PathLike):
+            return obj
+        path = Path(obj).resolve()
+        with self._lock:
+            path_lock = self._locks.setdefault(path, threading.Lock())
+        with path_lock:
+            mod = self._modules.get(path)
+            if mod is None:
+                with self._lock:
+                    n = next(self._names)
+                mod = load_module(path, f"{path.stem}__zvic_batch_{n}")
+                with self._lock:
+                    self._modules[path] = mod
+        return mod
+
+
+def _pair_key(obj: Any) -> Any:
+    if isinstance(obj, str | PathLike):
+        return Path(obj).resolve()
+    return id(obj)
+
+
+def _check_pair(
+    load: _ModuleLoader, a: Any, b: Any, budget: float | None
+) -> BaseException | None:
+    try:
+        with analysis_lock.shared():
+            is_compatible(load(a), load(b), budget=budget)
+    except Exception as e:  # noqa: BLE001 - reported per pair
+        return e
+    return None
+
+
+def check_many(
+    pairs: Iterable[tuple[Any, Any]],
+    *,
+    executor: Executor | None = None,
+    max_workers: int | None = None,
+    budget: float | None = None,
+) -> Iterator[PairResult]:
+    """
+    Check every `(a, b)` pair with `is_compatible` and yield a `PairResult`
+    per pair, in completion order.
+
+    `a` and `b` are objects (modules, classes, functions) or paths to Python
+    files, which are loaded with `load_module`. Pairs run on `executor`, by
+    default a thread pool of `max_workers` threads. `budget` is the time
+    budget in seconds for each pair (see `is_compatible`). Errors never abort
+    the batch; they are reported on the pair that raised them.
+    """
+    pairs = list(pairs)
+    load = _ModuleLoader()
+    # Identical pairs are checked once and reported under every index.
+    indices: dict[tuple[Any, Any], list[int]] = {}
+    for i, (a, b) in enumerate(pairs):
+        indices.setdefault((_pair_key(a), _pair_key(b)), []).append(i)
+    pool = ThreadPoolExecutor(max_workers) if executor is None else executor
+    try:
+        futures = {}
+        for group in indices.values():
+            a, b = pairs[group[0]]
+            futures[pool.submit(_check_pair, load, a, b, budget)] = group
+        for future in as_completed(futures):
+            error = future.result()
+            for i in futures[future]:
+                a, b = pairs[i]
+                yield PairResult(i, a, b, error)
+    finally:
+        if executor is None:
+            pool.shutdown(cancel_futures=True)
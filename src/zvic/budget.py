@@ -0,0 +1,78 @@
+"""budget.py
+
+Wall-clock budgets for compatibility checks.
+
+A `Budget` bounds a whole `is_compatible`/`iter_compatibility` call. Cheap
+checks (parameters, types, AST constraint heuristics) always run; the
+witness search and CrossHair ask `allot()` for a slice of what is left
+before they start, and stop when it is used up:
+
+    with using_budget(Budget(30)):
+        timeout = allot(CROSSHAIR_SECONDS)  # None: not enough time left
+
+Each slice is at most half of the remaining time, so one slow constraint
+pair cannot starve the ones after it. Checks that could not be decided in
+time raise `CompatibilityUnknown` instead of guessing.
+"""
+
+import contextlib
+import contextvars
+import time
+from collections.abc import Iterator
+
+# Upper bound for a single CrossHair run, with or without a budget.
+CROSSHAIR_SECONDS = 10.0
+# Upper bound for the witness search (fixed candidates and fuzzing) of a
+# single constraint pair.
+WITNESS_SECONDS = 2.0
+# Below this, starting CrossHair is pointless (interpreter start-up alone
+# takes a good part of it).
+MIN_CROSSHAIR_SECONDS = 1.0
+
+
+class Budget:
+    """A wall-clock allowance of `seconds`, starting now."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+    def __repr__(self) -> str:
+        return f"Budget({self.seconds}, remaining={self.remaining():.3f})"
+
+
+_current: contextvars.ContextVar[Budget | None] = contextvars.ContextVar(
+    "zvic_budget", default=None
+)
+
+
+@contextlib.contextmanager
+def using_budget(budget: Budget | None) -> Iterator[None]:
+    """Make `budget` the active budget inside the block (None: unlimited)."""
+    token = _current.set(budget)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def current_budget() -> Budget | None:
+    return _current.get()
+
+
+def allot(wanted: float, minimum: float = MIN_CROSSHAIR_SECONDS) -> float | None:
+    """
+    Seconds an expensive step may take: `wanted` without a budget, otherwise
+    at most half of the remaining budget, or None if that is below `minimum`.
+    """
+    budget = _current.get()
+    if budget is None:
+        return wanted
+    share = min(wanted, budget.remaining() / 2)
+    return share if share >= minimum else None
@@ -0,0 +1,204 @@
+"""canonical.py
+
+Compact canonical signatures.
+
+`canonical_signature` historically returns nested dicts of lists of dicts that
+repeat the same keys for every parameter. For large contract registries this
+module provides an equivalent compact form: immutable tuple records whose type
+names, parameter names and constraints are interned, so equal signatures
+compare mostly by pointer. `as_dict` converts a record back to the dict form.
+"""
+
+import inspect
+import sys
+import weakref
+from collections.abc import Callable
+from itertools import chain
+from typing import Any, NamedTuple, get_args, get_origin, get_type_hints
+
+from .constraint import relations
+from .utils import normalize_constraint
+
+NO_DEFAULT = inspect.Parameter.empty
+
+
+class CanonicalParam(NamedTuple):
+    name: str | None
+    type: str | None
+    constraint: str | None = None
+    default: Any = NO_DEFAULT
+
+
+class CanonicalSignature(NamedTuple):
+    positional_only: tuple[CanonicalParam, ...]
+    positional_or_keyword: tuple[CanonicalParam, ...]
+    keyword_only: tuple[CanonicalParam, ...]
+    return_type: str | None
+    return_constraint: str | None = None
+    # Constraints that refer to other parameters, bound to their own
+    # parameter's name (e.g. "hi > lo" for `hi: int(_ > lo)`).
+    relations: tuple[str, ...] = ()
+
+
+def _intern(s: str | None) -> str | None:
+    return None if s is None else sys.intern(s)
+
+
+def strip_typing_prefix(s: str) -> str:
+    return s.replace("typing.", "") if s.startswith("typing.") else s
+
+
+def annotation_info(ann: Any) -> tuple[str | None, str | None]:
+    """Return the interned (type name, normalized constraint) of an annotation."""
+    origin = get_origin(ann)
+    args = get_args(ann)
+    if origin is not None and origin.__name__ == "Annotated" and len(args) >= 2:
+        base_type = args[0]
+        if hasattr(base_type, "__name__"):
+            type_name = base_type.__name__
+        else:
+            type_name = strip_typing_prefix(str(base_type))
+        return _intern(type_name), _intern(normalize_constraint(str(args[1])))
+    if ann == inspect.Signature.empty:
+        return None, None
+    if hasattr(ann, "__module__") and ann.__module__ == "typing":
+        return _intern(strip_typing_prefix(str(ann))), None
+    if hasattr(ann, "__name__"):
+        return _intern(ann.__name__), None
+    return _intern(str(ann)), None
+
+
+def _build_signature(func: Any) -> CanonicalSignature:
+    sig = inspect.signature(func)
+    # Use runtime type hints for robust Annotated extraction
+    try:
+        type_hints = get_type_hints(func, include_extras=True)
+    except Exception:  # noqa: BLE001 - get_type_hints evaluates arbitrary annotation expressions
+        # Whatever evaluating an annotation raises (unresolvable names,
+        # constraint expressions such as `int('abc')`, `1/0`), the raw
+        # annotations are used instead.
+        type_hints = {}
+    positional_only: list[CanonicalParam] = []
+    positional_or_keyword: list[CanonicalParam] = []
+    keyword_only: list[CanonicalParam] = []
+    constraints: dict[str, str | None] = {}
+    for param in sig.parameters.values():
+        type_name, constraint = annotation_info(
+            type_hints.get(param.name, param.annotation)
+        )
+        constraints[param.name] = constraint
+        if param.kind == inspect.Parameter.POSITIONAL_ONLY:
+            positional_only.append(
+                CanonicalParam(None, type_name, constraint, param.default)
+            )
+        elif param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD:
+            positional_or_keyword.append(
+                CanonicalParam(
+                    sys.intern(param.name), type_name, constraint, param.default
+                )
+            )
+        elif param.kind == inspect.Parameter.KEYWORD_ONLY:
+            keyword_only.append(
+                CanonicalParam(
+                    sys.intern(param.name), type_name, constraint, param.default
+                )
+            )
+    keyword_only.sort(key=lambda p: p.name)
+    return_type, return_constraint = annotation_info(
+        type_hints.get("return", sig.return_annotation)
+    )
+    if return_type == "None":
+        return_type = None
+    return CanonicalSignature(
+        tuple(positional_only),
+        tuple(positional_or_keyword),
+        tuple(keyword_only),
+        return_type,
+        return_constraint,
+        tuple(sys.intern(c.source) for c in relations(constraints).values()),
+    )
+
+
+def _param_as_dict(param: CanonicalParam) -> dict[str, Any]:
+    info: dict[str, Any] = {}
+    if param.type is not None:
+        info["type"] = param.type
+    if param.constraint is not None:
+        info["constraint"] = param.constraint
+    if param.name is not None:
+        info["name"] = param.name
+    if param.default is not NO_DEFAULT:
+        info["default"] = param.default
+    return info
+
+
+def as_dict(record: CanonicalSignature) -> dict[str, Any]:
+    """Convert a compact record into the dict form of `canonical_signature`."""
+    return_info: dict[str, Any] = {}
+    if record.return_type is not None:
+        return_info["type"] = record.return_type
+    if record.return_constraint is not None:
+        return_info["constraint"] = record.return_constraint
+    result: dict[str, Any] = {
+        "params": {
+            "positional_only": [_param_as_dict(p) for p in record.positional_only],
+            "positional_or_keyword": [
+                _param_as_dict(p) for p in record.positional_or_keyword
+            ],
+            "keyword_only": [_param_as_dict(p) for p in record.keyword_only],
+        },
+        "return": return_info,
+    }
+    if record.relations:
+        result["relations"] = list(record.relations)
+    return result
+
+
+class FunctionCache:
+    """
+    Per-function memo of `compute(func)` for plain functions.
+
+    Entries are keyed weakly on the function object and validated against the
+    identity of its __code__, __annotations__ and defaults, so rebinding any
+    of them invalidates the entry. The annotation and keyword-default items
+    are compared too, so editing those dicts in place invalidates it as well.
+    Other callables are computed every time.
+    """
+
+    def __init__(self, compute: Callable[[Any], Any]):
+        self.compute = compute
+        self._entries: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _key(func: Any) -> tuple[Any, ...]:
+        kwdefaults = func.__kwdefaults__
+        return (
+            func.__code__,
+            func.__annotations__,
+            func.__defaults__,
+            kwdefaults,
+            *chain.from_iterable(func.__annotations__.items()),
+            *chain.from_iterable(kwdefaults.items() if kwdefaults else ()),
+        )
+
+    @staticmethod
+    def _matches(cached: tuple[Any, ...], key: tuple[Any, ...]) -> bool:
+        return len(cached) == len(key) and all(x is y for x, y in zip(cached, key))
+
+    def __call__(self, func: Any) -> Any:
+        if not inspect.isfunction(func):
+            return self.compute(func)
+        key = self._key(func)
+        cached = self._entries.get(func)
+        if cached is not None and self._matches(cached[0], key):
+            return cached[1]
+        result = self.compute(func)
+        self._entries[func] = (key, result)
+        return result
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Compact canonical signature of `func`; cached per plain function.
+compact_signature = FunctionCache(_build_signature)
@@ -1,57 +1,226 @@
+import contextlib
+import importlib
 import inspect
 import logging
+import pkgutil
+import time
 import types
 from enum import Enum
-from inspect import signature
-from typing import Any, cast
-from collections.abc import Callable
+from inspect import Signature, signature
+from typing import Any, NamedTuple, cast
+from collections.abc import Callable, Iterator
 
-from .compatibility_constraints import is_constraint_compatible
+from .compatibility_constraints import (
+    is_constraint_compatible,
+    is_precondition_compatible,
+    is_return_constraint_compatible,
+)
 from .compatibility_params import are_params_compatible
 from .compatibility_types import is_type_compatible
-from .exception import SignatureIncompatible
-from .utils import prepare_params
+from .budget import Budget, using_budget
+from .exception import CompatibilityUnknown, SignatureIncompatible
+from .type_registry import module_alias
+from .utils import prepare_params, prepare_return
 
 
-def is_compatible(a, b):
+class SymbolResult(NamedTuple):
+    # Dotted path of the checked symbol, rooted at A's name, e.g.
+    # "pkg.mod.Cls.method".
+    name: str
+    a: Any
+    b: Any
+    # Why B breaks A for this symbol (SignatureIncompatible), why that could
+    # not be decided (CompatibilityUnknown), or None if it is compatible.
+    error: SignatureIncompatible | CompatibilityUnknown | None
+    # Wall time of this symbol's own checks in seconds (nested symbols are
+    # reported separately).
+    duration: float
+
+    @property
+    def compatible(self) -> bool:
+        return self.error is None
+
+    @property
+    def status(self) -> str:
+        """ "compatible", "incompatible" or "unknown"."""
+        if self.error is None:
+            return "compatible"
+        if isinstance(self.error, CompatibilityUnknown):
+            return "unknown"
+        return "incompatible"
+
+
+Aliases = tuple[tuple[str, str], ...]
+
+
+def _module_name(obj) -> str | None:
+    if isinstance(obj, types.ModuleType):
+        return obj.__name__
+    return getattr(obj, "__module__", None)
+
+
+def _with_alias(aliases: Aliases, a, b) -> Aliases:
+    a_module, b_module = _module_name(a), _module_name(b)
+    if not a_module or not b_module or a_module == b_module:
+        return aliases
+    return (*aliases, (b_module, a_module))
+
+
+@contextlib.contextmanager
+def _aliased(aliases: Aliases):
+    # Entered around each check rather than across yields, so the consumer of
+    # iter_compatibility never runs with the aliases of the producer.
+    with contextlib.ExitStack() as stack:
+        for b_module, a_module in aliases:
+            stack.enter_context(module_alias(b_module, a_module))
+        yield
+
+
+def _result(name: str, a, b, aliases: Aliases, check, *args) -> SymbolResult:
+    start = time.perf_counter()
+    try:
+        with _aliased(aliases):
+            check(*args)
+    except (SignatureIncompatible, CompatibilityUnknown) as e:
+        error = e
+    else:
+        error = None
+    return SymbolResult(name, a, b, error, time.perf_counter() - start)
+
+
+def _symbol_name(obj) -> str:
+    if isinstance(obj, types.ModuleType):
+        return obj.__name__
+    return (
+        getattr(obj, "__qualname__", None)
+        or getattr(obj, "__name__", None)
+        or repr(obj)
+    )
+
+
+def is_compatible(a, b, *, budget: float | Budget | None = None):
     """
     Recursively checks any given object for ZVIC compatibility - signature, types and constraints.
+
+    With a `budget` (seconds or a `Budget`), the whole check finishes in
+    about that time: constraint pairs that could not be analysed in time
+    raise CompatibilityUnknown, unless some symbol is provably incompatible.
     """
+    unknown = None
+    for result in iter_compatibility(a, b, budget=budget):
+        if isinstance(result.error, SignatureIncompatible):
+            raise result.error
+        if unknown is None:
+            unknown = result.error
+    if unknown is not None:
+        raise unknown
+
 
+def iter_compatibility(
+    a, b, *, budget: float | Budget | None = None
+) -> Iterator[SymbolResult]:
+    """
+    Check A against B like `is_compatible`, yielding a `SymbolResult` for
+    every checked symbol (module, class, function, method, submodule) as soon
+    as it is known.
+
+    Checking carries on past incompatible symbols, so one pass reports all of
+    them; stop iterating to abort early. The first incompatible result is the
+    error `is_compatible` raises. Under a `budget`, cheap checks always run
+    and symbols whose constraints could not be analysed in time come out as
+    "unknown".
+    """
+    if budget is not None and not isinstance(budget, Budget):
+        budget = Budget(budget)
+    results = _iter_compatible(a, b, _symbol_name(a), _with_alias((), a, b))
+    while True:
+        # Active only while a step runs, never across yields.
+        with using_budget(budget):
+            result = next(results, None)
+        if result is None:
+            return
+        yield result
+
+
+def _get_public_interface(mod):
+    # If module defines __all__, that explicitly declares the public
+    # interface; otherwise, fall back to the rule 'names not
+    # starting with underscore'. Use vars(mod) to get the actual
+    # attributes available.
+    mod_vars = vars(mod)
+    if "__all__" in mod_vars and isinstance(mod_vars["__all__"], (list, tuple)):
+        return {
+            name: mod_vars[name] for name in mod_vars["__all__"] if name in mod_vars
+        }
+    # A package's own submodules only show up as attributes once
+    # imported; they are compared separately below.
+    return {
+        name: member
+        for name, member in mod_vars.items()
+        if not name.startswith("_")
+        and not (
+            isinstance(member, types.ModuleType)
+            and member.__name__.startswith(f"{mod.__name__}.")
+        )
+    }
+
+
+def _get_public_submodules(pkg):
+    # Discovered from the file system; nothing is imported here.
+    return [
+        info.name
+        for info in pkgutil.iter_modules(pkg.__path__)
+        if not info.name.startswith("_")
+    ]
+
+
+def _get_methods(cls):
+    methods = {}
+    for name, member in vars(cls).items():
+        if (
+            inspect.isfunction(member)
+            or isinstance(member, (staticmethod, classmethod))
+        ) and not (name.startswith("__") and name != "__init__"):
+            # Unwrap descriptors: staticmethod and classmethod store the
+            # underlying function in the __func__ attribute in the class
+            # dict. Use that so inspect.signature() receives a plain
+            # function object (callable) rather than the descriptor.
+            if isinstance(member, (staticmethod, classmethod)):
+                methods[name] = member.__func__
+            else:
+                methods[name] = member
+    return methods
+
+
+def _iter_compatible(a, b, name: str, aliases: Aliases) -> Iterator[SymbolResult]:
+    logger = logging.getLogger(__name__)
     # If both are modules, treat their public interface as the set of all public attributes (callable and non-callable)
     if isinstance(a, types.ModuleType) and isinstance(b, types.ModuleType):
+        a_public = _get_public_interface(a)
+        b_public = _get_public_interface(b)
+        is_package = hasattr(a, "__path__") and hasattr(b, "__path__")
+        a_subs = _get_public_submodules(a) if is_package else []
+        b_subs = _get_public_submodules(b) if is_package else []
 
-        def get_public_interface(mod):
-            # If module defines __all__, that explicitly declares the public
-            # interface; otherwise, fall back to the rule 'names not
-            # starting with underscore'. Use vars(mod) to get the actual
-            # attributes available.
-            mod_vars = vars(mod)
-            if "__all__" in mod_vars and isinstance(mod_vars["__all__"], (list, tuple)):
-                return {
-                    name: mod_vars[name]
-                    for name in mod_vars["__all__"]
-                    if name in mod_vars
-                }
-            return {
-                name: member
-                for name, member in mod_vars.items()
-                if not name.startswith("_")
-            }
-
-        a_public = get_public_interface(a)
-        b_public = get_public_interface(b)
-        missing = set(a_public) - set(b_public)
-        if missing:
-            raise SignatureIncompatible(
-                f"Public attributes missing in {b.__name__}: {sorted(missing)}"
-            )
+        def check_module():
+            missing = set(a_public) - set(b_public)
+            if missing:
+                raise SignatureIncompatible(
+                    f"Public attributes missing in {b.__name__}: {sorted(missing)}"
+                )
+            # For packages, every public submodule of A must exist in B.
+            missing = set(a_subs) - set(b_subs)
+            if missing:
+                raise SignatureIncompatible(
+                    f"Submodules missing in {b.__name__}: {sorted(missing)}"
+                )
+
+        yield _result(name, a, b, aliases, check_module)
         # For callables, check signature compatibility
-        logger = logging.getLogger(__name__)
-        for name in sorted(a_public):
-            if name in b_public:
-                a_val = a_public[name]
-                b_val = b_public[name]
+        for attr in sorted(a_public):
+            if attr in b_public:
+                a_val = a_public[attr]
+                b_val = b_public[attr]
                 if (
                     inspect.isfunction(a_val)
                     or inspect.isclass(a_val)
@@ -61,63 +230,88 @@ def is_compatible(a, b):
                     or inspect.isclass(b_val)
                     or callable(b_val)
                 ):
-                    logger.debug(f"Recursively comparing module callable: {name}")
-                    is_compatible(a_val, b_val)
-        return None
+                    logger.debug("Recursively comparing module callable: %s", attr)
+                    yield from _iter_compatible(
+                        a_val,
+                        b_val,
+                        f"{name}.{attr}",
+                        _with_alias(aliases, a_val, b_val),
+                    )
+        # Subpackages recurse through this same branch.
+        for sub in sorted(set(a_subs) & set(b_subs)):
+            logger.debug("Recursively comparing submodule: %s.%s", a.__name__, sub)
+            a_mod = importlib.import_module(f"{a.__name__}.{sub}")
+            b_mod = importlib.import_module(f"{b.__name__}.{sub}")
+            yield from _iter_compatible(
+                a_mod, b_mod, f"{name}.{sub}", _with_alias(aliases, a_mod, b_mod)
+            )
+        return
     # If both are classes, recursively check all user-defined methods
     if inspect.isclass(a) and inspect.isclass(b):
+        a_methods = _get_methods(a)
+        b_methods = _get_methods(b)
 
-        def get_methods(cls):
-            methods = {}
-            for name, member in vars(cls).items():
-                if (
-                    inspect.isfunction(member)
-                    or isinstance(member, (staticmethod, classmethod))
-                ) and not (name.startswith("__") and name != "__init__"):
-                    # Unwrap descriptors: staticmethod and classmethod store the
-                    # underlying function in the __func__ attribute in the class
-                    # dict. Use that so inspect.signature() receives a plain
-                    # function object (callable) rather than the descriptor.
-                    if isinstance(member, (staticmethod, classmethod)):
-                        methods[name] = member.__func__
-                    else:
-                        methods[name] = member
-            return methods
-
-        a_methods = get_methods(a)
-        b_methods = get_methods(b)
-        # If both classes are Enum subclasses, ensure their members match
-        # including order. Enum.__members__ is an ordered mapping of member
-        # names in definition order.
-        if issubclass(a, Enum) and issubclass(b, Enum):
-            a_members = list(getattr(a, "__members__", {}).keys())
-            b_members = list(getattr(b, "__members__", {}).keys())
-            # Require that all members present in A also exist in B, but do
-            # not enforce any specific ordering. B may add new members anywhere
-            # in the definition order. For existing names, enforce value
-            # stability so numeric/encoded values clients depend on don't
-            # silently change.
-            a_set = set(a_members)
-            b_set = set(b_members)
-            missing = a_set - b_set
-            if missing:
-                raise SignatureIncompatible(
-                    f"Enum members missing in {b.__name__}: {sorted(missing)} (a={a_members}, b={b_members})"
-                )
-            a_map = getattr(a, "__members__", {})
-            b_map = getattr(b, "__members__", {})
-            for name in a_members:
-                a_val = a_map[name].value
-                b_val = b_map[name].value
-                if a_val != b_val:
+        # Also check for missing public class attributes (constants, enum
+        # members, etc.) that aren't methods. Treat names not starting with
+        # an underscore as public.
+        def get_public_attrs(cls):
+            attrs = set()
+            for attr, member in vars(cls).items():
+                if attr.startswith("_"):
+                    continue
+                # skip methods we've already considered
+                if attr in a_methods:
+                    continue
+                attrs.add(attr)
+            return attrs
+
+        def check_class():
+            # If both classes are Enum subclasses, ensure their members match
+            # including order. Enum.__members__ is an ordered mapping of member
+            # names in definition order.
+            if issubclass(a, Enum) and issubclass(b, Enum):
+                a_members = list(getattr(a, "__members__", {}).keys())
+                b_members = list(getattr(b, "__members__", {}).keys())
+                # Require that all members present in A also exist in B, but do
+                # not enforce any specific ordering. B may add new members anywhere
+                # in the definition order. For existing names, enforce value
+                # stability so numeric/encoded values clients depend on don't
+                # silently change.
+                a_set = set(a_members)
+                b_set = set(b_members)
+                missing = a_set - b_set
+                if missing:
                     raise SignatureIncompatible(
-                        f"Enum member value changed for {a.__name__}.{name}: a.value={a_val!r}, b.value={b_val!r}"
+                        f"Enum members missing in {b.__name__}: {sorted(missing)} (a={a_members}, b={b_members})"
                     )
+                a_map = getattr(a, "__members__", {})
+                b_map = getattr(b, "__members__", {})
+                for member in a_members:
+                    a_val = a_map[member].value
+                    b_val = b_map[member].value
+                    if a_val != b_val:
+                        raise SignatureIncompatible(
+                            f"Enum member value changed for {a.__name__}.{member}: a.value={a_val!r}, b.value={b_val!r}"
+                        )
+            # Check for missing methods in B (excluding __init__)
+            missing_methods = set(a_methods) - set(b_methods)
+            if missing_methods:
+                raise SignatureIncompatible(
+                    f"Methods missing in {b.__name__}: {sorted(missing_methods)}"
+                )
+            missing_attrs = get_public_attrs(a) - get_public_attrs(b)
+            if missing_attrs:
+                raise SignatureIncompatible(
+                    f"Attributes missing in {b.__name__}: {sorted(missing_attrs)}"
+                )
+
+        yield _result(name, a, b, aliases, check_class)
         # Always check __init__ if present in both
-        logger = logging.getLogger(__name__)
         if hasattr(a, "__init__") and hasattr(b, "__init__"):
-            logger.debug(f"Recursively comparing constructor: {a.__name__}.__init__")
-            is_compatible(a.__init__, b.__init__)
+            logger.debug("Recursively comparing constructor: %s.__init__", a.__name__)
+            yield from _iter_compatible(
+                a.__init__, b.__init__, f"{name}.__init__", aliases
+            )
         # Always check __call__ if present in both
         if (
             hasattr(a, "__call__")
@@ -126,49 +320,31 @@ def is_compatible(a, b):
                 a.__call__ is not object.__call__ and b.__call__ is not object.__call__
             )
         ):
-            logger.debug(f"Recursively comparing callable: {a.__name__}.__call__")
-            is_compatible(a.__call__, b.__call__)
-        # Check for missing methods in B (excluding __init__)
-        missing_methods = set(a_methods) - set(b_methods)
-        if missing_methods:
-            raise SignatureIncompatible(
-                f"Methods missing in {b.__name__}: {sorted(missing_methods)}"
-            )
-
-        # Also check for missing public class attributes (constants, enum
-        # members, etc.) that aren't methods. Treat names not starting with
-        # an underscore as public.
-        def get_public_attrs(cls):
-            attrs = set()
-            for name, member in vars(cls).items():
-                if name.startswith("_"):
-                    continue
-                # skip methods we've already considered
-                if name in a_methods:
-                    continue
-                attrs.add(name)
-            return attrs
-
-        a_attrs = get_public_attrs(a)
-        b_attrs = get_public_attrs(b)
-        missing_attrs = a_attrs - b_attrs
-        if missing_attrs:
-            raise SignatureIncompatible(
-                f"Attributes missing in {b.__name__}: {sorted(missing_attrs)}"
+            logger.debug("Recursively comparing callable: %s.__call__", a.__name__)
+            yield from _iter_compatible(
+                a.__call__, b.__call__, f"{name}.__call__", aliases
             )
         # Recursively check all user-defined methods present in both (excluding __init__)
         common_methods = set(a_methods) & set(b_methods)
         for mname in sorted(common_methods):
             if mname == "__init__":
                 continue
-            a_m = a_methods[mname]
-            b_m = b_methods[mname]
-            logger.debug(f"Recursively comparing method: {a.__name__}.{mname}")
-            is_compatible(a_m, b_m)
-        return None
+            logger.debug("Recursively comparing method: %s.%s", a.__name__, mname)
+            yield from _iter_compatible(
+                a_methods[mname], b_methods[mname], f"{name}.{mname}", aliases
+            )
+        return
+
+    yield _result(name, a, b, aliases, _check_callable, a, b)
+
 
+def _check_callable(a, b):
     logging.getLogger(__name__).debug(
-        f"Comparing: a_func={a} ({getattr(a, '__qualname__', '')}), b_func={b} ({getattr(b, '__qualname__', '')})"
+        "Comparing: a_func=%s (%s), b_func=%s (%s)",
+        a,
+        getattr(a, "__qualname__", ""),
+        b,
+        getattr(b, "__qualname__", ""),
     )
     # Check for sync/async and generator/non-generator mismatch
     if inspect.isfunction(a) and inspect.isfunction(b):
@@ -196,8 +372,15 @@ def is_compatible(a, b):
             raise SignatureIncompatible(f"Cannot take signature of module: {obj!r}")
         return signature(cast(Callable[..., Any], obj))
 
-    a_sig = _safe_signature(a)
-    b_sig = _safe_signature(b)
+    is_signature_compatible(_safe_signature(a), _safe_signature(b), a, b)
+
+
+def is_signature_compatible(a_sig: Signature, b_sig: Signature, a=None, b=None):
+    """
+    Check two signatures for parameter, type and constraint compatibility.
+    `a`/`b` are the callables the signatures belong to, if any; they are used
+    to resolve string annotations in the callables' globals.
+    """
     are_params_compatible(a_sig, b_sig)
     a_params = prepare_params(a_sig, a)
     b_params = prepare_params(b_sig, b)
@@ -212,9 +395,16 @@ def is_compatible(a, b):
         is_type_compatible(a_p["type"], b_p["type"])
         is_constraint_compatible(a_p, b_p)
 
-    # Check keyword-only
-    for a_p, b_p in zip(a_params.kwonly, b_params.kwonly):
-        is_type_compatible(a_p["type"], b_p["type"])
-        is_constraint_compatible(a_p, b_p)
+    # Check keyword-only, paired by name (their order is irrelevant to callers)
+    b_kwonly = {p["name"]: p for p in b_params.kwonly}
+    for a_p in a_params.kwonly:
+        b_p = b_kwonly.get(a_p["name"])
+        if b_p is not None:
+            is_type_compatible(a_p["type"], b_p["type"])
+            is_constraint_compatible(a_p, b_p)
+
+    # Relations between parameters, as one precondition per signature
+    is_precondition_compatible(a_params, b_params)
 
-    return None
+    # Return value constraints (covariant)
+    is_return_constraint_compatible(prepare_return(a_sig, a), prepare_return(b_sig, b))
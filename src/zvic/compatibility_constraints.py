@@ -1,8 +1,18 @@
 import ast
+import functools
 import logging
-import textwrap
 
-from .exception import SignatureIncompatible
+from .budget import CROSSHAIR_SECONDS, WITNESS_SECONDS, allot, current_budget
+from .constraint import conjunction, parse_constraint, relations
+from .crosshair_inprocess import CrossHairResult, implication_source
+from .exception import CompatibilityUnknown, SignatureIncompatible, ZVICError
+from .tracing import CONSTRAINTS, CROSSHAIR, WITNESSES, span
+from .utils import VerdictCache
+from .witnesses import annotation_of, find_counterexample, witnesses
+
+# CrossHair outcomes keyed on the generated check source, so each distinct
+# constraint pair is analysed once per process (CrossHair runs take seconds).
+crosshair_results = VerdictCache(maxsize=4096)
 
 
 def is_constraint_compatible(a_param, b_param):
@@ -10,6 +20,117 @@ def is_constraint_compatible(a_param, b_param):
     Returns True if constraints are compatible, else raises SignatureIncompatible.
     Assumes a_param and b_param are parameter dicts from prepare_params.
     """
+    with span(
+        CONSTRAINTS,
+        param=a_param.get("name"),
+        a=a_param.get("constraint"),
+        b=b_param.get("constraint"),
+    ):
+        return _is_constraint_compatible(a_param, b_param)
+
+
+def _run_crosshair(pre: str, post: str, params: dict[str, str]):
+    # Lazy import so the module does not fail to import when CrossHair
+    # support is not installed.
+    from .crosshair_inprocess import check_implication
+
+    timeout = allot(CROSSHAIR_SECONDS)
+    if timeout is None:
+        raise CompatibilityUnknown("the time budget is used up")
+    result = check_implication(pre, post, params, timeout)
+    for name, value in (result.counterexample or {}).items():
+        witnesses.add(params[name], value)
+    # Without a budget "no counterexample in time" counts as compatible, as
+    # before; under a budget it is reported as unknown (and not memoized,
+    # see VerdictCache).
+    if result.holds and not result.exhaustive and current_budget() is not None:
+        raise CompatibilityUnknown(
+            f"CrossHair found no counterexample within its {timeout:.1f}s share of the time budget"
+        )
+    return result
+
+
+_NARROWER = "B is narrower and thus incompatible: some inputs that A accepts will not be accepted by B"
+_WIDER = "B is wider and thus incompatible: B may return values that callers of A do not expect"
+
+
+def _narrower(
+    what, a_con, b_con, counterexample, names, reason=_NARROWER
+) -> SignatureIncompatible:
+    # `names` maps the variables of the generated check back to parameters.
+    witness = ""
+    if counterexample:
+        witness = ", e.g. " + ", ".join(
+            f"{names.get(var, var)}={value!r}" for var, value in counterexample.items()
+        )
+    return SignatureIncompatible(
+        f"Constraint mismatch for {what}: {a_con} vs {b_con} ({reason}{witness})",
+        context={"counterexample": counterexample},
+    )
+
+
+def _search(pre: str, post: str, params: dict[str, str], what: str):
+    """
+    Look for arguments (per `params`) that satisfy `pre` but not `post` and
+    return a CrossHairResult; `what` labels the spans. Both stages take
+    their share of the active time budget; CompatibilityUnknown is raised
+    once it is used up.
+    """
+    # Concrete witnesses first: earlier counterexamples, boundary values and
+    # random samples refute most narrowings in microseconds.
+    with span(WITNESSES, param=what):
+        counterexample = find_counterexample(
+            pre, post, params, timeout=allot(WITNESS_SECONDS, minimum=0.0)
+        )
+    if counterexample is not None:
+        return CrossHairResult(False, counterexample, True, "Refuted by a witness")
+    # Then CrossHair, for a fixed allowance or its share of the active time
+    # budget, so it cannot hang the check.
+    key = implication_source(pre, post, params)
+    with span(CROSSHAIR, code=key) as s:
+        return crosshair_results.call(key, _run_crosshair, pre, post, params, trace=s)
+
+
+def _simple_narrowing(a_node: ast.expr, b_node: ast.expr) -> bool:
+    """Return True if b_node is a strictly narrower numeric bound than a_node.
+
+    Only supports simple forms like `x < CONST` / `x <= CONST` / `x > CONST` / `x >= CONST`.
+    """
+    # Ensure both are simple Compare nodes with single comparator and a Name left
+    if not (isinstance(a_node, ast.Compare) and isinstance(b_node, ast.Compare)):
+        return False
+    if len(a_node.comparators) != 1 or len(b_node.comparators) != 1:
+        return False
+    if not (isinstance(a_node.left, ast.Name) and isinstance(b_node.left, ast.Name)):
+        return False
+    if a_node.left.id != b_node.left.id:
+        return False
+
+    a_op = type(a_node.ops[0])
+    b_op = type(b_node.ops[0])
+    a_val = a_node.comparators[0]
+    b_val = b_node.comparators[0]
+    if not (isinstance(a_val, ast.Constant) and isinstance(b_val, ast.Constant)):
+        return False
+    if not (
+        isinstance(a_val.value, (int, float)) and isinstance(b_val.value, (int, float))
+    ):
+        return False
+
+    a_num = a_val.value
+    b_num = b_val.value
+
+    # Only handle same-operator numeric comparisons
+    if a_op is b_op:
+        # For less-than styles, smaller RHS is narrower
+        if a_op is ast.Lt or a_op is ast.LtE:
+            return b_num < a_num
+        if a_op is ast.Gt or a_op is ast.GtE:
+            return b_num > a_num
+    return False
+
+
+def _is_constraint_compatible(a_param, b_param):
     a_con = a_param.get("constraint")
     b_con = b_param.get("constraint")
     # If B has no constraint, it's permissive (covers both neither-has and only-A-has cases)
@@ -21,155 +142,83 @@ def is_constraint_compatible(a_param, b_param):
             f"B adds constraint for parameter {a_param.get('name')}: {b_con}"
         )
     # Both have constraints at this point; check whether B is at least as permissive as A.
-    # We prefer to use the optional CrossHair analyser when available.
-    # Build the small function to hand to CrossHair. Use an f-string for clarity.
-    # Replace placeholder '_' with a variable name and escape any triple-double-quotes
-    # so embedding into a triple-double-quoted docstring is safe.
-    a_code = a_con.replace("_", "x").replace('"""', '\\"""')
-    b_code = b_con.replace("_", "x").replace('"""', '\\"""')
+    _check_implied(
+        a_con,
+        b_con,
+        a_param.get("type"),
+        f"parameter {a_param.get('name')}",
+        (a_con, b_con),
+        functools.partial(_narrower, names={"x": a_param.get("name")}),
+    )
 
-    # Quick AST-based heuristic early: detect simple numeric narrowing (e.g. x < 20 -> x < 10)
-    def _simple_narrowing(a_expr: str, b_expr: str) -> bool:
-        try:
-            a_node = ast.parse(a_expr, mode="eval").body
-            b_node = ast.parse(b_expr, mode="eval").body
-        except Exception:
-            return False
-
-        if not (isinstance(a_node, ast.Compare) and isinstance(b_node, ast.Compare)):
-            return False
-        if len(a_node.comparators) != 1 or len(b_node.comparators) != 1:
-            return False
-        if not (
-            isinstance(a_node.left, ast.Name) and isinstance(b_node.left, ast.Name)
-        ):
-            return False
-        if a_node.left.id != b_node.left.id:
-            return False
-
-        a_op = type(a_node.ops[0])
-        b_op = type(b_node.ops[0])
-        a_val = a_node.comparators[0]
-        b_val = b_node.comparators[0]
-        if not (isinstance(a_val, ast.Constant) and isinstance(b_val, ast.Constant)):
-            return False
-        if not (
-            isinstance(a_val.value, (int, float))
-            and isinstance(b_val.value, (int, float))
-        ):
-            return False
-
-        a_num = a_val.value
-        b_num = b_val.value
-
-        if a_op is b_op:
-            if a_op is ast.Lt or a_op is ast.LtE:
-                return b_num < a_num
-            if a_op is ast.Gt or a_op is ast.GtE:
-                return b_num > a_num
-        return False
 
-    if _simple_narrowing(a_code, b_code):
-        raise SignatureIncompatible(
-            f"Constraint mismatch for parameter {a_param.get('name')}: {a_con} vs {b_con} (B is narrower and thus incompatible: some inputs that A accepts will not be accepted by B)"
+def _check_implied(pre, post, tp, what, shown, error):
+    """
+    Raise `error(what, a_con, b_con, counterexample)` if some value of type
+    `tp` satisfies the constraint `pre` but not `post`. `shown` is the
+    (A, B) pair of constraints for messages; the check is best-effort and
+    passes when no engine can decide it.
+    """
+    a_con, b_con = shown
+    # Cheapest engine first: an unchanged constraint is trivially compatible.
+    if pre == post:
+        return
+    # Every engine below works on the parsed constraints, with the placeholder
+    # '_' renamed to the variable of the generated CrossHair check.
+    try:
+        pre_parsed, post_parsed = parse_constraint(pre), parse_constraint(post)
+    except SyntaxError as e:
+        logging.getLogger(__name__).debug(
+            "Cannot parse constraint (%s); treating as compatible: A=%r B=%r",
+            e,
+            a_con,
+            b_con,
         )
-    func_code = textwrap.dedent(
-        f"""\
-        def _chk(x: int):
-            \"""
-            pre: {b_code}
-            \"""
-            assert not ({a_code})
-            return True
-        """
-    )
+        return
+    # Constraints that refer to other names cannot be decided one value at a
+    # time; relations between parameters are checked as a whole by
+    # is_precondition_compatible.
+    if pre_parsed.free_names or post_parsed.free_names:
+        return
+    pre_expr, post_expr = pre_parsed.rename("x"), post_parsed.rename("x")
+    if pre_expr == post_expr:
+        return
+    pre_code, post_code = pre_expr.source, post_expr.source
+
+    # Quick AST-based heuristic early: detect simple numeric narrowing (e.g. x < 20 -> x < 10)
+    if _simple_narrowing(pre_expr.tree.body, post_expr.tree.body):
+        raise error(what, a_con, b_con, None)
+    annotation = annotation_of(tp)
 
     try:
-        # Import the runner lazily so the module does not fail to import when
-        # CrossHair support is not installed.
-        from .crosshair_subprocess import run_crosshair_on_code
-
-        # Allow CrossHair to run for a limited amount of time to avoid hangs.
-        crosshair_result = run_crosshair_on_code(func_code, "_chk", timeout_seconds=10)
-        # crosshair_result: True => no counterexample found (OK)
-        #                   False => counterexample found (B is narrower)
-        #                   None => CrossHair could not analyse (treat as unknown)
-        if crosshair_result is True:
+        if annotation is None:
+            raise TypeError(f"Cannot generate {tp!r} values")
+        try:
+            # Look for a value `pre` accepts but `post` rejects.
+            result = _search(pre_code, post_code, {"x": annotation}, what)
+        except CompatibilityUnknown as e:
+            raise CompatibilityUnknown(
+                f"Constraint compatibility for {what} is unknown: {a_con} vs {b_con} ({e.message})"
+            ) from None
+        # result.holds: True => no counterexample found (OK)
+        #               False => counterexample found (incompatible)
+        #               None => CrossHair could not analyse (treat as unknown)
+        if result.holds is True:
             return
-        if crosshair_result is False:
-            raise SignatureIncompatible(
-                f"Constraint mismatch for parameter {a_param.get('name')}: {a_con} vs {b_con} (B is narrower and thus incompatible: some inputs that A accepts will not be accepted by B)"
-            )
-        # If CrossHair returned None (unable to analyse), try a tiny AST-based
-        # heuristic for simple numeric bounds like `x < 20` vs `x < 10`.
-        if crosshair_result is None:
-
-            def _simple_narrowing(a_expr: str, b_expr: str) -> bool:
-                """Return True if b_expr is a strictly narrower numeric bound than a_expr.
-
-                Only supports simple forms like `x < CONST` / `x <= CONST` / `x > CONST` / `x >= CONST`.
-                """
-                try:
-                    a_node = ast.parse(a_expr, mode="eval").body
-                    b_node = ast.parse(b_expr, mode="eval").body
-                except Exception:
-                    return False
-
-                # Ensure both are simple Compare nodes with single comparator and a Name left
-                if not (
-                    isinstance(a_node, ast.Compare) and isinstance(b_node, ast.Compare)
-                ):
-                    return False
-                if len(a_node.comparators) != 1 or len(b_node.comparators) != 1:
-                    return False
-                if not (
-                    isinstance(a_node.left, ast.Name)
-                    and isinstance(b_node.left, ast.Name)
-                ):
-                    return False
-                # name must match variable used after replacement; we've been using 'x'
-                if a_node.left.id != b_node.left.id:
-                    return False
-
-                a_op = type(a_node.ops[0])
-                b_op = type(b_node.ops[0])
-                a_val = a_node.comparators[0]
-                b_val = b_node.comparators[0]
-                if not (
-                    isinstance(a_val, ast.Constant) and isinstance(b_val, ast.Constant)
-                ):
-                    return False
-                if not (
-                    isinstance(a_val.value, (int, float))
-                    and isinstance(b_val.value, (int, float))
-                ):
-                    return False
-
-                a_num = a_val.value
-                b_num = b_val.value
-
-                # Only handle same-operator numeric comparisons
-                if a_op is b_op:
-                    # For less-than styles, smaller RHS is narrower
-                    if a_op is ast.Lt or a_op is ast.LtE:
-                        return b_num < a_num
-                    if a_op is ast.Gt or a_op is ast.GtE:
-                        return b_num > a_num
-                return False
-
-            if _simple_narrowing(a_code, b_code):
-                raise SignatureIncompatible(
-                    f"Constraint mismatch for parameter {a_param.get('name')}: {a_con} vs {b_con} (B is narrower and thus incompatible: some inputs that A accepts will not be accepted by B)"
-                )
-
-        # Unknown to CrossHair and heuristic didn't detect narrowing; treat as permissive
+        if result.holds is False:
+            raise error(what, a_con, b_con, result.counterexample)
+
+        # Unknown to CrossHair and the AST heuristic above didn't detect
+        # narrowing; treat as permissive
         logging.getLogger(__name__).debug(
             "CrossHair could not analyse constraint for %s; treating as compatible: A=%r B=%r",
-            a_param.get("name"),
+            what,
             a_con,
             b_con,
         )
         return
+    except ZVICError:
+        raise
     except Exception as e:
         # If CrossHair is not available or failed, log and treat constraints as permissive
         logging.getLogger(__name__).debug(
@@ -179,3 +228,127 @@ def is_constraint_compatible(a_param, b_param):
             b_con,
         )
         return
+
+
+def is_return_constraint_compatible(a_ret, b_ret):
+    """
+    Check return value constraints, which are covariant: everything B may
+    return must satisfy A's constraint, so B's constraint has to imply A's.
+    Raises SignatureIncompatible otherwise. a_ret and b_ret are the return
+    dicts of prepare_return.
+    """
+    a_con = a_ret.get("constraint")
+    b_con = b_ret.get("constraint")
+    with span(CONSTRAINTS, param="return", a=a_con, b=b_con):
+        # Without a constraint in A, callers expect nothing in particular.
+        if not a_con:
+            return
+        if not b_con:
+            raise SignatureIncompatible(f"B drops return constraint: {a_con}")
+        _check_implied(
+            b_con,
+            a_con,
+            b_ret.get("type"),
+            "return value",
+            (a_con, b_con),
+            functools.partial(_narrower, names={"x": "return"}, reason=_WIDER),
+        )
+
+
+def _named_params(params) -> dict:
+    return {p["name"]: p for p in (*params.posonly, *params.pos_or_kw, *params.kwonly)}
+
+
+def _to_a_names(a_params, b_params) -> dict[str, str]:
+    # B's parameter names mapped to A's, paired as in is_signature_compatible:
+    # positional parameters by position, keyword-only ones by name.
+    names = {}
+    for a_group, b_group in (
+        (a_params.posonly, b_params.posonly),
+        (a_params.pos_or_kw, b_params.pos_or_kw),
+    ):
+        for a_p, b_p in zip(a_group, b_group):
+            names[b_p["name"]] = a_p["name"]
+    a_kwonly = {p["name"] for p in a_params.kwonly}
+    for b_p in b_params.kwonly:
+        if b_p["name"] in a_kwonly:
+            names[b_p["name"]] = b_p["name"]
+    return names
+
+
+def is_precondition_compatible(a_params, b_params):
+    """
+    Check relational constraints, i.e. constraints that refer to other
+    parameters (`def f(lo: int, hi: int(_ > lo))`), as one function-level
+    precondition: every call A accepts must satisfy B's constraints on the
+    parameters involved. Runs when either side has a relation, so a relation
+    B replaces by a plain bound is checked too. Raises SignatureIncompatible
+    otherwise. a_params and b_params are the Params of prepare_params;
+    constraints on single parameters are checked by is_constraint_compatible.
+    """
+    a_named = _named_params(a_params)
+    b_named = _named_params(b_params)
+    a_relations = relations({n: p.get("constraint") for n, p in a_named.items()})
+    b_relations = relations({n: p.get("constraint") for n, p in b_named.items()})
+    if not (a_relations or b_relations):
+        return
+    to_a = _to_a_names(a_params, b_params)
+    b_involved = set().union(*(c.names & b_named.keys() for c in b_relations.values()))
+    if not b_involved <= to_a.keys():
+        # The relation involves a parameter A does not have; A's callers
+        # never pass it, so there is nothing to compare it against.
+        logging.getLogger(__name__).debug(
+            "Relation on parameters missing in A; treating as compatible: %s",
+            sorted(b_involved - to_a.keys()),
+        )
+        return
+    involved = {to_a[n] for n in b_involved}.union(
+        *(c.names & a_named.keys() for c in a_relations.values())
+    )
+    # Everything is expressed in A's parameter names, in A's order.
+    variables = [name for name in a_named if name in involved]
+    a_pre = conjunction(
+        parse_constraint(a_named[name]["constraint"]).rename(name)
+        for name in variables
+        if a_named[name].get("constraint")
+    )
+    b_pre = conjunction(
+        parse_constraint(b_named[b_name]["constraint"]).rename(b_name).substitute(to_a)
+        for b_name, a_name in to_a.items()
+        if a_name in involved and b_named[b_name].get("constraint")
+    )
+    if b_pre is None:
+        # B accepts anything for these parameters.
+        return
+    a_con = a_pre.source if a_pre is not None else "True"
+    b_con = b_pre.source
+    what = f"parameters {', '.join(variables)}"
+    with span(CONSTRAINTS, param=what, a=a_con, b=b_con):
+        if a_con == b_con:
+            return
+        params = {name: annotation_of(a_named[name].get("type")) for name in variables}
+        if None in params.values():
+            logging.getLogger(__name__).debug(
+                "Cannot generate values for %s; treating as compatible: A=%r B=%r",
+                what,
+                a_con,
+                b_con,
+            )
+            return
+        try:
+            result = _search(a_con, b_con, params, what)
+        except CompatibilityUnknown as e:
+            raise CompatibilityUnknown(
+                f"Constraint compatibility for {what} is unknown: {a_con} vs {b_con} ({e.message})"
+            ) from None
+        except ZVICError:
+            raise
+        except Exception as e:  # noqa: BLE001 - permissive, as for single parameters
+            logging.getLogger(__name__).debug(
+                "CrossHair unavailable or failed to run for %s (%s); treating as compatible",
+                what,
+                e,
+            )
+            return
+        if result.holds is False:
+            raise _narrower(what, a_con, b_con, result.counterexample, {})
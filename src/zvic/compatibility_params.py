@@ -2,6 +2,7 @@ import logging
 from inspect import Signature
 
 from .exception import SignatureIncompatible
+from .tracing import PARAMS, span
 from .utils import Scenario, prepare_params, prepare_scenario
 
 
@@ -9,6 +10,11 @@ def are_params_compatible(a_sig: Signature, b_sig: Signature) -> bool:
     """
     Compatibility logic using match/case for parameter kind scenarios.
     """
+    with span(PARAMS, a=a_sig, b=b_sig):
+        return _are_params_compatible(a_sig, b_sig)
+
+
+def _are_params_compatible(a_sig: Signature, b_sig: Signature) -> bool:
     a = prepare_params(a_sig)
     b = prepare_params(b_sig)
     scenario = prepare_scenario(a, a_sig, b, b_sig)
@@ -66,7 +72,9 @@ def are_params_compatible(a_sig: Signature, b_sig: Signature) -> bool:
             b_kwonly_required=b_ko,
         ) if (b_po + b_pk + b_ko) > (a_po + a_pk + a_ko):
             logging.getLogger(__name__).debug(
-                f"Global required param check failed: a_required={a_po + a_pk + a_ko}, b_required={b_po + b_pk + b_ko}"
+                "Global required param check failed: a_required=%s, b_required=%s",
+                a_po + a_pk + a_ko,
+                b_po + b_pk + b_ko,
             )
             raise SignatureIncompatible(
                 message="B has more required parameters than A",
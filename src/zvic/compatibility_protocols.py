@@ -0,0 +1,174 @@
+"""compatibility_protocols.py
+
+Structural conformance of classes to `typing.Protocol` types.
+
+Every class (protocol or concrete) is summarized once into a member table
+mapping member names to their compact canonical signature (see
+`zvic.canonical`). Tables are cached per class, and so are conformance
+verdicts per (class, protocol) pair and set of active module aliases, so
+checking many annotations against the same protocols does not re-introspect
+the classes involved.
+"""
+
+import contextlib
+import inspect
+import typing
+import weakref
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from .canonical import CanonicalSignature, compact_signature
+from .exception import SignatureIncompatible
+from .type_registry import alias_key
+from .utils import VerdictCache
+
+_SKIPPED_BASES = (object, typing.Protocol, typing.Generic)
+
+
+class Member(NamedTuple):
+    # The underlying function of a method, or None for data attributes.
+    func: Callable | None
+    # Compact canonical signature, or None if it cannot be introspected.
+    signature: CanonicalSignature | None
+
+
+def is_protocol(t: Any) -> bool:
+    return isinstance(t, type) and getattr(t, "_is_protocol", False)
+
+
+def _protocol_attrs(protocol: type) -> frozenset[str]:
+    # __protocol_attrs__ is set on protocol classes since Python 3.12.
+    attrs = getattr(protocol, "__protocol_attrs__", None)
+    if attrs is None:
+        attrs = typing._get_protocol_attrs(protocol)  # type: ignore[attr-defined]
+    return frozenset(attrs)
+
+
+def _unwrap(member: Any) -> Any:
+    if isinstance(member, (staticmethod, classmethod)):
+        return member.__func__
+    return member
+
+
+def _member(value: Any) -> Member:
+    func = _unwrap(value)
+    if not callable(func):
+        return Member(None, None)
+    signature = None
+    with contextlib.suppress(TypeError, ValueError):
+        signature = compact_signature(func)
+    return Member(func, signature)
+
+
+_tables: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def member_table(cls: type) -> dict[str, Member]:
+    """Return the (cached) members `cls` defines or inherits, below `object`."""
+    with contextlib.suppress(KeyError):
+        return _tables[cls]
+    # A protocol's members are what typing itself considers part of it, so
+    # class machinery (which differs between Python versions) never counts.
+    members = _protocol_attrs(cls) if is_protocol(cls) else None
+    table: dict[str, Member] = {}
+    for klass in reversed(cls.__mro__):
+        if klass in _SKIPPED_BASES:
+            continue
+        for name in getattr(klass, "__annotations__", {}):
+            if members is None or name in members:
+                table.setdefault(name, Member(None, None))
+        for name, value in vars(klass).items():
+            if members is None or name in members:
+                table[name] = _member(value)
+    _tables[cls] = table
+    return table
+
+
+def _lookup(cls: type, name: str) -> Member | None:
+    table = member_table(cls)
+    if name in table:
+        return table[name]
+    # Members inherited from object (e.g. __eq__) are not tabulated.
+    if hasattr(cls, name):
+        return _member(inspect.getattr_static(cls, name))
+    return None
+
+
+def _check_member(cls: type, protocol: type, name: str, expected: Member) -> None:
+    actual = _lookup(cls, name)
+    if actual is None:
+        raise SignatureIncompatible(
+            message=f"{cls.__name__} does not implement protocol member '{name}' of {protocol.__name__}.",
+            context={"A_type": cls, "B_type": protocol, "member": name},
+            suggestion="Implement the missing member or annotate with a protocol the class satisfies.",
+        )
+    # Data attributes and builtin methods (whose parameters are all
+    # positional-only) are only checked for presence.
+    if not (inspect.isfunction(expected.func) and inspect.isfunction(actual.func)):
+        return
+    if expected.signature is not None and expected.signature == actual.signature:
+        return
+    from .compatibility import is_signature_compatible
+
+    try:
+        # The class's method must accept every call the protocol allows.
+        is_signature_compatible(
+            inspect.signature(expected.func),
+            inspect.signature(actual.func),
+            expected.func,
+            actual.func,
+        )
+    except SignatureIncompatible as e:
+        raise SignatureIncompatible(
+            message=f"{cls.__name__}.{name} does not match protocol {protocol.__name__}: {e.message}",
+            context={"A_type": cls, "B_type": protocol, "member": name, **e.context},
+            suggestion="Make the method signature compatible with the protocol's.",
+        ) from e
+
+
+def _check_conformance(cls: type, protocol: type) -> bool:
+    for name, expected in member_table(protocol).items():
+        _check_member(cls, protocol, name, expected)
+    return True
+
+
+def _conformance_verdict(cls: type, protocol: type) -> bool:
+    try:
+        return _check_conformance(cls, protocol)
+    except SignatureIncompatible:
+        return False
+
+
+# Verdicts keyed on weak references to the class and protocol, so entries do
+# not keep the classes of unloaded modules alive (a dead reference only
+# compares equal to itself and is evicted in time). Only the bool is stored:
+# the error's context would reference the classes, so it is rebuilt on demand.
+conformance_verdicts = VerdictCache(maxsize=4096)
+
+
+def _conforms(cls: type, protocol: type) -> bool:
+    key = (weakref.ref(cls), weakref.ref(protocol), alias_key(cls, protocol))
+    return conformance_verdicts.call(key, _conformance_verdict, cls, protocol)
+
+
+def check_conformance(cls: type, protocol: type) -> bool:
+    """
+    Check that `cls` structurally implements `protocol`: every protocol
+    member exists on `cls` and every protocol method can be replaced by the
+    class's method. Returns True or raises SignatureIncompatible. `cls` may be
+    a protocol itself, in which case everything implementing it must also
+    implement `protocol`.
+    """
+    if cls is protocol or _conforms(cls, protocol):
+        return True
+    return _check_conformance(cls, protocol)
+
+
+def conforms(cls: type, protocol: type) -> bool:
+    return cls is protocol or _conforms(cls, protocol)
+
+
+def clear_protocol_cache() -> None:
+    """Drop all cached member tables and conformance verdicts."""
+    _tables.clear()
+    conformance_verdicts.clear()
@@ -7,9 +7,20 @@ import collections.abc
 import contextlib
 import inspect
 import logging
-from typing import Any, get_args, get_origin
+import types
+import typing
+from typing import Any, Literal, TypeVar, get_args, get_origin
 
+from .compatibility_protocols import check_conformance, conforms, is_protocol
 from .exception import SignatureIncompatible
+from .tracing import TYPES, span
+from .type_registry import (
+    alias_key,
+    ancestors,
+    is_qualified_subclass,
+    resolve_type_name,
+)
+from .utils import VerdictCache
 
 
 def is_any_or_missing(t: Any) -> bool:
@@ -20,6 +31,7 @@ def is_any_or_missing(t: Any) -> bool:
         or t == {}
         or t == "any"
         or t == inspect._empty
+        or t is Any
     )
 
 
@@ -41,28 +53,23 @@ def is_subtype(sub: Any, sup: Any) -> bool:
         with contextlib.suppress(Exception):
             if issubclass(sub, sup):
                 return True
-        # Cross-module: compare by class name and walk MROs
-        sub_mro = list(getattr(sub, "__mro__", []))
-        sup_name = getattr(sup, "__name__", None)
-        if sup_name and any(getattr(c, "__name__", None) == sup_name for c in sub_mro):
+        # Cross-module: compare (module, qualname) identities, so versions of
+        # a class loaded side by side (see type_registry.module_alias) match
+        if is_qualified_subclass(sub, sup):
             return True
-    # Fallback: resolve strings via globals
+    # Fallback: resolve strings via globals and the type registry
     sub_cls: str | None = get_class_str(sub)
     sup_cls: str | None = get_class_str(sup)
     if sub_cls is not None and sup_cls is not None:
-        with contextlib.suppress(Exception):
-            sub_type: Any = globals().get(sub_cls)
-            sup_type: Any = globals().get(sup_cls)
-            if isinstance(sub_type, type) and isinstance(sup_type, type):
-                with contextlib.suppress(Exception):
-                    if issubclass(sub_type, sup_type):
-                        return True
-                # Cross-module fallback
-                sub_mro = list(getattr(sub_type, "__mro__", []))
-                if sup_cls and any(
-                    getattr(c, "__name__", None) == sup_cls for c in sub_mro
-                ):
+        sub_type = resolve_type_name(sub_cls, globals())
+        sup_type = resolve_type_name(sup_cls, globals())
+        if sub_type is not None and sup_type is not None:
+            with contextlib.suppress(TypeError):
+                if issubclass(sub_type, sup_type):
                     return True
+            # Cross-module fallback
+            if is_qualified_subclass(sub_type, sup_type):
+                return True
     return False
 
 
@@ -74,14 +81,149 @@ def is_supertype(sup: Any, sub: Any) -> bool:
     sup_cls: str | None = get_class_str(sup)
     sub_cls: str | None = get_class_str(sub)
     if sup_cls is not None and sub_cls is not None:
-        with contextlib.suppress(Exception):
-            sup_type: Any = eval(sup_cls)
-            sub_type: Any = eval(sub_cls)
-            return issubclass(sub_type, sup_type)
+        sup_type = resolve_type_name(sup_cls, globals())
+        sub_type = resolve_type_name(sub_cls, globals())
+        if sup_type is not None and sub_type is not None:
+            with contextlib.suppress(TypeError):
+                return issubclass(sub_type, sup_type)
     return False
 
 
+# Structural subtyping for generic types.
+# Union, Literal, TypeVar, Callable and parameterized generics (list[Dog],
+# dict[str, list[int]], tuple[int, ...], ...) are compared by their structure
+# rather than by name. "a ≤ b" means a parameter typed b accepts every value of
+# a, i.e. is_type_compatible(a, b). Type arguments are compared through
+# is_type_compatible, so every nested pair is memoized by type_verdicts.
+_UNION_ORIGINS = (typing.Union, types.UnionType)
+
+
+def _accepts(a: Any, b: Any) -> bool:
+    try:
+        return bool(is_type_compatible(a, b))
+    except SignatureIncompatible:
+        return False
+
+
+def _erase_typevar(t: Any) -> Any:
+    """A TypeVar stands for its bound, the union of its constraints, or Any."""
+    if not isinstance(t, TypeVar):
+        return t
+    if t.__bound__ is not None:
+        return t.__bound__
+    if t.__constraints__:
+        return typing.Union[t.__constraints__]  # noqa: UP007 - runtime tuple
+    return Any
+
+
+def _is_structural(t: Any) -> bool:
+    return isinstance(t, TypeVar) or (
+        get_origin(t) is not None and not isinstance(t, str)
+    )
+
+
+def _is_origin_subclass(a_origin: Any, b_origin: Any) -> bool:
+    if not (isinstance(a_origin, type) and isinstance(b_origin, type)):
+        return a_origin == b_origin
+    if is_protocol(b_origin):
+        return conforms(a_origin, b_origin)
+    try:
+        return issubclass(a_origin, b_origin)
+    except TypeError:
+        # Non-runtime-checkable protocols refuse issubclass; fall back to the MRO.
+        return b_origin in a_origin.__mro__
+
+
+def _callable_args(args: tuple) -> tuple[Any, Any]:
+    if not args:
+        return ..., Any
+    return args[0], args[-1]
+
+
+def _tuple_args_le(a_args: tuple, b_args: tuple) -> bool:
+    a_variadic = len(a_args) == 2 and a_args[1] is ...
+    b_variadic = len(b_args) == 2 and b_args[1] is ...
+    if b_variadic:
+        return all(_accepts(x, b_args[0]) for x in a_args if x is not ...)
+    if a_variadic or len(a_args) != len(b_args):
+        return False
+    return all(_accepts(x, y) for x, y in zip(a_args, b_args))
+
+
+def _generic_le(a: Any, b: Any) -> bool:
+    a, b = _erase_typevar(a), _erase_typevar(b)
+    if is_any_or_missing(b):
+        return True
+    if is_any_or_missing(a):
+        return False
+    a_origin, b_origin = get_origin(a), get_origin(b)
+    if a_origin is None and b_origin is None:
+        return _accepts(a, b)
+    if a_origin in _UNION_ORIGINS:
+        return all(_accepts(m, b) for m in get_args(a))
+    if b_origin in _UNION_ORIGINS:
+        return any(_accepts(a, m) for m in get_args(b))
+    if a_origin is Literal:
+        if b_origin is Literal:
+            return all(v in get_args(b) for v in get_args(a))
+        return all(_accepts(type(v), b) for v in get_args(a))
+    if b_origin is Literal:
+        return False
+    if a_origin is None:
+        # Bare class vs parameterized generic: list → list[int] narrows list[Any].
+        return (
+            isinstance(a, type) and _is_origin_subclass(a, b_origin) and not get_args(b)
+        )
+    if b_origin is None:
+        return _accepts(a_origin, b)
+    if a_origin is collections.abc.Callable and b_origin is collections.abc.Callable:
+        a_params, a_ret = _callable_args(get_args(a))
+        b_params, b_ret = _callable_args(get_args(b))
+        # Parameters are contravariant, the return type is covariant.
+        if (
+            isinstance(a_params, list)
+            and isinstance(b_params, list)
+            and (
+                len(a_params) != len(b_params)
+                or not all(_accepts(y, x) for x, y in zip(a_params, b_params))
+            )
+        ):
+            return False
+        return _accepts(a_ret, b_ret)
+    if not _is_origin_subclass(a_origin, b_origin):
+        return False
+    a_args, b_args = get_args(a), get_args(b)
+    if not b_args:
+        return True
+    if a_origin is tuple and b_origin is tuple:
+        return _tuple_args_le(a_args, b_args)
+    if len(a_args) < len(b_args):
+        return False
+    # Containers are covariant in their arguments (T11); an abstract base with
+    # fewer arguments (dict[K, V] → Iterable[K]) is matched positionally.
+    return all(_accepts(x, y) for x, y in zip(a_args, b_args))
+
+
+# Verdicts of is_type_compatible keyed on the (a, b) type pair. The same pairs
+# (int/int, Animal/Cat, ...) recur across the parameters of a module, so each
+# distinct pair is only checked once; unhashable annotations are not cached.
+type_verdicts = VerdictCache(maxsize=8192)
+
+
 def is_type_compatible(a, b) -> bool:
+    """
+    Check that a parameter typed `b` (version B) accepts everything a
+    parameter typed `a` (version A) accepted. Returns True or raises
+    SignatureIncompatible; verdicts are memoized per type pair (and set of
+    active module aliases).
+    """
+    with span(TYPES, a=a, b=b) as s:
+        return type_verdicts.call(
+            (a, b, alias_key(a, b)), _is_type_compatible, a, b, trace=s
+        )
+
+
+def _is_type_compatible(a, b) -> bool:
     # Unwrap typing.Annotated types to their base type for both a and b
     def unwrap_annotated(t):
         origin = get_origin(t)
@@ -93,9 +235,24 @@ def is_type_compatible(a, b) -> bool:
 
     a = unwrap_annotated(a)
     b = unwrap_annotated(b)
-    logging.getLogger(__name__).debug(
-        f"Comparing types: a={a!r} (type={type(a)}), b={b!r} (type={type(b)})"
+    logger = logging.getLogger(__name__)
+    logger.debug(
+        "Comparing types: a=%r (type=%s), b=%r (type=%s)", a, type(a), b, type(b)
     )
+    # Any value, protocol implementations included, is accepted by Any/object.
+    # (Any is a class since Python 3.11, so this must come first; and
+    # protocols must never reach issubclass() below.)
+    if is_protocol(a) and (is_any_or_missing(b) or b is object):
+        return True
+    # Protocols: structural conformance (A: Duck → B: SupportsQuack)
+    if is_protocol(b) and isinstance(a, type):
+        return check_conformance(a, b)
+    if is_protocol(a) and isinstance(b, type):
+        raise SignatureIncompatible(
+            message="Protocol cannot be replaced by a concrete type: other implementations would be rejected.",
+            context={"A_type": a, "B_type": b},
+            suggestion="Keep the protocol, or widen B to a protocol that A's members satisfy.",
+        )
     # T8: Adjacent types | A: uint8 → B: uint16 | ✗ | Behavioral differences matter
     # If both are types, not primitive, not subtypes, and not equal, fail
     if (
@@ -123,9 +280,7 @@ def is_type_compatible(a, b) -> bool:
         and not issubclass(b, a)
         and not issubclass(a, b)
     ):
-        logging.getLogger(__name__).debug(
-            f"Primitive type incompatibility detected: a={a}, b={b}"
-        )
+        logger.debug("Primitive type incompatibility detected: a=%s, b=%s", a, b)
         raise SignatureIncompatible(
             message="Implicit conversion between primitive types is not allowed.",
             context={"A_type": a, "B_type": b},
@@ -143,19 +298,34 @@ def is_type_compatible(a, b) -> bool:
     # | T1 | Same type | A: int → B: int | ✓ | Exact match
     if a == b:
         return True
+    # Two versions of the same class: equal fingerprints (or aliased modules)
+    # make each a qualified subclass of the other.
+    if (
+        isinstance(a, type)
+        and isinstance(b, type)
+        and is_qualified_subclass(a, b)
+        and is_qualified_subclass(b, a)
+    ):
+        return True
+    # Generics, unions, Literal, TypeVar and Callable: structural subtyping
+    if _is_structural(a) or _is_structural(b):
+        if _generic_le(a, b):
+            return True
+        raise SignatureIncompatible(
+            message="Incompatible generic types: B does not accept every value of A.",
+            context={"A_type": a, "B_type": b},
+            suggestion="Widen the type in B (covariant arguments and return, contravariant callable parameters).",
+        )
     # | T2 | Base → Derived (narrowing) | A: Animal → B: Cat | ✗ | New function requires specific subtype
-    logging.getLogger(__name__).debug(
-        f"a={a!r} b={b!r} a_type={type(a)} b_type={type(b)}"
-    )
-    try:
-        logging.getLogger(__name__).debug(
-            f"a.__module__={getattr(a, '__module__', None)!r} b.__module__={getattr(b, '__module__', None)!r}"
+    # The subtype checks below are only worth running twice when debugging.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "a.__module__=%r b.__module__=%r is_subtype(b, a)=%s is_subtype(a, b)=%s",
+            getattr(a, "__module__", None),
+            getattr(b, "__module__", None),
+            is_subtype(b, a),
+            is_subtype(a, b),
         )
-    except Exception as e:
-        logging.getLogger(__name__).debug(f"T2 DEBUG: error getting __module__: {e}")
-    logging.getLogger(__name__).debug(
-        f"is_subtype(b, a)={is_subtype(b, a)} is_subtype(a, b)={is_subtype(a, b)}"
-    )
     # Disallow narrowing: base → derived (A: Animal → B: Cat)
     if (
         isinstance(a, type)
@@ -190,13 +360,7 @@ def is_type_compatible(a, b) -> bool:
                 if issubclass(a, b):
                     return True
                 # Allow if a's MRO contains a class with the same name as b or any of b's ancestors (for ABCs across modules)
-                b_names = {
-                    getattr(cls, "__name__", None) for cls in getattr(b, "__mro__", [])
-                }
-                a_mro_names = {
-                    getattr(cls, "__name__", None) for cls in getattr(a, "__mro__", [])
-                }
-                if b_names & a_mro_names:
+                if ancestors(a) & ancestors(b):
                     return True
         # Otherwise, incompatible
         raise SignatureIncompatible(
@@ -245,8 +409,6 @@ def is_type_compatible(a, b) -> bool:
             return True
 
     # Container types: e.g., list[int], dict[str, int]
-    import types
-
     def parse_container(t):
         # Handle Python 3.9+ generics (e.g., list[int])
         if isinstance(t, types.GenericAlias):
@@ -0,0 +1,183 @@
+"""constraint.py
+
+Parsed constraint expressions.
+
+Constraints travel through ZVIC as strings such as `"_ < 10"`, and used to be
+re-parsed by every stage that looked at them. `parse_constraint` parses a
+string once and returns a shared, immutable `Constraint` with the normalized
+AST and source, the names it refers to, a stable digest and a lazily compiled
+predicate. Canonicalization, the asserts inserted by `AnnotateCallsTransformer`,
+the narrowing heuristics, the witness search and the CrossHair bridge all work
+from that object:
+
+    c = parse_constraint("_<10")
+    c.source              # "_ < 10"
+    c(3)                  # True
+    c.rename("x").source  # "x < 10"
+
+`rename` substitutes the constrained variable by AST, so names that merely
+contain an underscore (`is_valid(_)`, `"a_b"`) are left alone.
+
+A constraint may refer to other parameters of the same function, as in
+`def f(lo: int, hi: int(_ > lo))`. `relations` picks those out of a
+signature's constraints; `conjunction` combines bound constraints into one
+function-level precondition over several variables, which `evaluate` checks
+against a mapping of values.
+"""
+
+import ast
+import builtins
+import copy
+import functools
+import hashlib
+from collections.abc import Callable, Iterable, Mapping
+from types import CodeType
+from typing import Any
+
+# The placeholder constraints are written against, as in `int(_ < 10)`.
+SUBJECT = "_"
+
+
+class Constraint:
+    """
+    A parsed constraint over the variable `subject`. Create instances with
+    `parse_constraint()`, which caches them; treat them as immutable.
+    """
+
+    def __init__(self, tree: ast.Expression, subject: str = SUBJECT):
+        self.tree = tree
+        self.subject = subject
+        self.source = ast.unparse(tree)
+        self.names = frozenset(
+            node.id for node in ast.walk(tree) if isinstance(node, ast.Name)
+        )
+        self._predicate: Callable[[Any], Any] | None = None
+        self._code: CodeType | None = None
+
+    @property
+    def free_names(self) -> frozenset[str]:
+        """Names other than the subject and builtins, e.g. other parameters."""
+        return frozenset(
+            name
+            for name in self.names
+            if name != self.subject and not hasattr(builtins, name)
+        )
+
+    @property
+    def digest(self) -> str:
+        """A hash of the normalized constraint that is stable across processes."""
+        data = f"{self.subject}\0{self.source}".encode()
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    @property
+    def predicate(self) -> Callable[[Any], Any]:
+        """The constraint as a one-argument function, compiled on first use."""
+        if self._predicate is None:
+            code = compile(
+                f"lambda {self.subject}: ({self.source})", "<zvic-constraint>", "eval"
+            )
+            self._predicate = eval(code, {"__builtins__": builtins})
+        return self._predicate
+
+    def __call__(self, value: Any) -> bool:
+        return bool(self.predicate(value))
+
+    def evaluate(self, values: Mapping[str, Any]) -> bool:
+        """The constraint's truth value with its variables bound by `values`."""
+        if self._code is None:
+            self._code = compile(self.source, "<zvic-constraint>", "eval")
+        return bool(eval(self._code, {"__builtins__": builtins}, dict(values)))
+
+    def node(self) -> ast.expr:
+        """A fresh copy of the expression, safe to splice into another tree."""
+        return copy.deepcopy(self.tree.body)
+
+    def rename(self, name: str) -> "Constraint":
+        """The same constraint with the subject variable renamed to `name`."""
+        if name == self.subject:
+            return self
+        return _substitute(self, ((self.subject, name),), name)
+
+    def substitute(self, names: Mapping[str, str]) -> "Constraint":
+        """
+        The same constraint with every variable in `names` renamed at once,
+        e.g. B's parameter names mapped to A's.
+        """
+        names = {old: new for old, new in names.items() if old != new}
+        if not names.keys() & self.names:
+            return self
+        subject = names.get(self.subject, self.subject)
+        return _substitute(self, tuple(sorted(names.items())), subject)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Constraint):
+            return NotImplemented
+        return (self.subject, self.source) == (other.subject, other.source)
+
+    def __hash__(self) -> int:
+        return hash((self.subject, self.source))
+
+    def __repr__(self) -> str:
+        return f"Constraint({self.source!r})"
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_constraint(expr: str, subject: str = SUBJECT) -> Constraint:
+    """
+    The `Constraint` for the expression `expr` over `subject`, shared by all
+    callers. Raises SyntaxError if `expr` is not a Python expression.
+    """
+    return Constraint(ast.parse(expr, mode="eval"), subject)
+
+
+class _Rename(ast.NodeTransformer):
+    def __init__(self, names: Mapping[str, str]):
+        self.names = names
+
+    def visit_Name(self, node: ast.Name) -> ast.Name:
+        if node.id in self.names:
+            new = ast.Name(id=self.names[node.id], ctx=node.ctx)
+            return ast.copy_location(new, node)
+        return node
+
+
+@functools.lru_cache(maxsize=4096)
+def _substitute(
+    constraint: Constraint, names: tuple[tuple[str, str], ...], subject: str
+) -> Constraint:
+    tree = _Rename(dict(names)).visit(copy.deepcopy(constraint.tree))
+    # Going through parse_constraint shares the result with callers that
+    # start from the renamed text (e.g. the witness search).
+    return parse_constraint(ast.unparse(tree), subject)
+
+
+def conjunction(
+    constraints: Iterable[Constraint], subject: str = SUBJECT
+) -> Constraint | None:
+    """All of `constraints` as one constraint, or None if there are none."""
+    sources = [c.source for c in constraints]
+    if not sources:
+        return None
+    if len(sources) == 1:
+        return parse_constraint(sources[0], subject)
+    return parse_constraint(" and ".join(f"({s})" for s in sources), subject)
+
+
+def relations(constraints: Mapping[str, str | None]) -> dict[str, Constraint]:
+    """
+    The constraints of `constraints` (parameter name -> constraint source)
+    that refer to another parameter, bound to their own parameter:
+    `{"lo": None, "hi": "_ > lo"}` gives `{"hi": Constraint("hi > lo")}`.
+    Constraints that do not parse are left out.
+    """
+    found = {}
+    for name, source in constraints.items():
+        if not source:
+            continue
+        try:
+            bound = parse_constraint(source).rename(name)
+        except SyntaxError:
+            continue
+        if bound.names & (constraints.keys() - {name}):
+            found[name] = bound
+    return found
@@ -0,0 +1,196 @@
+"""In-process CrossHair checks of constraint implications.
+
+`check_implication(pre, post, params, timeout)` compiles a tiny `_chk`
+function whose precondition is `pre` and whose body asserts `post`, and
+runs CrossHair's analyser on it directly: no temp file, no subprocess, no
+parsing of CrossHair's console output. The verdict comes from the message
+states, the counterexample from the reported failing call.
+
+CrossHair patches builtins while it analyses, process-wide. Analyses hold
+`analysis_lock` exclusively; threads that run other checks concurrently
+(the `check_many` worker pool, daemon handlers) hold it shared, so no code
+runs against the patched builtins. A single-threaded `is_compatible` needs
+no lock of its own.
+"""
+
+import ast
+import contextlib
+import itertools
+import linecache
+import threading
+from collections.abc import Iterator, Mapping
+from typing import Any, NamedTuple
+
+
+class CrossHairResult(NamedTuple):
+    # True: every input satisfying `pre` satisfies `post`; False: refuted by
+    # `counterexample`; None: CrossHair could not analyse the check.
+    holds: bool | None
+    # Argument name -> value of the refuting input, if its repr is a literal.
+    counterexample: dict[str, Any] | None = None
+    # True if the verdict is certain (all paths explored, or a refutation);
+    # False if CrossHair merely found no counterexample in time.
+    exhaustive: bool = False
+    message: str = ""
+
+
+class AnalysisLock:
+    """
+    Shared/exclusive lock around CrossHair's patching of builtins.
+
+    `exclusive()` is held by CrossHair analyses; `shared()` by any other
+    work that loads modules or evaluates annotations and constraints while
+    analyses may run on other threads. Both are reentrant per thread, and an
+    analysis started inside a shared section drops that thread's hold while
+    it waits. `released()` does the same for any other wait on a second
+    thread (e.g. for a verdict that thread is computing), which would
+    otherwise deadlock against an analysis waiting for the shared holders.
+    Waiting analyses take precedence over new shared holders.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._shared = 0
+        self._exclusive: int | None = None
+        self._waiting = 0
+        self._local = threading.local()
+
+    def _depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    def _free(self) -> bool:
+        return self._exclusive is None and not self._waiting
+
+    @contextlib.contextmanager
+    def shared(self) -> Iterator[None]:
+        depth = self._depth()
+        with self._cond:
+            if depth == 0 and self._exclusive != threading.get_ident():
+                self._cond.wait_for(self._free)
+            self._shared += 1
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            with self._cond:
+                self._shared -= 1
+                self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def released(self) -> Iterator[None]:
+        depth = self._depth()
+        if depth == 0:
+            yield
+            return
+        with self._cond:
+            self._shared -= depth
+            self._cond.notify_all()
+        self._local.depth = 0
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._cond.wait_for(self._free)
+                self._shared += depth
+            self._local.depth = depth
+
+    @contextlib.contextmanager
+    def exclusive(self) -> Iterator[None]:
+        with self.released():
+            with self._cond:
+                self._waiting += 1
+                try:
+                    self._cond.wait_for(
+                        lambda: self._exclusive is None and not self._shared
+                    )
+                finally:
+                    self._waiting -= 1
+                self._exclusive = threading.get_ident()
+            try:
+                yield
+            finally:
+                with self._cond:
+                    self._exclusive = None
+                    self._cond.notify_all()
+
+
+analysis_lock = AnalysisLock()
+_names = itertools.count()
+
+
+def implication_source(pre: str, post: str, params: Mapping[str, str]) -> str:
+    """Source of the `_chk` function checked by `check_implication`."""
+    signature = ", ".join(
+        f"{name}: {annotation}" for name, annotation in params.items()
+    )
+    pre = pre.replace('"""', '\\"""')
+    return (
+        f'def _chk({signature}):\n    """\n    pre: {pre}\n    """\n    assert {post}\n'
+    )
+
+
+def _counterexample(message: str, names: list[str]) -> dict[str, Any] | None:
+    # CrossHair reports the failing call as "... when calling _chk(7)".
+    _, found, call = message.rpartition(" when calling ")
+    if not found:
+        return None
+    try:
+        node = ast.parse(call, mode="eval").body
+        if not isinstance(node, ast.Call):
+            return None
+        values = dict(zip(names, map(ast.literal_eval, node.args)))
+        for keyword in node.keywords:
+            values[keyword.arg] = ast.literal_eval(keyword.value)
+    except (SyntaxError, ValueError, TypeError):
+        return None
+    return values
+
+
+def check_implication(
+    pre: str, post: str, params: Mapping[str, str], timeout: float
+) -> CrossHairResult:
+    """
+    Search for arguments (named and annotated per `params`) that satisfy the
+    expression `pre` but not `post`, for at most about `timeout` seconds.
+
+    Raises ImportError if CrossHair is not installed.
+    """
+    from crosshair.core_and_libs import analyze_function, run_checkables
+    from crosshair.options import AnalysisKind, AnalysisOptionSet
+    from crosshair.statespace import MessageType
+
+    source = implication_source(pre, post, params)
+    # A linecache entry lets CrossHair read the conditions from the docstring.
+    filename = f"<zvic-check-{next(_names)}>"
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    try:
+        namespace: dict[str, Any] = {}
+        exec(compile(source, filename, "exec"), namespace)  # noqa: S102
+        options = AnalysisOptionSet(
+            analysis_kind=[AnalysisKind.PEP316],
+            per_condition_timeout=timeout,
+            report_all=True,
+        )
+        with analysis_lock.exclusive():
+            messages = list(
+                run_checkables(analyze_function(namespace["_chk"], options))
+            )
+    finally:
+        linecache.cache.pop(filename, None)
+    for m in messages:
+        if m.state in (
+            MessageType.EXEC_ERR,
+            MessageType.POST_FAIL,
+        ) and m.message.startswith("AssertionError"):
+            return CrossHairResult(
+                False, _counterexample(m.message, list(params)), True, m.message
+            )
+    states = {m.state for m in messages}
+    if states and states <= {MessageType.CONFIRMED, MessageType.PRE_UNSAT}:
+        return CrossHairResult(True, None, True, messages[0].message)
+    if not states or states == {MessageType.CANNOT_CONFIRM}:
+        return CrossHairResult(True, None, False, "No counterexample found in time")
+    # Any other error (e.g. a NameError in a condition) means the check
+    # itself is broken, not that the constraints are incompatible.
+    return CrossHairResult(None, None, False, messages[0].message)
@@ -0,0 +1,339 @@
+"""Long-running compatibility daemon.
+
+Keeps loaded modules, type-pair verdicts, CrossHair results and known
+counterexamples in memory between checks, so an editor or pre-commit loop
+does not pay for interpreter start-up, zvic import, module loading and
+constraint analysis on every run.
+
+The daemon listens on a Unix socket and speaks newline-delimited JSON: one
+request object per line, one response object per line.
+
+    {"op": "check", "a": "old/mod.py", "b": "new/mod.py", "symbol": "f"}
+    -> {"status": "compatible", "elapsed_ms": 3.1}
+    -> {"status": "incompatible", "message": "...", "error": {...}, ...}
+    -> {"status": "unknown", ...}  (with an optional "budget" in seconds)
+    {"op": "ping"} / {"op": "stats"} / {"op": "clear"} / {"op": "shutdown"}
+
+Modules are loaded with `load_module` and reused until their file changes.
+Each connection is handled on its own thread; checks hold `analysis_lock`
+shared so they never run while CrossHair has the builtins patched for a
+check on another connection.
+
+Usage:
+    python -m zvic.daemon serve [--socket PATH]
+    python -m zvic.daemon check A.py B.py [--symbol NAME] [--budget SECONDS]
+        [--socket PATH]
+    python -m zvic.daemon stop [--socket PATH]
+"""
+
+from __future__ import annotations
+
+import contextlib
+import errno
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Self
+
+from .compatibility import is_compatible
+from .compatibility_constraints import crosshair_results
+from .compatibility_protocols import clear_protocol_cache
+from .compatibility_types import type_verdicts
+from .crosshair_inprocess import analysis_lock
+from .exception import CompatibilityUnknown, SignatureIncompatible
+from .main import clear_signature_cache, load_module
+from .witnesses import witnesses
+
+
+def default_socket_path() -> Path:
+    """
+    `$XDG_RUNTIME_DIR/zvic-UID.sock`, or `daemon.sock` in a private per-user
+    directory (`zvic-UID`, mode 0700) under the temporary directory.
+    """
+    uid = os.getuid()
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / f"zvic-{uid}.sock"
+    private = Path(tempfile.gettempdir()) / f"zvic-{uid}"
+    with contextlib.suppress(FileExistsError):
+        private.mkdir(mode=0o700)
+    st = private.lstat()
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != uid or st.st_mode & 0o077:
+        raise PermissionError(
+            errno.EACCES,
+            "Socket directory is not a private directory owned by this user",
+            str(private),
+        )
+    return private / "daemon.sock"
+
+
+def _check_owner(path: Path) -> os.stat_result | None:
+    """
+    Return the `lstat` of `path` (None if it does not exist). Raises
+    PermissionError (EPERM) if it belongs to another user, so we never talk
+    to or remove someone else's socket.
+    """
+    try:
+        st = path.lstat()
+    except FileNotFoundError:
+        return None
+    if st.st_uid != os.getuid():
+        raise PermissionError(errno.EPERM, "Socket is owned by another user", str(path))
+    return st
+
+
+class DaemonState:
+    """Loaded modules, keyed by path and invalidated when the file changes."""
+
+    def __init__(self):
+        self._modules: dict[Path, tuple[tuple[int, int], ModuleType]] = {}
+        self._lock = threading.Lock()
+        self._loads = 0
+        self.checks = 0
+
+    def module(self, path: str | Path) -> ModuleType:
+        path = Path(path).resolve()
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._modules.get(path)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            self._loads += 1
+            name = f"{path.stem}__zvic_daemon_{self._loads}"
+        mod = load_module(path, name)
+        with self._lock:
+            self._modules[path] = (stamp, mod)
+        return mod
+
+    def check(
+        self,
+        a: str,
+        b: str,
+        symbol: str | None = None,
+        budget: float | None = None,
+    ) -> dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            with analysis_lock.shared():
+                mod_a, mod_b = self.module(a), self.module(b)
+                obj_a = getattr(mod_a, symbol) if symbol else mod_a
+                obj_b = getattr(mod_b, symbol) if symbol else mod_b
+                with self._lock:
+                    self.checks += 1
+                is_compatible(obj_a, obj_b, budget=budget)
+        except (SignatureIncompatible, CompatibilityUnknown) as e:
+            result = {
+                "status": "unknown"
+                if isinstance(e, CompatibilityUnknown)
+                else "incompatible",
+                "message": e.message,
+                "error": json.loads(e.to_json()),
+            }
+        else:
+            result = {"status": "compatible"}
+        result["elapsed_ms"] = (time.perf_counter() - start) * 1000
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "modules": len(self._modules),
+            "checks": self.checks,
+            "type_verdicts": len(type_verdicts),
+            "crosshair_results": len(crosshair_results),
+            "witnesses": len(witnesses),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._modules.clear()
+        type_verdicts.clear()
+        crosshair_results.clear()
+        witnesses.clear()
+        clear_protocol_cache()
+        clear_signature_cache()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: CompatibilityServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.dispatch(line)
+            self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+            self.wfile.flush()
+
+
+def _remove_stale_socket(path: Path) -> None:
+    """
+    Unlink `path` if it is a socket nothing listens on (left behind by a
+    daemon that died). Raises OSError (EADDRINUSE) if a daemon is listening.
+    Anything that is not a socket is left alone; binding then fails. A
+    socket of another user raises PermissionError and is not touched.
+    """
+    st = _check_owner(path)
+    if st is None or not stat.S_ISSOCK(st.st_mode):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except ConnectionRefusedError:
+        path.unlink(missing_ok=True)
+        return
+    finally:
+        probe.close()
+    raise OSError(
+        errno.EADDRINUSE, "A zvic daemon is already listening on this socket", str(path)
+    )
+
+
+class CompatibilityServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str | Path, state: DaemonState | None = None):
+        self.socket_path = Path(socket_path)
+        self._bound = False
+        _remove_stale_socket(self.socket_path)
+        self.state = state or DaemonState()
+        super().__init__(str(self.socket_path), _Handler)
+
+    def dispatch(self, line: bytes) -> dict[str, Any]:
+        try:
+            request = json.loads(line)
+            op = request.get("op")
+            if op == "check":
+                return self.state.check(
+                    request["a"],
+                    request["b"],
+                    request.get("symbol"),
+                    request.get("budget"),
+                )
+            if op == "ping":
+                return {"status": "ok", "pid": os.getpid()}
+            if op == "stats":
+                return {"status": "ok", **self.state.stats()}
+            if op == "clear":
+                self.state.clear()
+                return {"status": "ok"}
+            if op == "shutdown":
+                # shutdown() waits for serve_forever(), which runs elsewhere.
+                threading.Thread(target=self.shutdown, daemon=True).start()
+                return {"status": "ok"}
+            return {"status": "error", "message": f"Unknown op: {op!r}"}
+        except Exception as e:  # noqa: BLE001 - the daemon must keep serving
+            return {"status": "error", "message": f"{type(e).__name__}: {e}"}
+
+    def server_bind(self) -> None:
+        super().server_bind()
+        self._bound = True
+
+    def server_close(self) -> None:
+        super().server_close()
+        # Also called when binding fails; the path is not ours then.
+        if self._bound:
+            self.socket_path.unlink(missing_ok=True)
+
+
+def serve(socket_path: str | Path | None = None) -> None:
+    """Run the daemon in the foreground until it receives a shutdown request."""
+    with CompatibilityServer(socket_path or default_socket_path()) as server:
+        server.serve_forever()
+
+
+class Client:
+    """Thin client for the daemon; one connection, reused across requests."""
+
+    def __init__(self, socket_path: str | Path | None = None, timeout: float = 600):
+        path = Path(socket_path or default_socket_path())
+        _check_owner(path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(str(path))
+        self._file = self._sock.makefile("rwb")
+
+    def request(self, **request: Any) -> dict[str, Any]:
+        self._file.write(json.dumps(request).encode() + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("zvic daemon closed the connection")
+        return json.loads(line)
+
+    def check(
+        self,
+        a: str | Path,
+        b: str | Path,
+        symbol: str | None = None,
+        budget: float | None = None,
+    ) -> dict:
+        # The daemon has its own working directory; send absolute paths.
+        return self.request(
+            op="check",
+            a=str(Path(a).resolve()),
+            b=str(Path(b).resolve()),
+            symbol=symbol,
+            budget=budget,
+        )
+
+    def ping(self) -> dict:
+        return self.request(op="ping")
+
+    def stats(self) -> dict:
+        return self.request(op="stats")
+
+    def shutdown(self) -> dict:
+        return self.request(op="shutdown")
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    p = argparse.ArgumentParser(
+        prog="python -m zvic.daemon",
+        description="Serve or query the ZVIC compatibility daemon.",
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--socket", type=Path, default=None)
+    sub = p.add_subparsers(dest="command", required=True)
+    sub.add_parser("serve", parents=[common])
+    check = sub.add_parser("check", parents=[common])
+    check.add_argument("a")
+    check.add_argument("b")
+    check.add_argument("--symbol")
+    check.add_argument("--budget", type=float, help="Time budget in seconds")
+    sub.add_parser("stop", parents=[common])
+    args = p.parse_args(argv)
+    if args.command == "serve":
+        serve(args.socket)
+        return 0
+    with Client(args.socket) as client:
+        if args.command == "stop":
+            client.shutdown()
+            return 0
+        res = client.check(args.a, args.b, args.symbol, args.budget)
+    print(json.dumps(res, indent=2))
+    return 0 if res["status"] == "compatible" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -114,4 +114,16 @@ class SignatureIncompatible(ZVICError):
         )
 
 
+class CompatibilityUnknown(ZVICError):
+    """
+    Raised when compatibility could not be decided either way, e.g. because
+    the time budget ran out before a constraint pair could be analysed.
+    """
+
+    error_id = "ZV1002"
+    type = "CompatibilityUnknown"
+    error_namespace = "ZVIC_COMPAT"
+    severity = "warning"
+
+
 # Add more ZVIC-specific errors as needed
@@ -0,0 +1,225 @@
+"""Git-aware contract diff.
+
+Compares the contracts of two git revisions without checking anything out or
+importing any code: only Python files whose blob changed between the
+revisions are looked at, their contracts are extracted statically (see
+`static_contract`) and compared with the regular ZVIC rules. Contracts are
+cached per blob hash, in memory and as JSON files under the repository's git
+directory, so repeated checks of the same blobs are free. The files live in
+a directory named after the contract schema and the zvic version, and store
+the literals JSON lacks (tuples, sets, bytes, ...) tagged with their type, so
+a cached contract equals a freshly extracted one.
+
+Usage:
+    python -m zvic.git_diff REV_A REV_B [--repo PATH]
+"""
+
+from __future__ import annotations
+
+import importlib.metadata
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+from .exception import SignatureIncompatible
+from .static_contract import (
+    CONTRACT_SCHEMA,
+    STATIC_CONTRACT,
+    extract_contract,
+    is_contract_compatible,
+)
+
+CACHE_DIRNAME = "zvic-contracts"
+# Marks a JSON object holding a literal JSON has no type for, as
+# {"__zvic__": [kind, payload]}.
+_TAG = "__zvic__"
+
+_contract_cache: dict[str, STATIC_CONTRACT] = {}
+
+
+def _git(repo: str | Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        encoding="utf-8",
+    ).stdout
+
+
+def python_blobs(rev: str, repo: str | Path = ".") -> dict[str, str]:
+    """Map the path of every Python file at `rev` to its blob hash."""
+    blobs: dict[str, str] = {}
+    for line in _git(repo, "ls-tree", "-r", "--full-tree", rev).splitlines():
+        meta, _, path = line.partition("\t")
+        _mode, kind, blob = meta.split()
+        if kind == "blob" and path.endswith(".py"):
+            blobs[path] = blob
+    return blobs
+
+
+def changed_python_files(
+    rev_a: str, rev_b: str, repo: str | Path = "."
+) -> dict[str, tuple[str | None, str | None]]:
+    """Map each Python path whose blob differs between the revisions to its
+    (blob at rev_a, blob at rev_b); None marks a file missing on that side."""
+    a, b = python_blobs(rev_a, repo), python_blobs(rev_b, repo)
+    return {
+        path: (a.get(path), b.get(path))
+        for path in sorted(a.keys() | b.keys())
+        if a.get(path) != b.get(path)
+    }
+
+
+def _cache_version() -> str:
+    try:
+        version = importlib.metadata.version("zvic")
+    except importlib.metadata.PackageNotFoundError:
+        version = "dev"
+    return f"schema{CONTRACT_SCHEMA}-zvic{version}"
+
+
+def _cache_dir(repo: str | Path) -> Path:
+    git_dir = Path(_git(repo, "rev-parse", "--git-dir").strip())
+    if not git_dir.is_absolute():
+        git_dir = Path(repo) / git_dir
+    return git_dir / CACHE_DIRNAME / _cache_version()
+
+
+def _encode(value: Any) -> Any:
+    """`value` as JSON data, with the literal types JSON lacks tagged."""
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        if _TAG in value or not all(isinstance(k, str) for k in value):
+            return {
+                _TAG: ["dict", [[_encode(k), _encode(v)] for k, v in value.items()]]
+            }
+        return {k: _encode(v) for k, v in value.items()}
+    if value is None or isinstance(value, str | bool | int | float):
+        return value
+    if isinstance(value, tuple | set | frozenset):
+        return {_TAG: [type(value).__name__, [_encode(v) for v in value]]}
+    if isinstance(value, bytes):
+        return {_TAG: ["bytes", value.hex()]}
+    if isinstance(value, complex):
+        return {_TAG: ["complex", [value.real, value.imag]]}
+    if value is Ellipsis:
+        return {_TAG: ["ellipsis", None]}
+    raise TypeError(f"Cannot store {value!r} in a contract cache file")
+
+
+_DECODERS = {
+    "dict": lambda pairs: {_decode(k): _decode(v) for k, v in pairs},
+    "tuple": lambda items: tuple(map(_decode, items)),
+    "set": lambda items: set(map(_decode, items)),
+    "frozenset": lambda items: frozenset(map(_decode, items)),
+    "bytes": bytes.fromhex,
+    "complex": lambda parts: complex(*parts),
+    "ellipsis": lambda _: Ellipsis,
+}
+
+
+def _decode(data: Any) -> Any:
+    """The inverse of `_encode`."""
+    if isinstance(data, list):
+        return [_decode(v) for v in data]
+    if isinstance(data, dict):
+        if data.keys() == {_TAG}:
+            kind, payload = data[_TAG]
+            return _DECODERS[kind](payload)
+        return {k: _decode(v) for k, v in data.items()}
+    return data
+
+
+def blob_contract(
+    blob: str, repo: str | Path = ".", cache_dir: Path | None = None
+) -> STATIC_CONTRACT:
+    """Return the static contract of a blob, cached by blob hash."""
+    try:
+        return _contract_cache[blob]
+    except KeyError:
+        pass
+    cache_file = cache_dir / f"{blob}.json" if cache_dir is not None else None
+    contract = None
+    if cache_file is not None and cache_file.exists():
+        try:
+            contract = _decode(json.loads(cache_file.read_text(encoding="utf-8")))
+        except (ValueError, KeyError, TypeError):
+            pass  # a damaged cache file is simply rewritten
+    if contract is None:
+        contract = extract_contract(_git(repo, "show", blob), filename=blob)
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(_encode(contract)), encoding="utf-8")
+    _contract_cache[blob] = contract
+    return contract
+
+
+def diff_revisions(
+    rev_a: str,
+    rev_b: str,
+    repo: str | Path = ".",
+    *,
+    use_disk_cache: bool = True,
+) -> dict:
+    """
+    Check that every Python module changed between `rev_a` and `rev_b` is
+    ZVIC-compatible. Returns a report with a per-file status: "compatible",
+    "incompatible", "removed" (present in A only), "added" (present in B
+    only) or "error" (e.g. a syntax error in one of the versions; any error
+    while extracting or comparing one file is reported on that file).
+    """
+    cache_dir = _cache_dir(repo) if use_disk_cache else None
+    files: dict[str, dict] = {}
+    for path, (blob_a, blob_b) in changed_python_files(rev_a, rev_b, repo).items():
+        if blob_b is None:
+            files[path] = {"status": "removed"}
+            continue
+        if blob_a is None:
+            files[path] = {"status": "added"}
+            continue
+        try:
+            a = blob_contract(blob_a, repo, cache_dir)
+            b = blob_contract(blob_b, repo, cache_dir)
+            is_contract_compatible(a, b, module_name=path)
+        except SignatureIncompatible as e:
+            files[path] = {"status": "incompatible", "message": e.message}
+        except SyntaxError as e:
+            files[path] = {"status": "error", "message": str(e)}
+        except Exception as e:  # noqa: BLE001 - reported per file
+            files[path] = {"status": "error", "message": f"{type(e).__name__}: {e}"}
+        else:
+            files[path] = {"status": "compatible"}
+    ok = all(f["status"] in ("compatible", "added") for f in files.values())
+    return {"ok": ok, "rev_a": rev_a, "rev_b": rev_b, "files": files}
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    p = argparse.ArgumentParser(
+        prog="python -m zvic.git_diff",
+        description="Check the Python files changed between two git revisions for ZVIC compatibility.",
+    )
+    p.add_argument("rev_a")
+    p.add_argument("rev_b")
+    p.add_argument("--repo", default=".")
+    p.add_argument(
+        "--no-cache",
+        dest="use_disk_cache",
+        action="store_false",
+        help="Do not read or write the per-blob contract cache in the git directory",
+    )
+    args = p.parse_args(argv)
+    res = diff_revisions(
+        args.rev_a, args.rev_b, args.repo, use_disk_cache=args.use_disk_cache
+    )
+    print(json.dumps(res, indent=2))
+    return 0 if res["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
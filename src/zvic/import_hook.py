@@ -65,6 +65,12 @@ class ZvicFinder(importlib.abc.MetaPathFinder):
         )
         if not allowed:
             return None
-        # Create a new spec that uses our loader
+        # Create a new spec that uses our loader; keep the search locations
+        # so packages stay packages and their submodules can be found
         loader = ZvicLoader(fullname, origin)
-        return importlib.util.spec_from_loader(fullname, loader, origin=origin)
+        return importlib.util.spec_from_file_location(
+            fullname,
+            origin,
+            loader=loader,
+            submodule_search_locations=spec.submodule_search_locations,
+        )
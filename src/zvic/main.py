@@ -1,15 +1,19 @@
 import ast
 import contextlib
+import importlib
 import inspect
 import sys
 from collections.abc import Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
 from types import ModuleType
-from typing import Any, get_args, get_origin, get_type_hints
+from typing import Any
 
 from .ast_utils import transform_module
+from .canonical import as_dict, compact_signature
 from .import_hook import ZvicFinder
-from .utils import _, assumption, normalize_constraint
+from .tracing import CANONICALIZE, span
+from .utils import _, assumption, import_lock, iter_submodule_names, swap_namespace
 
 # More permissive canonical type to match function/class representations
 CANONICAL = Mapping[str, Any]
@@ -21,6 +25,8 @@ __all__ = [
     "uninstall_import_hook",
     "load_module",
     "canonicalize",
+    "canonicalize_package",
+    "clear_signature_cache",
     "pprint_recursive",
     "transform_replace",
 ]
@@ -51,10 +57,13 @@ def constrain_this_module(*, return_lingering: bool = False):
     if "assumption" not in caller_globals:
         caller_globals["assumption"] = assumption
 
-    # Prevent recursion: only transform if not already transformed
-    if caller_globals.get("__zvic_transformed__", False):
-        return
-    caller_globals["__zvic_transformed__"] = True
+    # Prevent recursion: only transform if not already transformed. The
+    # check-and-set happens under the import lock so two threads racing on
+    # the same module cannot both transform it.
+    with import_lock():
+        if caller_globals.get("__zvic_transformed__", False):
+            return
+        caller_globals["__zvic_transformed__"] = True
 
     filename = caller_globals.get("__file__")
     if not filename:
@@ -222,19 +231,12 @@ def constrain_this_module(*, return_lingering: bool = False):
     import weakref
 
     old_mod_ref = weakref.ref(original_module) if original_module is not None else None
-    sys.modules[module_name] = new_mod
-
-    # Replace caller globals: remove names that no longer exist and update others
-    new_keys = set(new_mod.__dict__.keys())
-    for k in list(caller_globals.keys()):
-        if k.startswith("__"):
-            continue
-        if k not in new_keys:
-            del caller_globals[k]
-    for k, v in new_mod.__dict__.items():
-        if k == "__file__":
-            continue
-        caller_globals[k] = v
+
+    # Publish the fully executed namespace in one step: concurrent callers
+    # see either all old or all new objects, never a half-replaced module.
+    with import_lock():
+        sys.modules[module_name] = new_mod
+        swap_namespace(caller_globals, new_mod.__dict__)
 
     # Try to allow the old module to be garbage-collected; if it remains,
     # perform a scan to report which names are still referenced elsewhere.
@@ -319,12 +321,74 @@ def load_module(path: Path, module_name: str) -> ModuleType:
 
     setattr(mod, "__original_source__", original_source)
 
-    canonical = canonicalize(mod)
-    setattr(mod, "_zvic_canonical", canonical)
+    # Canonical forms are computed per symbol on first access; most loaded
+    # modules are never compared, so they should not pay for it up front.
+    setattr(mod, "_zvic_canonical", LazyCanonical(mod))
     assert assumption(mod, ModuleType)
     return mod
 
 
+def _is_canonical_member(module: ModuleType, name: str, attr: Any) -> bool:
+    """Only user-defined functions and classes of `module` are canonicalized
+    (built-ins, imports and typing helpers are skipped)."""
+    if name == "Annotated":
+        return False
+    return (inspect.isfunction(attr) or inspect.isclass(attr)) and getattr(
+        attr, "__module__", None
+    ) == module.__name__
+
+
+def _canonical_member(attr: Any) -> CANONICAL:
+    # A function is represented as a dict with a single '__call__' field,
+    # a class as its methods and __call__.
+    if inspect.isfunction(attr):
+        return {"__call__": canonical_signature(attr)}
+    return canonicalize(attr)
+
+
+class LazyCanonical(Mapping):
+    """
+    Read-only mapping with the same content as `canonicalize(module)`, but
+    each symbol is canonicalized only when it is first looked up.
+    """
+
+    def __init__(self, module: ModuleType):
+        self._module = module
+        self._names: list[str] | None = None
+        self._computed: dict[str, CANONICAL] = {}
+
+    def _member_names(self) -> list[str]:
+        if self._names is None:
+            self._names = [
+                name
+                for name, attr in vars(self._module).items()
+                if _is_canonical_member(self._module, name, attr)
+            ]
+        return self._names
+
+    def __getitem__(self, name: str) -> CANONICAL:
+        try:
+            return self._computed[name]
+        except KeyError:
+            pass
+        if name not in self._member_names():
+            raise KeyError(name)
+        value = self._computed[name] = _canonical_member(vars(self._module)[name])
+        return value
+
+    def __iter__(self):
+        return iter(self._member_names())
+
+    def __len__(self) -> int:
+        return len(self._member_names())
+
+    def __repr__(self) -> str:
+        return (
+            f"<LazyCanonical {self._module.__name__!r} "
+            f"{len(self._computed)}/{len(self)} computed>"
+        )
+
+
 def canonicalize(obj: Any) -> CANONICAL:
     """
     Canonicalize any object using the type normalization layer.
@@ -332,25 +396,17 @@ def canonicalize(obj: Any) -> CANONICAL:
     For a function or class, returns its canonical signature/type.
     For other objects, returns their normalized type.
     """
+    with span(CANONICALIZE, obj=obj):
+        return _canonicalize(obj)
+
+
+def _canonicalize(obj: Any) -> CANONICAL:
     if isinstance(obj, ModuleType):
-        # Only include user-defined functions and classes (exclude built-ins, imports, and typing helpers)
-        result: CANONICAL = {}
-        for attr_name, attr in vars(obj).items():
-            if attr_name == "Annotated":
-                continue
-            # If it's a function, represent as a dict with a single '__call__' field
-            if (
-                inspect.isfunction(attr)
-                and getattr(attr, "__module__", None) == obj.__name__
-            ):
-                result[attr_name] = {"__call__": canonical_signature(attr)}
-            # If it's a class, represent as its methods and __call__
-            elif (
-                inspect.isclass(attr)
-                and getattr(attr, "__module__", None) == obj.__name__
-            ):
-                result[attr_name] = canonicalize(attr)
-        return result
+        return {
+            attr_name: _canonical_member(attr)
+            for attr_name, attr in vars(obj).items()
+            if _is_canonical_member(obj, attr_name, attr)
+        }
     elif inspect.isclass(obj):
         result: CANONICAL = {}
         # If the class is callable (has a custom __call__), represent it by its __call__
@@ -385,100 +441,61 @@ def canonicalize(obj: Any) -> CANONICAL:
         return canonical_signature(obj)
 
 
-def canonical_signature(func: Any, name: str | None = None) -> CANONICAL:
-    sig = inspect.signature(func)
+def _canonicalize_by_name(module_name: str) -> CANONICAL:
+    # Module-level so it can be shipped to a ProcessPoolExecutor worker.
+    return canonicalize(importlib.import_module(module_name))
 
-    def strip_typing_prefix(s: str) -> str:
-        return s.replace("typing.", "") if s.startswith("typing.") else s
 
-    positional_only: list[dict[str, Any]] = []
-    positional_or_keyword: list[dict[str, Any]] = []
-    keyword_only: list[dict[str, Any]] = []
-    # Use runtime type hints for robust Annotated extraction
-    try:
-        type_hints = get_type_hints(func, include_extras=True)
-    except Exception:
-        type_hints = {}
-    for param in sig.parameters.values():
-        param_info = {}
-        ann = type_hints.get(param.name, param.annotation)
-        origin = get_origin(ann)
-        args = get_args(ann)
-        if origin is not None and origin.__name__ == "Annotated" and len(args) >= 2:
-            base_type = args[0]
-            if hasattr(base_type, "__name__"):
-                param_info["type"] = base_type.__name__
-            else:
-                param_info["type"] = strip_typing_prefix(str(base_type))
-            param_info["constraint"] = normalize_constraint(str(args[1]))
-        elif ann != inspect.Signature.empty:
-            if hasattr(ann, "__module__") and ann.__module__ == "typing":
-                param_info["type"] = strip_typing_prefix(str(ann))
-            elif hasattr(ann, "__name__"):
-                param_info["type"] = ann.__name__
-            else:
-                param_info["type"] = str(ann)
-        else:
-            param_info["type"] = None
-        if param.kind in (
-            inspect.Parameter.POSITIONAL_OR_KEYWORD,
-            inspect.Parameter.KEYWORD_ONLY,
-        ):
-            param_info["name"] = param.name
-        if param.default != inspect.Signature.empty:
-            param_info["default"] = param.default
-        if param.kind == inspect.Parameter.POSITIONAL_ONLY:
-            positional_only.append(param_info)
-        elif param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD:
-            positional_or_keyword.append(param_info)
-        elif param.kind == inspect.Parameter.KEYWORD_ONLY:
-            keyword_only.append(param_info)
-    # Remove 'type' field if it is None
-    for plist in (positional_only, positional_or_keyword, keyword_only):
-        for p in plist:
-            if "type" in p and p["type"] is None:
-                del p["type"]
-    keyword_only = sorted(keyword_only, key=lambda p: p["name"])
-    params: dict[str, list[dict[str, Any]]] = {
-        "positional_only": positional_only,
-        "positional_or_keyword": positional_or_keyword,
-        "keyword_only": keyword_only,
-    }
-    # Handle return type using runtime type hints
+def canonicalize_package(
+    package: ModuleType,
+    *,
+    snapshot: Mapping[str, CANONICAL] | None = None,
+    executor: Executor | None = None,
+    max_workers: int | None = None,
+) -> dict[str, CANONICAL]:
+    """
+    Canonicalize a package and all of its submodules into one contract tree.
+
+    Returns a dict mapping dotted module names (the package itself first) to
+    `canonicalize(module)`. Submodules are discovered from the file system
+    without importing them; names present in `snapshot` (e.g. a contract tree
+    saved from an earlier run) are taken from it and never executed. The
+    remaining modules are imported and canonicalized on `executor`, by default
+    a thread pool; pass a ProcessPoolExecutor to spread the work across cores
+    (the canonical forms, including defaults, must then be picklable).
+    """
+    snapshot = snapshot or {}
+    names = [package.__name__, *iter_submodule_names(package)]
+    pending = [name for name in names if name not in snapshot]
+    pool = ThreadPoolExecutor(max_workers) if executor is None else executor
     try:
-        return_ann = type_hints.get("return", sig.return_annotation)
-    except Exception:
-        return_ann = sig.return_annotation
-    return_info = {}
-    origin = get_origin(return_ann)
-    args = get_args(return_ann)
-    if origin is not None and origin.__name__ == "Annotated" and len(args) >= 2:
-        base_type = args[0]
-        if hasattr(base_type, "__name__"):
-            return_info["type"] = base_type.__name__
-        else:
-            return_info["type"] = strip_typing_prefix(str(base_type))
-        return_info["constraint"] = normalize_constraint(str(args[1]))
-    elif return_ann != inspect.Signature.empty:
-        if hasattr(return_ann, "__module__") and return_ann.__module__ == "typing":
-            return_info["type"] = strip_typing_prefix(str(return_ann))
-        elif hasattr(return_ann, "__name__"):
-            return_info["type"] = return_ann.__name__
-        else:
-            return_info["type"] = str(return_ann)
-    else:
-        return_info["type"] = None
-    if return_info.get("type") == "None":
-        return_info["type"] = None
-    # Remove 'type' field from return if it is None
-    if "type" in return_info and return_info["type"] is None:
-        del return_info["type"]
+        results = dict(zip(pending, pool.map(_canonicalize_by_name, pending)))
+    finally:
+        if executor is None:
+            pool.shutdown()
     return {
-        "params": params,
-        "return": return_info,
+        name: snapshot[name] if name in snapshot else results[name] for name in names
     }
 
 
+def clear_signature_cache() -> None:
+    """Drop all cached canonical signatures."""
+    compact_signature.clear()
+
+
+def canonical_signature(func: Any, name: str | None = None) -> CANONICAL:
+    """
+    Return the canonical signature of `func`.
+
+    Only the compact record is cached (per plain function, until the function
+    is collected or its code, annotations or defaults change); the dict is
+    built from it on each call, so callers may mutate it freely. `name` is accepted for backward
+    compatibility and ignored. See `zvic.canonical` for the compact record
+    form.
+    """
+    return as_dict(compact_signature(func))
+
+
 def pprint_recursive(obj, indent=0):
     prefix = " " * indent
     if isinstance(obj, dict):
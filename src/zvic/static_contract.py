@@ -0,0 +1,545 @@
+"""static_contract.py
+
+Import-free contract extraction.
+
+Builds the canonical contract of a module straight from its source via `ast`,
+without executing it, so contracts can be computed and compared for modules
+with heavy import-time side effects or for thousands of files in CI.
+Annotation constraints are parsed with the same `AnnotateCallsTransformer`
+used at import time, and names are resolved symbolically from the module's
+imports and class definitions.
+
+A static contract has the shape of `canonicalize(module)` with a few
+additions needed to compare it without the live objects:
+
+- `"__all__"`: the public names of the module (its literal `__all__` if it
+  has one, otherwise every top-level binding not starting with an underscore);
+- classes carry `"__bases__"` (resolved base names), `"__init__"`,
+  `"__attributes__"` (public names assigned in the class body) and, for
+  enums, `"__enum__"` (member names and values in definition order);
+- signatures carry `"var_positional"` / `"var_keyword"` in `"params"` when the
+  function takes `*args` / `**kwargs`, and `"async": True` /
+  `"generator": True` for coroutine and generator functions.
+
+Defaults are literal values where `ast.literal_eval` accepts them and their
+source text otherwise.
+"""
+
+import ast
+import builtins
+import inspect
+import sys
+from pathlib import Path
+from typing import Annotated, Any
+
+from .annotation_constraints import AnnotateCallsTransformer
+from .compatibility import is_signature_compatible
+from .exception import SignatureIncompatible
+from .utils import normalize_constraint
+
+STATIC_CONTRACT = dict[str, Any]
+# Version of the contract layout; bump it when extraction changes, so
+# contracts stored by an older zvic (see `git_diff`) are not reused.
+CONTRACT_SCHEMA = 2
+
+# Class entries hold their methods plus these keys.
+_CLASS_META = frozenset({"__bases__", "__attributes__", "__enum__"})
+_ENUM_BASES = frozenset(
+    f"{prefix}{name}"
+    for prefix in ("", "enum.")
+    for name in ("Enum", "IntEnum", "StrEnum", "Flag", "IntFlag")
+)
+# `object.__init__`, which classes without an `__init__` of their own (and
+# no base in the contract) inherit.
+_OBJECT_INIT: dict[str, Any] = {
+    "params": {
+        "positional_only": [{}],
+        "positional_or_keyword": [],
+        "keyword_only": [],
+        "var_positional": "args",
+        "var_keyword": "kwargs",
+    },
+    "return": {},
+}
+
+# Modules whose names are rendered without their prefix, like the runtime
+# canonical form does for typing (e.g. `typing.List[int]` -> `List[int]`).
+_BARE_MODULES = ("typing", "builtins")
+
+
+def _import_aliases(tree: ast.Module) -> dict[str, str]:
+    """Map names bound by top-level imports to their dotted targets."""
+    aliases: dict[str, str] = {}
+    for stmt in tree.body:
+        if isinstance(stmt, ast.Import):
+            for alias in stmt.names:
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+        elif isinstance(stmt, ast.ImportFrom) and stmt.module and not stmt.level:
+            for alias in stmt.names:
+                if alias.name != "*":
+                    aliases[alias.asname or alias.name] = f"{stmt.module}.{alias.name}"
+    return aliases
+
+
+class _ResolveAliases(ast.NodeTransformer):
+    def __init__(self, aliases: dict[str, str]):
+        self.aliases = aliases
+
+    def visit_Name(self, node: ast.Name) -> ast.expr:
+        target = self.aliases.get(node.id)
+        if target is None:
+            return node
+        module, _, name = target.rpartition(".")
+        if module in _BARE_MODULES:
+            return ast.copy_location(ast.Name(id=name, ctx=node.ctx), node)
+        return ast.copy_location(ast.parse(target, mode="eval").body, node)
+
+
+def _render_type(node: ast.expr | None, aliases: dict[str, str]) -> str | None:
+    if node is None:
+        return None
+    # Postponed/quoted annotations: parse the string itself.
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        try:
+            node = ast.parse(node.value, mode="eval").body
+        except SyntaxError:
+            return node.value
+    text = ast.unparse(_ResolveAliases(aliases).visit(node))
+    for prefix in _BARE_MODULES:
+        text = text.replace(f"{prefix}.", "")
+    return sys.intern(text)
+
+
+def _split_annotated(node: ast.expr | None) -> tuple[ast.expr | None, str | None]:
+    """Split a transformed `Annotated[T, "constraint"]` node into its parts."""
+    if (
+        isinstance(node, ast.Subscript)
+        and getattr(node.value, "id", None) == "Annotated"
+        and isinstance(node.slice, ast.Tuple)
+        and len(node.slice.elts) == 2
+    ):
+        base, meta = node.slice.elts
+        constraint = meta.value if isinstance(meta, ast.Constant) else None
+        if constraint:
+            return base, sys.intern(normalize_constraint(str(constraint)))
+        return base, None
+    return node, None
+
+
+def _default_value(node: ast.expr) -> Any:
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return ast.unparse(node)
+
+
+def _is_generator(node: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
+    """Whether the function body itself (not a nested scope) yields."""
+    stack: list[ast.AST] = list(node.body)
+    while stack:
+        child = stack.pop()
+        if isinstance(child, (ast.Yield, ast.YieldFrom)):
+            return True
+        if not isinstance(
+            child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+        ):
+            stack.extend(ast.iter_child_nodes(child))
+    return False
+
+
+def _static_signature(
+    node: ast.FunctionDef | ast.AsyncFunctionDef,
+    transformer: AnnotateCallsTransformer,
+    aliases: dict[str, str],
+) -> dict[str, Any]:
+    args = node.args
+    # AnnotateCallsTransformer only rewrites PK and keyword-only annotations;
+    # positional-only ones are rewritten here the same way.
+    for arg in args.posonlyargs:
+        if arg.annotation is not None:
+            arg.annotation = transformer._transform_ann(arg.annotation)
+    transformer.visit_FunctionDef(node)
+
+    def param_info(arg: ast.arg, default: ast.expr | None, named: bool):
+        base, constraint = _split_annotated(arg.annotation)
+        info: dict[str, Any] = {}
+        type_name = _render_type(base, aliases)
+        if type_name is not None:
+            info["type"] = type_name
+        if constraint is not None:
+            info["constraint"] = constraint
+        if named:
+            info["name"] = sys.intern(arg.arg)
+        if default is not None:
+            info["default"] = _default_value(default)
+        return info
+
+    positional = args.posonlyargs + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    n_posonly = len(args.posonlyargs)
+    params: dict[str, Any] = {
+        "positional_only": [
+            param_info(a, d, named=False)
+            for a, d in zip(positional[:n_posonly], defaults[:n_posonly])
+        ],
+        "positional_or_keyword": [
+            param_info(a, d, named=True)
+            for a, d in zip(positional[n_posonly:], defaults[n_posonly:])
+        ],
+        "keyword_only": sorted(
+            (
+                param_info(a, d, named=True)
+                for a, d in zip(args.kwonlyargs, args.kw_defaults)
+            ),
+            key=lambda p: p["name"],
+        ),
+    }
+    if args.vararg is not None:
+        params["var_positional"] = args.vararg.arg
+    if args.kwarg is not None:
+        params["var_keyword"] = args.kwarg.arg
+
+    return_info: dict[str, Any] = {}
+    base, constraint = _split_annotated(node.returns)
+    return_type = _render_type(base, aliases)
+    if return_type is not None and return_type != "None":
+        return_info["type"] = return_type
+    if constraint is not None:
+        return_info["constraint"] = constraint
+    result: dict[str, Any] = {"params": params, "return": return_info}
+    # Flagged like inspect.iscoroutinefunction / isgeneratorfunction, which
+    # are both false for async generators.
+    is_generator = _is_generator(node)
+    if isinstance(node, ast.AsyncFunctionDef) and not is_generator:
+        result["async"] = True
+    if isinstance(node, ast.FunctionDef) and is_generator:
+        result["generator"] = True
+    return result
+
+
+def _static_class(
+    node: ast.ClassDef,
+    transformer: AnnotateCallsTransformer,
+    aliases: dict[str, str],
+) -> dict[str, Any]:
+    bases = [_render_type(base, aliases) for base in node.bases]
+    result: dict[str, Any] = {"__bases__": bases}
+    assigned: list[tuple[str, ast.expr]] = []
+    for stmt in node.body:
+        if isinstance(stmt, ast.Assign):
+            assigned.extend(
+                (t.id, stmt.value) for t in stmt.targets if isinstance(t, ast.Name)
+            )
+        elif (
+            isinstance(stmt, ast.AnnAssign)
+            and isinstance(stmt.target, ast.Name)
+            and stmt.value is not None
+        ):
+            assigned.append((stmt.target.id, stmt.value))
+    result["__attributes__"] = sorted(
+        {name for name, _ in assigned if not name.startswith("_")}
+    )
+    if _ENUM_BASES.intersection(bases):
+        # Values are literals, or source text (e.g. "auto()") otherwise.
+        result["__enum__"] = [
+            [name, _default_value(value)]
+            for name, value in assigned
+            if not name.startswith("_")
+        ]
+    for stmt in node.body:
+        if not isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        name = stmt.name
+        if name.startswith("__") and name not in ("__call__", "__init__"):
+            continue
+        result[name] = _static_signature(stmt, transformer, aliases)
+    return result
+
+
+def _public_names(tree: ast.Module) -> list[str]:
+    bound: list[str] = []
+    for stmt in tree.body:
+        if isinstance(stmt, ast.Assign):
+            for target in stmt.targets:
+                if isinstance(target, ast.Name) and target.id == "__all__":
+                    try:
+                        return list(ast.literal_eval(stmt.value))
+                    except ValueError:
+                        pass
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound.append(stmt.name)
+        elif isinstance(stmt, ast.Assign):
+            bound.extend(t.id for t in stmt.targets if isinstance(t, ast.Name))
+        elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+            bound.append(stmt.target.id)
+        elif isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            bound.extend(
+                (a.asname or a.name).partition(".")[0]
+                for a in stmt.names
+                if a.name != "*"
+            )
+    return sorted({name for name in bound if not name.startswith("_")})
+
+
+def extract_contract(source: str, filename: str = "<string>") -> STATIC_CONTRACT:
+    """Build the static contract of a module from its source text."""
+    tree = ast.parse(source, filename=filename)
+    aliases = _import_aliases(tree)
+    transformer = AnnotateCallsTransformer()
+    contract: STATIC_CONTRACT = {"__all__": _public_names(tree)}
+    for stmt in tree.body:
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            contract[stmt.name] = {
+                "__call__": _static_signature(stmt, transformer, aliases)
+            }
+        elif isinstance(stmt, ast.ClassDef):
+            contract[stmt.name] = _static_class(stmt, transformer, aliases)
+    return contract
+
+
+def extract_contract_from_path(path: Path) -> STATIC_CONTRACT:
+    """Build the static contract of the module at `path` without importing it."""
+    return extract_contract(path.read_text(encoding="utf-8"), str(path))
+
+
+class _TypeResolver:
+    """
+    Resolve the type names of one static contract to objects, symbolically.
+
+    Builtins resolve to themselves, dotted names only through modules that are
+    already imported (nothing is imported here), and classes of the contract
+    itself to placeholder classes with the same name and resolved bases so
+    subclass relationships hold. Other plain identifiers (e.g. classes bound
+    by an assignment) become base-less placeholders. Generic and union
+    expressions (`list[Animal]`, `Optional[Animal]`, `Animal | None`) are
+    built by evaluating their AST over those objects; only expressions that
+    cannot be built that way stay strings.
+    """
+
+    def __init__(self, contract: STATIC_CONTRACT, module_name: str):
+        self.contract = contract
+        self.module_name = module_name
+        self._resolved: dict[str, Any] = {}
+
+    def __call__(self, name: str | None) -> Any:
+        if name is None:
+            return inspect.Parameter.empty
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        self._resolved[name] = name  # guards against cyclic bases
+        resolved = self._resolve(name)
+        self._resolved[name] = resolved
+        return resolved
+
+    def _resolve(self, name: str) -> Any:
+        entry = self.contract.get(name)
+        if isinstance(entry, dict) and "__bases__" in entry:
+            bases = tuple(
+                b for b in map(self, entry["__bases__"]) if isinstance(b, type)
+            )
+            try:
+                return type(name, bases, {"__module__": self.module_name})
+            except TypeError:
+                return type(name, (), {"__module__": self.module_name})
+        value = getattr(builtins, name, None)
+        if isinstance(value, type):
+            return value
+        module_name, _, attr = name.rpartition(".")
+        for candidate in (module_name, "typing"):
+            module = sys.modules.get(candidate) if candidate else None
+            value = getattr(module, attr, None) if module is not None else None
+            if value is not None:
+                return value
+        if name.isidentifier():
+            return type(name, (), {"__module__": self.module_name})
+        try:
+            return self._build(ast.parse(name, mode="eval").body)
+        except (SyntaxError, TypeError, ValueError, AttributeError):
+            return name
+
+    def _build(self, node: ast.expr) -> Any:
+        # Evaluates only names, subscripts, `|` and constants; no calls.
+        if isinstance(node, ast.Name | ast.Attribute):
+            value = self(ast.unparse(node))
+            if isinstance(value, str):
+                raise TypeError(value)
+            return value
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, str):
+                return self._build(ast.parse(node.value, mode="eval").body)
+            if node.value is None or node.value is Ellipsis:
+                return node.value
+            raise ValueError(node.value)
+        if isinstance(node, ast.Subscript):
+            args = node.slice
+            if isinstance(args, ast.Tuple):
+                return self._build(node.value)[tuple(map(self._build, args.elts))]
+            return self._build(node.value)[self._build(args)]
+        if isinstance(node, ast.List):
+            # Argument lists, as in Callable[[int], str].
+            return list(map(self._build, node.elts))
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            left, right = self._build(node.left), self._build(node.right)
+            return left | right
+        raise ValueError(ast.unparse(node))
+
+
+def signature_from_static(
+    sig: dict[str, Any], resolve=lambda name: name
+) -> inspect.Signature:
+    """Rebuild an `inspect.Signature` from a static contract signature.
+
+    Types are mapped through `resolve`; constraints are attached as
+    `Annotated` metadata so the runtime compatibility rules pick them up.
+    """
+    P = inspect.Parameter
+
+    def parameter(info, kind, index):
+        annotation = resolve(info.get("type"))
+        if "constraint" in info:
+            base = object if annotation is P.empty else annotation
+            annotation = Annotated[base, info["constraint"]]
+        return P(
+            info.get("name", f"__p{index}"),
+            kind,
+            default=info.get("default", P.empty),
+            annotation=annotation,
+        )
+
+    params = sig["params"]
+    parameters = [
+        parameter(info, P.POSITIONAL_ONLY, i)
+        for i, info in enumerate(params["positional_only"])
+    ]
+    parameters += [
+        parameter(info, P.POSITIONAL_OR_KEYWORD, i)
+        for i, info in enumerate(params["positional_or_keyword"])
+    ]
+    if "var_positional" in params:
+        parameters.append(P(params["var_positional"], P.VAR_POSITIONAL))
+    parameters += [
+        parameter(info, P.KEYWORD_ONLY, i)
+        for i, info in enumerate(params["keyword_only"])
+    ]
+    if "var_keyword" in params:
+        parameters.append(P(params["var_keyword"], P.VAR_KEYWORD))
+    return inspect.Signature(parameters)
+
+
+def _check_kind(a_sig: dict[str, Any], b_sig: dict[str, Any]) -> None:
+    # Same checks and messages as compatibility._check_callable.
+    a_async, b_async = a_sig.get("async", False), b_sig.get("async", False)
+    if a_async != b_async:
+        raise SignatureIncompatible(
+            f"Function async/sync mismatch: a is {'async' if a_async else 'sync'}, b is {'async' if b_async else 'sync'}"
+        )
+    a_gen, b_gen = a_sig.get("generator", False), b_sig.get("generator", False)
+    if a_gen != b_gen:
+        raise SignatureIncompatible(
+            f"Function generator/non-generator mismatch: a is {'generator' if a_gen else 'regular'}, b is {'generator' if b_gen else 'regular'}"
+        )
+
+
+def _init_of(contract: STATIC_CONTRACT, name: str, seen=()) -> dict | None:
+    """
+    The `__init__` signature class `name` has, inherited through bases in the
+    same contract; `object.__init__` for classes without other bases; None
+    if it comes from a base outside the contract.
+    """
+    entry = contract.get(name)
+    if not isinstance(entry, dict) or name in seen:
+        return None
+    if "__init__" in entry:
+        return entry["__init__"]
+    for base in entry.get("__bases__", ()):
+        if base == "object":
+            continue
+        base_entry = contract.get(base)
+        if not (isinstance(base_entry, dict) and "__bases__" in base_entry):
+            return None
+        init = _init_of(contract, base, (*seen, name))
+        if init is not _OBJECT_INIT:
+            return init
+    return _OBJECT_INIT
+
+
+def _check_enum(name: str, a_entry: dict, b_entry: dict) -> None:
+    # Same rules as is_compatible: every member of A exists in B with the
+    # same value; B may add members anywhere.
+    a_members = [member for member, _ in a_entry["__enum__"]]
+    b_members = [member for member, _ in b_entry["__enum__"]]
+    missing = set(a_members) - set(b_members)
+    if missing:
+        raise SignatureIncompatible(
+            f"Enum members missing in {name}: {sorted(missing)} (a={a_members}, b={b_members})"
+        )
+    b_values = dict(map(tuple, b_entry["__enum__"]))
+    for member, a_val in a_entry["__enum__"]:
+        if a_val != b_values[member]:
+            raise SignatureIncompatible(
+                f"Enum member value changed for {name}.{member}: a.value={a_val!r}, b.value={b_values[member]!r}"
+            )
+
+
+def is_contract_compatible(
+    a: STATIC_CONTRACT, b: STATIC_CONTRACT, module_name: str = "<static>"
+) -> None:
+    """
+    Check two static contracts for ZVIC compatibility with the rules
+    `compatibility.is_compatible` applies to modules: public names, enum
+    members and values, class methods and attributes, `__init__` (including
+    the implicit `object.__init__`), async/generator kinds, and signatures.
+    Raises SignatureIncompatible.
+
+    Unlike `is_compatible`, nothing is executed, so the static path does not
+    see members added by decorators, metaclasses or runtime assignment,
+    methods and `__init__` inherited from classes outside the module, or
+    enum values computed at class creation (`auto()` and other expressions
+    are compared by their source text). Types are compared through the
+    symbolic resolution of `_TypeResolver`.
+    """
+    missing = set(a.get("__all__", ())) - set(b.get("__all__", ()))
+    if missing:
+        raise SignatureIncompatible(
+            f"Public attributes missing in {module_name}: {sorted(missing)}"
+        )
+    resolve_a = _TypeResolver(a, module_name)
+    resolve_b = _TypeResolver(b, module_name)
+
+    def compare(a_sig, b_sig):
+        _check_kind(a_sig, b_sig)
+        is_signature_compatible(
+            signature_from_static(a_sig, resolve_a),
+            signature_from_static(b_sig, resolve_b),
+        )
+
+    for name in sorted(a.get("__all__", ())):
+        a_entry, b_entry = a.get(name), b.get(name)
+        if not (isinstance(a_entry, dict) and isinstance(b_entry, dict)):
+            continue
+        is_class = "__bases__" in a_entry and "__bases__" in b_entry
+        if is_class and "__enum__" in a_entry and "__enum__" in b_entry:
+            _check_enum(name, a_entry, b_entry)
+        a_methods = a_entry.keys() - _CLASS_META - {"__init__"}
+        b_methods = b_entry.keys() - _CLASS_META - {"__init__"}
+        missing_methods = a_methods - b_methods
+        if missing_methods:
+            raise SignatureIncompatible(
+                f"Methods missing in {name}: {sorted(missing_methods)}"
+            )
+        if is_class:
+            missing_attrs = set(a_entry.get("__attributes__", ())) - set(
+                b_entry.get("__attributes__", ())
+            )
+            if missing_attrs:
+                raise SignatureIncompatible(
+                    f"Attributes missing in {name}: {sorted(missing_attrs)}"
+                )
+            a_init, b_init = _init_of(a, name), _init_of(b, name)
+            if a_init is not None and b_init is not None:
+                compare(a_init, b_init)
+        for member in sorted(a_methods):
+            compare(a_entry[member], b_entry[member])
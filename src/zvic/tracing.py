@@ -0,0 +1,128 @@
+"""tracing.py
+
+Structured timing spans for the compatibility check pipeline.
+
+The pipeline emits a `Span` for every canonicalize, params, types,
+constraints, witnesses and crosshair step. Spans are only measured while at least one
+listener is registered; otherwise `span()` returns a shared no-op context
+manager, so the hot loops pay a single truthiness check.
+
+    with collect_spans() as spans:
+        is_compatible(mod_a, mod_b)
+    slow = sorted(spans, key=lambda s: s.duration, reverse=True)[:10]
+
+Listeners are called synchronously, on the thread that ran the step, when the
+step finishes (so nested steps are reported before their parent).
+"""
+
+import contextlib
+import threading
+import time
+from collections.abc import Callable, Iterator
+from typing import Any, NamedTuple, Self
+
+# Span names emitted by the pipeline.
+CANONICALIZE = "canonicalize"
+PARAMS = "params"
+TYPES = "types"
+CONSTRAINTS = "constraints"
+WITNESSES = "witnesses"
+CROSSHAIR = "crosshair"
+
+
+class Span(NamedTuple):
+    name: str
+    # Wall time of the step in seconds.
+    duration: float
+    # True/False if the step was answered from / stored into a cache, None if
+    # the step is not cached.
+    cache_hit: bool | None
+    # Step-specific details, e.g. the compared types.
+    attrs: dict[str, Any]
+    # Class name of the SignatureIncompatible (or other error) raised, if any.
+    error: str | None = None
+
+
+SpanListener = Callable[[Span], None]
+
+_listeners: tuple[SpanListener, ...] = ()
+_lock = threading.Lock()
+
+
+def add_span_listener(listener: SpanListener) -> None:
+    global _listeners
+    with _lock:
+        _listeners = (*_listeners, listener)
+
+
+def remove_span_listener(listener: SpanListener) -> None:
+    global _listeners
+    with _lock:
+        _listeners = tuple(x for x in _listeners if x != listener)
+
+
+@contextlib.contextmanager
+def collect_spans() -> Iterator[list[Span]]:
+    """Collect every span finished inside the block into the yielded list."""
+    spans: list[Span] = []
+    add_span_listener(spans.append)
+    try:
+        yield spans
+    finally:
+        remove_span_listener(spans.append)
+
+
+class _NoSpan:
+    __slots__ = ()
+    cache_hit = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Steps set cache_hit unconditionally; nothing to record.
+        pass
+
+
+class _ActiveSpan:
+    __slots__ = ("attrs", "cache_hit", "name", "start")
+
+    def __init__(self, name: str, attrs: dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.cache_hit: bool | None = None
+
+    def __enter__(self) -> Self:
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        finished = Span(
+            self.name,
+            time.perf_counter() - self.start,
+            self.cache_hit,
+            self.attrs,
+            exc_type.__name__ if exc_type is not None else None,
+        )
+        for listener in _listeners:
+            listener(finished)
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, **attrs: Any) -> Any:
+    """Time the enclosed step as a span named `name`, if anyone listens.
+
+    The returned context manager has a writable `cache_hit` attribute.
+    """
+    if not _listeners:
+        return _NO_SPAN
+    return _ActiveSpan(name, attrs)
+
+
+def tracing_enabled() -> bool:
+    return bool(_listeners)
@@ -21,6 +21,8 @@ import sys
 import types
 from contextlib import contextmanager
 
+from .utils import import_lock
+
 # Use PEP 604 union types (e.g. `list[str] | None`) on Python 3.12; no typing.Optional import needed
 
 
@@ -337,15 +339,18 @@ def replace_module(
 
     patched_report: dict[str, list[str]] | None = None
     if not dry_run:
+        # Build the replacement completely before anyone can see it, then
+        # publish it with a single sys.modules assignment under the import
+        # lock so concurrent importers get either the old or the new module.
         exec(code_obj, new_mod.__dict__)
         new_mod.__dict__["__zvic_transformed__"] = True
-        sys.modules[module_name] = new_mod
+        with import_lock():
+            sys.modules[module_name] = new_mod
 
         # Optional aggressive patching: scan other modules for attributes
         # that still point to objects from the old module and rebind them
         # to the equivalent objects from the new module. This is invasive
         # and therefore opt-in via `patch_refs`.
-        patched_report = None
         if patch_refs and old_mod is not None:
             patched_report = {}
             try:
@@ -385,7 +390,7 @@ def replace_module(
                 if not module_is_in_project(mod):
                     # Don't patch third-party modules by default
                     continue
-                patched_names: list[str] = []
+                rebinds: dict[str, object] = {}
                 for attr in dir(mod):
                     if attr.startswith("__"):
                         continue
@@ -397,14 +402,17 @@ def replace_module(
                         # Found a reference to an object from the old module.
                         old_name = old_id_map[id(val)]
                         if hasattr(new_mod, old_name):
-                            try:
-                                setattr(mod, attr, getattr(new_mod, old_name))
-                                patched_names.append(attr)
-                            except Exception:
-                                # best-effort: ignore failures
-                                pass
-                if patched_names:
-                    patched_report[modname] = patched_names
+                            rebinds[attr] = getattr(new_mod, old_name)
+                if rebinds:
+                    # Rebind all references of one module at once rather
+                    # than attribute by attribute.
+                    try:
+                        with import_lock():
+                            vars(mod).update(rebinds)
+                    except Exception:
+                        # best-effort: ignore failures
+                        continue
+                    patched_report[modname] = list(rebinds)
 
         # Drop the local reference to the old module and run GC to update refcounts.
         # Avoid using `del old_mod` since that creates a local binding in all
@@ -422,72 +430,6 @@ def replace_module(
 
         if patched_report:
             out["patched"] = patched_report
-
-        # Optional aggressive patching: scan other modules for attributes
-        # that still point to objects from the old module and rebind them
-        # to the equivalent objects from the new module. This is invasive
-        # and therefore opt-in via `patch_refs`.
-        if patch_refs and old_mod is not None:
-            patched_report = {}
-            try:
-                project_root = os.getcwd()
-            except Exception:
-                project_root = None
-
-            def module_is_in_project(m: types.ModuleType) -> bool:
-                try:
-                    mf = getattr(m, "__file__", None)
-                    if not mf:
-                        return False
-                    # Normalize and check if module file is inside project_root
-                    if (
-                        project_root
-                        and os.path.commonpath([project_root, os.path.abspath(mf)])
-                        == project_root
-                    ):
-                        return True
-                except Exception:
-                    pass
-                return False
-
-            # Build a map of old object's id -> attribute path in old module
-            old_members = {
-                name: getattr(old_mod, name)
-                for name in dir(old_mod)
-                if not name.startswith("__")
-            }
-            old_id_map = {id(v): name for name, v in old_members.items()}
-
-            for modname, mod in list(sys.modules.items()):
-                if not isinstance(mod, types.ModuleType):
-                    continue
-                if modname == module_name:
-                    continue
-                if not module_is_in_project(mod):
-                    # Don't patch third-party modules by default
-                    continue
-                patched_names: list[str] = []
-                for attr in dir(mod):
-                    if attr.startswith("__"):
-                        continue
-                    try:
-                        val = getattr(mod, attr)
-                    except Exception:
-                        continue
-                    if id(val) in old_id_map:
-                        # Found a reference to an object from the old module.
-                        old_name = old_id_map[id(val)]
-                        if hasattr(new_mod, old_name):
-                            try:
-                                setattr(mod, attr, getattr(new_mod, old_name))
-                                patched_names.append(attr)
-                            except Exception:
-                                # best-effort: ignore failures
-                                pass
-                if patched_names:
-                    patched_report[modname] = patched_names
-            if patched_report:
-                out["patched"] = patched_report
     else:
         out = {
             "ok": True,
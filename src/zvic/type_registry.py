@@ -0,0 +1,249 @@
+"""type_registry.py
+
+Type identity registry.
+
+Type names (e.g. "int", "numbers.Real", "mod_a.Cat") are resolved to class
+objects by plain lookups in builtins and already-loaded modules, never by
+`eval`. Resolved names are remembered (weakly) until the module they were
+found in is replaced or reloaded, or first takes part in a `module_alias`.
+
+Classes are identified by their `(module, qualname)` fingerprint, and each
+class's ancestry is summarized once into the set of its ancestors'
+fingerprints, so subtype checks reduce to set lookups. Fingerprints are plain
+tuples, which also makes them comparable across processes. Two versions of a
+module loaded side by side (e.g. with `load_module(path_a, "mod_a")` and
+`load_module(path_b, "mod_b")`) define distinct classes under distinct module
+names; while comparing them, `module_alias("mod_b", "mod_a")` makes classes
+with the same qualname in both modules count as the same type.
+"""
+
+import builtins
+import contextlib
+import contextvars
+import sys
+import threading
+import weakref
+from collections.abc import Iterator, Mapping
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+Fingerprint = tuple[str, str]
+
+
+class _Resolved(NamedTuple):
+    cls: weakref.ReferenceType
+    # The module the class was found in and its `__spec__` at the time
+    # (reloading a module replaces its spec); None for builtins.
+    module_name: str | None = None
+    module: weakref.ReferenceType | None = None
+    spec: Any = None
+
+    def current(self) -> type | None:
+        """The class, or None if it or its module has been replaced."""
+        if self.module is not None:
+            module = self.module()
+            if (
+                module is None
+                or sys.modules.get(self.module_name) is not module
+                or getattr(module, "__spec__", None) is not self.spec
+            ):
+                return None
+        return self.cls()
+
+
+_names: dict[str, _Resolved] = {}
+_ancestors: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+# (b_module, a_module) pairs whose names `module_alias` has already forgotten.
+_forgotten_pairs: set[tuple[str, str]] = set()
+
+
+class _Aliases(NamedTuple):
+    # Module name of version B -> module name of version A.
+    mapping: Mapping[str, str]
+    # Hashable form of `mapping`, for keying caches on the alias state.
+    key: frozenset
+    # Every module name in `mapping`, on either side.
+    modules: frozenset
+
+
+_NO_ALIASES = _Aliases(MappingProxyType({}), frozenset(), frozenset())
+_module_aliases: contextvars.ContextVar[_Aliases] = contextvars.ContextVar(
+    "zvic_module_aliases", default=_NO_ALIASES
+)
+
+
+def _lookup(name: str) -> tuple[Any, str | None]:
+    # The object `name` refers to and the module it was found in.
+    if "." not in name:
+        return getattr(builtins, name, None), None
+    # Longest already-imported module prefix, then attribute access.
+    parts = name.split(".")
+    for i in range(len(parts) - 1, 0, -1):
+        module_name = ".".join(parts[:i])
+        obj = sys.modules.get(module_name)
+        if obj is None:
+            continue
+        for attr in parts[i:]:
+            obj = getattr(obj, attr, None)
+        return obj, module_name
+    return None, None
+
+
+def resolve_type_name(
+    name: str, namespace: Mapping[str, Any] | None = None
+) -> type | None:
+    """
+    Resolve a (possibly dotted) class name to the class object, or None.
+
+    `namespace` (e.g. a module's globals) is consulted first; then builtins and
+    already-imported modules. Nothing is imported or evaluated, so anything
+    that is not a plain dotted name resolves to None. Hits on builtins and
+    dotted names are remembered while their module stays the same.
+    """
+    if namespace is not None:
+        found = namespace.get(name)
+        if isinstance(found, type):
+            return found
+    with _lock:
+        entry = _names.get(name)
+    if entry is not None:
+        found = entry.current()
+        if found is not None:
+            return found
+    if not all(part.isidentifier() for part in name.split(".")):
+        return None
+    found, module_name = _lookup(name)
+    if not isinstance(found, type):
+        return None
+    if module_name is None:
+        entry = _Resolved(weakref.ref(found))
+    else:
+        module = sys.modules[module_name]
+        try:
+            module_ref = weakref.ref(module)
+        except TypeError:
+            return found  # a module stand-in without weakrefs: not remembered
+        entry = _Resolved(
+            weakref.ref(found),
+            module_name,
+            module_ref,
+            getattr(module, "__spec__", None),
+        )
+    with _lock:
+        _names[name] = entry
+    return found
+
+
+def _forget_modules(*modules: str) -> None:
+    # Drop resolved names found in (submodules of) `modules`.
+    with _lock:
+        for name, entry in list(_names.items()):
+            if entry.module_name is not None and any(
+                entry.module_name == m or entry.module_name.startswith(f"{m}.")
+                for m in modules
+            ):
+                del _names[name]
+
+
+def fingerprint(cls: type) -> Fingerprint:
+    """The `(module, qualname)` identity of a class."""
+    return (
+        getattr(cls, "__module__", None) or "",
+        getattr(cls, "__qualname__", None) or cls.__name__,
+    )
+
+
+def ancestors(cls: type) -> frozenset[Fingerprint]:
+    """The (cached) fingerprints of all classes in `cls.__mro__`."""
+    try:
+        return _ancestors[cls]
+    except KeyError:
+        pass
+    except TypeError:
+        # Not weak-referenceable; compute every time.
+        return frozenset(map(fingerprint, getattr(cls, "__mro__", ())))
+    found = frozenset(map(fingerprint, getattr(cls, "__mro__", ())))
+    with _lock:
+        _ancestors[cls] = found
+    return found
+
+
+@contextlib.contextmanager
+def module_alias(b_module: str | None, a_module: str | None) -> Iterator[None]:
+    """
+    While active, classes of module `b_module` are identified with the
+    classes of the same qualname in `a_module`. Aliases nest. Names
+    resolved in either module are forgotten the first time the pair is
+    aliased, as the modules are typically freshly loaded for the comparison;
+    later reloads are caught by the module checks of each remembered name.
+    """
+    current = _module_aliases.get()
+    if not a_module or not b_module or a_module == b_module:
+        yield
+        return
+    if current.mapping.get(b_module) == a_module:
+        yield
+        return
+    mapping = {**current.mapping, b_module: a_module}
+    token = _module_aliases.set(
+        _Aliases(
+            mapping,
+            frozenset(mapping.items()),
+            frozenset({*mapping, *mapping.values()}),
+        )
+    )
+    with _lock:
+        first = (b_module, a_module) not in _forgotten_pairs
+        _forgotten_pairs.add((b_module, a_module))
+    if first:
+        _forget_modules(b_module, a_module)
+    try:
+        yield
+    finally:
+        _module_aliases.reset(token)
+
+
+def alias_key(*types: Any) -> frozenset:
+    """
+    Hashable snapshot of the active module aliases.
+
+    Given the classes a verdict is about, returns the empty key if no class in
+    their MROs comes from an aliased module, so verdicts on unrelated classes
+    (builtins, third-party types) are shared across module pairs.
+    """
+    current = _module_aliases.get()
+    if not current.modules or not types:
+        return current.key
+    if not all(isinstance(t, type) for t in types):
+        return current.key
+    for t in types:
+        if any(module in current.modules for module, _ in ancestors(t)):
+            return current.key
+    return _NO_ALIASES.key
+
+
+def is_qualified_subclass(sub: type, sup: type) -> bool:
+    """
+    True if a class with `sup`'s fingerprint is among `sub`'s ancestors,
+    taking active module aliases into account.
+    """
+    found = ancestors(sub)
+    module, qualname = fingerprint(sup)
+    if (module, qualname) in found:
+        return True
+    mapping = _module_aliases.get().mapping
+    if not mapping:
+        return False
+    target = mapping.get(module, module)
+    return (target, qualname) in found or any(
+        (b, qualname) in found for b, a in mapping.items() if a == target
+    )
+
+
+def clear_type_registry() -> None:
+    """Forget all resolved names and ancestry sets."""
+    with _lock:
+        _names.clear()
+        _ancestors.clear()
+        _forgotten_pairs.clear()
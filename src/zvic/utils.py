@@ -1,15 +1,25 @@
 # type: ignore
 """Utility functions and universal placeholder for ZVIC."""
 
-import ast
+import _imp
 import contextlib
+import copy
 import logging
+import os
+import pkgutil
 import sys
-from collections import namedtuple
+import threading
+from collections import OrderedDict, namedtuple
+from collections.abc import Callable, Hashable, Mapping
 from dataclasses import dataclass
 from inspect import Parameter, Signature
 from typing import Any, get_args, get_origin
 
+from .constraint import parse_constraint
+from .crosshair_inprocess import analysis_lock
+from .exception import CompatibilityUnknown, ZVICError
+from .type_registry import resolve_type_name
+
 
 def assumption(obj: Any, expected: type) -> bool:
     """
@@ -42,9 +52,152 @@ def assumption(obj: Any, expected: type) -> bool:
 def normalize_constraint(expr: str) -> str:
     """
     Normalize a constraint string by parsing and unparsing it via AST.
-    This ensures a canonical form for expressions like '_ < 10'.
+    This ensures a canonical form for expressions like '_ < 10'. The parse is
+    shared with the rest of ZVIC through `parse_constraint`.
+    """
+    return parse_constraint(expr).source
+
+
+@contextlib.contextmanager
+def import_lock():
+    """
+    Hold the interpreter-wide import lock for the duration of the block.
+    The lock is re-entrant, so nested use from the same thread is fine.
+    """
+    _imp.acquire_lock()
+    try:
+        yield
+    finally:
+        _imp.release_lock()
+
+
+def swap_namespace(
+    target: dict, source: Mapping, *, exclude: frozenset = frozenset({"__file__"})
+) -> None:
+    """
+    Publish the fully built namespace `source` into `target` atomically.
+
+    All new bindings go in with a single dict.update() while the import lock
+    is held, so a concurrent reader of `target` sees either the old or the new
+    set of objects, never a mix. Non-dunder names missing from `source` are
+    dropped afterwards; until then they still refer to the old objects.
     """
-    return ast.unparse(ast.parse(expr, mode="eval"))
+    updates = {k: v for k, v in source.items() if k not in exclude}
+    with import_lock():
+        stale = [k for k in target if not k.startswith("__") and k not in updates]
+        target.update(updates)
+        for k in stale:
+            target.pop(k, None)
+
+
+def iter_submodule_names(package: Any) -> list[str]:
+    """
+    Return the dotted names of all submodules of `package`, recursively.
+
+    Unlike pkgutil.walk_packages this only looks at the file system and never
+    imports subpackages to discover their contents. Non-packages yield [].
+    """
+    names: list[str] = []
+
+    def walk(paths, prefix):
+        for info in pkgutil.iter_modules(paths, prefix):
+            names.append(info.name)
+            base = getattr(info.module_finder, "path", None)
+            if info.ispkg and base is not None:
+                sub_path = os.path.join(base, info.name.rpartition(".")[2])
+                walk([sub_path], info.name + ".")
+
+    paths = getattr(package, "__path__", None)
+    if paths is not None:
+        walk(list(paths), package.__name__ + ".")
+    return names
+
+
+class VerdictCache:
+    """
+    Bounded, thread-safe LRU memo of check verdicts.
+
+    A verdict is whatever the check returned or the ZVICError it raised; a
+    memoized error is re-raised as a fresh copy so tracebacks don't pile up
+    on a shared instance. Keys that turn out to be unhashable bypass the cache.
+    CompatibilityUnknown is never memoized: with more time the same check may
+    well come to a verdict.
+    Concurrent misses on the same key are coalesced: one thread runs the
+    check, the others wait for its verdict (and count as hits), without
+    holding `analysis_lock` meanwhile.
+    `trace`, if given, gets its `cache_hit` attribute set (see zvic.tracing).
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[bool, Any]] = OrderedDict()
+        # Keys being checked right now -> (owning thread id, done event).
+        self._pending: dict[Hashable, tuple[int, threading.Event]] = {}
+        self._lock = threading.Lock()
+
+    def call(
+        self, key: Hashable, check: Callable[..., Any], *args: Any, trace: Any = None
+    ) -> Any:
+        me = threading.get_ident()
+        while True:
+            try:
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        break
+                    pending = self._pending.get(key)
+                    # A check recursing into its own key must not wait on itself.
+                    if pending is None or pending[0] == me:
+                        self.misses += 1
+                        owned = pending is None
+                        if owned:
+                            done = threading.Event()
+                            self._pending[key] = (me, done)
+                        break
+            except TypeError:
+                return check(*args)
+            with analysis_lock.released():
+                pending[1].wait()
+        if trace is not None:
+            trace.cache_hit = entry is not None
+        if entry is None:
+            try:
+                result = check(*args)
+            except ZVICError as e:
+                if not isinstance(e, CompatibilityUnknown):
+                    self._store(key, (True, e))
+                raise
+            else:
+                self._store(key, (False, result))
+                return result
+            finally:
+                if owned:
+                    with self._lock:
+                        del self._pending[key]
+                    done.set()
+        raised, value = entry
+        if raised:
+            raise copy.copy(value)
+        return value
+
+    def _store(self, key: Hashable, entry: tuple[bool, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 # Universal placeholder that supports all operations and comparisons
@@ -357,7 +510,11 @@ def prepare_params(sig: Signature, func=None) -> Params:
         constraint = extract_constraint(p.annotation)
         resolved_type = resolve_annotation(p.annotation, globalns)
         logging.getLogger(__name__).debug(
-            f"Function: {getattr(func, '__qualname__', func)}, Param: {p.name}, Annotation: {p.annotation!r}, Resolved type: {resolved_type!r}"
+            "Function: %s, Param: %s, Annotation: %r, Resolved type: %r",
+            getattr(func, "__qualname__", func),
+            p.name,
+            p.annotation,
+            resolved_type,
         )
         params.append({
             "name": p.name,
@@ -395,6 +552,20 @@ def prepare_params(sig: Signature, func=None) -> Params:
     )
 
 
+def prepare_return(sig: Signature, func=None) -> dict:
+    """
+    The return annotation of `sig` as a dict like those of prepare_params
+    ("name" is "return"), with the type resolved and the constraint split off.
+    """
+    probe = Signature([
+        Parameter(
+            "__return__", Parameter.POSITIONAL_ONLY, annotation=sig.return_annotation
+        )
+    ])
+    (info,) = prepare_params(probe, func).posonly
+    return {**info, "name": "return"}
+
+
 def get_class_str(d: Any) -> str | None:
     if isinstance(d, dict) and "class" in d:
         val: Any = d["class"]
@@ -411,10 +582,11 @@ def is_supertype(sup: Any, sub: Any) -> bool:
     sup_cls: str | None = get_class_str(sup)
     sub_cls: str | None = get_class_str(sub)
     if sup_cls is not None and sub_cls is not None:
-        with contextlib.suppress(Exception):
-            sup_type: Any = eval(sup_cls)
-            sub_type: Any = eval(sub_cls)
-            return issubclass(sub_type, sup_type)
+        sup_type = resolve_type_name(sup_cls, globals())
+        sub_type = resolve_type_name(sub_cls, globals())
+        if sup_type is not None and sub_type is not None:
+            with contextlib.suppress(TypeError):
+                return issubclass(sub_type, sup_type)
     return False
 
 
@@ -426,10 +598,11 @@ def is_subtype(sub: Any, sup: Any) -> bool:
     sub_cls: str | None = get_class_str(sub)
     sup_cls: str | None = get_class_str(sup)
     if sub_cls is not None and sup_cls is not None:
-        with contextlib.suppress(Exception):
-            sub_type: Any = eval(sub_cls)
-            sup_type: Any = eval(sup_cls)
-            return issubclass(sub_type, sup_type)
+        sub_type = resolve_type_name(sub_cls, globals())
+        sup_type = resolve_type_name(sup_cls, globals())
+        if sub_type is not None and sup_type is not None:
+            with contextlib.suppress(TypeError):
+                return issubclass(sub_type, sup_type)
     return False
 
 
@@ -0,0 +1,416 @@
+"""witnesses.py
+
+Concrete witnesses for refuting constraint pairs without CrossHair.
+
+B's constraint is narrower than A's if some value satisfies A but not B.
+Before any symbolic run, `find_counterexample` evaluates both constraints
+(parsed and compiled once, see `zvic.constraint`) on concrete values of the
+parameter's type:
+
+- counterexamples CrossHair found for earlier pairs (`witnesses`),
+- boundary values derived from the constants in the two expressions
+  (`c - 1`, `c`, `c + 1`, containers of length around `c` for `len()` bounds),
+- a few defaults per type (0, -1, "", [], ...),
+- `fuzz_samples` random values, biased towards those constants and sizes.
+
+Relations between parameters are searched the same way, over combinations
+of per-variable candidates.
+
+Supported types are int, float, str, bool, bytes and list/tuple/set/
+frozenset/dict of those. Random values come from a generator seeded by the
+pair, so verdicts are reproducible.
+
+A value that satisfies A and not B is a genuine counterexample, so a hit is
+a definite refutation; a miss proves nothing and the caller moves on to
+CrossHair. Values whose evaluation raises are skipped. The search stops
+early, as a miss, once its `timeout` is used up. A single evaluation cannot
+be interrupted, so when a variable drives an operation whose cost grows with
+its magnitude (`10 ** x`, `1 << x`, `"a" * x`, `range(x)`), numbers are kept
+within `±_EXPENSIVE_MAGNITUDE`; generated sizes are capped by `_MAX_SIZE`.
+"""
+
+import ast
+import builtins
+import functools
+import inspect
+import itertools
+import random
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Annotated, Any, get_args, get_origin
+
+from .constraint import parse_constraint
+
+# Random values tried per constraint pair after the fixed candidates; set to
+# 0 to disable the fuzzing stage.
+fuzz_samples = 200
+# Cap on combinations of fixed candidates for constraints over several
+# variables.
+_MAX_COMBINATIONS = 4096
+# Largest |number| tried when a variable drives an expensive operation.
+_EXPENSIVE_MAGNITUDE = 64
+# Largest str/bytes/container generated.
+_MAX_SIZE = 4096
+# Calls whose cost does not depend on the magnitude of their arguments.
+_CHEAP_CALLS = frozenset(
+    {"len", "abs", "bool", "int", "float", "str", "min", "max", "round"}
+    | {"all", "any", "sum", "sorted", "set", "list", "tuple", "isinstance"}
+)
+
+_SCALARS = (int, float, str, bool, bytes)
+_CONTAINERS = (list, tuple, set, frozenset, dict)
+
+_DEFAULTS: dict[type, tuple[Any, ...]] = {
+    int: (0, 1, -1),
+    float: (0.0, 1.0, -1.0, 0.5, -0.5),
+    str: ("", "a", " "),
+    bytes: (b"", b"a"),
+    bool: (False, True),
+}
+
+_ALPHABET = "aAz0 _-.é"
+
+
+class WitnessStore:
+    """Bounded pool of known counterexample values, per annotation."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._values: dict[str, OrderedDict[Any, None]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, annotation: str, value: Any) -> None:
+        try:
+            hash(value)
+        except TypeError:
+            return
+        with self._lock:
+            pool = self._values.setdefault(annotation, OrderedDict())
+            pool[value] = None
+            pool.move_to_end(value)
+            while len(pool) > self.maxsize:
+                pool.popitem(last=False)
+
+    def values(self, annotation: str) -> list[Any]:
+        with self._lock:
+            # Most recent first: fresh counterexamples are the likeliest hits.
+            return list(reversed(self._values.get(annotation, ())))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def __len__(self) -> int:
+        return sum(map(len, self._values.values()))
+
+
+# Counterexamples found by CrossHair, reused for every later pair.
+witnesses = WitnessStore()
+
+
+def annotation_of(tp: Any) -> str | None:
+    """
+    The annotation source (e.g. "int", "list[str]") for values of `tp`, or
+    None if neither witnesses nor CrossHair can produce such values. A
+    missing annotation counts as int.
+    """
+    if get_origin(tp) is Annotated:
+        tp = get_args(tp)[0]
+    if tp in (None, Any, inspect.Parameter.empty):
+        return "int"
+    if tp in _SCALARS:
+        return tp.__name__
+    origin = get_origin(tp) or tp
+    if origin not in _CONTAINERS:
+        return None
+    names = []
+    for arg in get_args(tp):
+        if arg is Ellipsis:
+            names.append("...")
+        elif arg in _SCALARS:
+            names.append(arg.__name__)
+        else:
+            return None
+    if not names:
+        return origin.__name__
+    return f"{origin.__name__}[{', '.join(names)}]"
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve(annotation: str) -> Any:
+    # Only ever called with the output of annotation_of().
+    return eval(annotation, {"__builtins__": builtins})
+
+
+def _constants(expr: str) -> Iterable[tuple[Any, bool]]:
+    """Yield (constant, compared against len()) pairs found in `expr`."""
+    for node in ast.walk(parse_constraint(expr, "x").tree):
+        if not isinstance(node, ast.Compare):
+            continue
+        operands = [node.left, *node.comparators]
+        is_len = any(
+            isinstance(o, ast.Call)
+            and isinstance(o.func, ast.Name)
+            and o.func.id == "len"
+            for o in operands
+        )
+        for o in operands:
+            value = o
+            negative = isinstance(o, ast.UnaryOp) and isinstance(o.op, ast.USub)
+            if negative:
+                value = o.operand
+            if isinstance(value, ast.Constant) and not isinstance(value.value, bool):
+                c = value.value
+                yield (-c if negative and isinstance(c, int | float) else c), is_len
+
+
+def _is_number(node: ast.expr) -> bool:
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub | ast.UAdd):
+        node = node.operand
+    return (
+        isinstance(node, ast.Constant)
+        and isinstance(node.value, int | float)
+        and not isinstance(node.value, bool)
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _expensive(exprs: tuple[str, ...]) -> bool:
+    """
+    Whether evaluating the expressions may take time that grows with the
+    magnitude of a variable: a non-constant exponent or shift, a product
+    that is not a scaling by a constant (e.g. sequence repetition), or a
+    call other than a few cheap builtins.
+    """
+    for expr in exprs:
+        try:
+            tree = parse_constraint(expr, "x").tree
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.BinOp):
+                if isinstance(node.op, ast.Pow | ast.LShift) and not _is_number(
+                    node.right
+                ):
+                    return True
+                if isinstance(node.op, ast.Mult) and not (
+                    _is_number(node.left) or _is_number(node.right)
+                ):
+                    return True
+            elif isinstance(node, ast.Call) and not (
+                isinstance(node.func, ast.Name) and node.func.id in _CHEAP_CALLS
+            ):
+                return True
+    return False
+
+
+def _too_big(value: Any) -> bool:
+    return (
+        isinstance(value, int | float)
+        and not isinstance(value, bool)
+        and abs(value) > _EXPENSIVE_MAGNITUDE
+    )
+
+
+def _all_constants(exprs: Iterable[str]) -> list[tuple[Any, bool]]:
+    found = []
+    for expr in exprs:
+        try:
+            found.extend(_constants(expr))
+        except SyntaxError:
+            continue
+    return found
+
+
+def _key(tp: Any, i: int) -> Any:
+    # The i-th distinct value of scalar type `tp`, for set members and keys.
+    if tp is bool:
+        return bool(i % 2)
+    if tp is str:
+        return "k" * (i + 1)
+    if tp is bytes:
+        return b"k" * (i + 1)
+    return tp(i)
+
+
+def _sized(tp: Any, n: int, element: Callable[[Any], Any]) -> Any:
+    """A value of type `tp` (str, bytes or a container) with `n` elements."""
+    if tp is str:
+        return "a" * n
+    if tp is bytes:
+        return b"a" * n
+    origin, args = get_origin(tp) or tp, get_args(tp)
+    if origin is dict:
+        key_tp, value_tp = args or (str, int)
+        return {_key(key_tp, i): element(value_tp) for i in range(n)}
+    if origin is tuple and args and args[-1] is not Ellipsis:
+        return tuple(element(arg) for arg in args)
+    item_tp = args[0] if args else int
+    if origin in (set, frozenset):
+        return origin(_key(item_tp, i) for i in range(n))
+    return origin(element(item_tp) for _ in range(n))
+
+
+def _first_default(tp: Any) -> Any:
+    return _DEFAULTS.get(tp, (0,))[0]
+
+
+def boundary_values(exprs: Iterable[str], annotation: str) -> list[Any]:
+    """Values on and next to the bounds the expressions compare against."""
+    tp = _resolve(annotation)
+    sized = (get_origin(tp) or tp) in (str, bytes, *_CONTAINERS)
+    found: list[Any] = []
+    for c, is_len in _all_constants(exprs):
+        if is_len and isinstance(c, int) and sized:
+            found.extend(
+                _sized(tp, n, _first_default)
+                for n in (c - 1, c, c + 1)
+                if 0 <= n <= _MAX_SIZE
+            )
+        elif isinstance(c, int | float) and tp is int:
+            c = int(c)
+            found.extend((c - 1, c, c + 1))
+        elif isinstance(c, int | float) and tp is float:
+            found.extend((c - 1.0, c - 1e-9, float(c), c + 1e-9, c + 1.0))
+        elif isinstance(c, str) and tp is str:
+            found.extend((c, c + "a", c[:-1]))
+        elif isinstance(c, bytes) and tp is bytes:
+            found.extend((c, c + b"a", c[:-1]))
+    return found
+
+
+def _defaults(annotation: str) -> list[Any]:
+    tp = _resolve(annotation)
+    if tp in _DEFAULTS:
+        return list(_DEFAULTS[tp])
+    return [_sized(tp, n, _first_default) for n in (0, 1)]
+
+
+def random_values(
+    exprs: Iterable[str], annotation: str, count: int, seed: str = ""
+) -> Iterator[Any]:
+    """
+    `count` random values of the annotation's type, reproducible for given
+    expressions (and `seed`), biased towards the numbers and sizes they
+    mention.
+    """
+    exprs = list(exprs)
+    tp = _resolve(annotation)
+    key = [annotation, *exprs, seed] if seed else [annotation, *exprs]
+    rng = random.Random(zlib.crc32("\0".join(key).encode()))
+    constants = _all_constants(exprs)
+    expensive = _expensive(tuple(exprs))
+    numbers = [
+        c
+        for c, is_len in constants
+        if isinstance(c, int | float) and not is_len and not (expensive and _too_big(c))
+    ]
+    sizes = [
+        c
+        for c, is_len in constants
+        if is_len and isinstance(c, int) and 0 <= c <= _MAX_SIZE
+    ]
+    max_size = max(sizes, default=4) + 2
+    # Magnitude of the widest random ints and floats.
+    wide_int = _EXPENSIVE_MAGNITUDE if expensive else 2**31
+    wide_float = _EXPENSIVE_MAGNITUDE if expensive else 1e6
+
+    def number(kind: type) -> Any:
+        roll = rng.random()
+        if numbers and roll < 0.4:
+            near = rng.choice(numbers)
+            return kind(
+                near + (rng.randint(-3, 3) if kind is int else rng.uniform(-3, 3))
+            )
+        if roll < 0.7:
+            return rng.randint(-10, 10) if kind is int else rng.uniform(-10, 10)
+        if kind is int:
+            return rng.randint(-wide_int, wide_int)
+        return rng.uniform(-wide_float, wide_float)
+
+    def size() -> int:
+        if sizes and rng.random() < 0.5:
+            return max(0, rng.choice(sizes) + rng.randint(-1, 1))
+        return rng.randint(0, max_size)
+
+    def value(t: Any) -> Any:
+        if t is bool:
+            return rng.random() < 0.5
+        if t in (int, float):
+            return number(t)
+        if t is str:
+            return "".join(rng.choice(_ALPHABET) for _ in range(size()))
+        if t is bytes:
+            return bytes(rng.randrange(256) for _ in range(size()))
+        return _sized(t, size(), value)
+
+    for _ in range(count):
+        yield value(tp)
+
+
+def _holds(expr: str, values: dict[str, Any]) -> bool | None:
+    try:
+        return parse_constraint(expr, "x").evaluate(values)
+    except Exception:  # noqa: BLE001 - a constraint that raises decides nothing
+        return None
+
+
+def find_counterexample(
+    pre: str,
+    post: str,
+    annotation: str | Mapping[str, str],
+    samples: int | None = None,
+    timeout: float | None = None,
+) -> dict[str, Any] | None:
+    """
+    A concrete `{"x": value}` of type `annotation` that satisfies `pre` but
+    not `post`, or None if no candidate does. `samples` random values are
+    tried after the fixed candidates (default: `fuzz_samples`). After
+    `timeout` seconds (None: no limit) no further candidates are tried.
+
+    For constraints over several variables (relations between parameters),
+    `annotation` maps each variable to its annotation; the fixed candidates
+    of the variables are combined (at most `_MAX_COMBINATIONS` of them) and
+    the random values are drawn per variable.
+    """
+    try:
+        parse_constraint(pre, "x")
+        parse_constraint(post, "x")
+    except SyntaxError:
+        return None
+    deadline = None if timeout is None else time.monotonic() + timeout
+    params = {"x": annotation} if isinstance(annotation, str) else dict(annotation)
+    exprs = (pre, post)
+    count = fuzz_samples if samples is None else samples
+    fixed = [
+        [*witnesses.values(a), *boundary_values(exprs, a), *_defaults(a)]
+        for a in params.values()
+    ]
+    randoms = [
+        random_values(exprs, a, count, seed=name if len(params) > 1 else "")
+        for name, a in params.items()
+    ]
+    candidates = itertools.chain(
+        itertools.islice(itertools.product(*fixed), _MAX_COMBINATIONS),
+        zip(*randoms),
+    )
+    expensive = _expensive(exprs)
+    seen: set[tuple[Any, ...]] = set()
+    for values in candidates:
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        if expensive and any(map(_too_big, values)):
+            continue
+        try:
+            if values in seen:
+                continue
+            seen.add(values)
+        except TypeError:
+            pass  # unhashable containers are simply evaluated again
+        env = dict(zip(params, values))
+        if _holds(pre, env) and _holds(post, env) is False:
+            return env
+    return None
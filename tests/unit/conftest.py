@@ -0,0 +1,14 @@
+import pytest
+
+import zvic.crosshair_inprocess
+
+
+def _never_called(*args, **kwargs):
+    raise AssertionError("CrossHair should not run")
+
+
+@pytest.fixture
+def no_crosshair(monkeypatch):
+    """Fail the test if a check reaches CrossHair; returns the stand-in."""
+    monkeypatch.setattr(zvic.crosshair_inprocess, "check_implication", _never_called)
+    return _never_called
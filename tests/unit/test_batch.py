@@ -0,0 +1,117 @@
+import threading
+import time
+
+from zvic import SignatureIncompatible, check_many
+from zvic.compatibility_types import is_type_compatible, type_verdicts
+from zvic.crosshair_inprocess import AnalysisLock, analysis_lock
+from zvic.type_registry import module_alias
+from zvic.utils import VerdictCache
+
+MOD_A = "def f(a: int, b: int) -> int:\n    return a\n"
+MOD_B = "def f(a: int, b: int = 0) -> int:\n    return a\n"
+MOD_B_BROKEN = "def f(a: int) -> int:\n    return a\n"
+
+
+def _write(tmp_path, name, src):
+    path = tmp_path / name
+    path.write_text(src, encoding="utf-8")
+    return path
+
+
+def test_check_many_reports_every_pair(tmp_path):
+    a = _write(tmp_path, "mod_a.py", MOD_A)
+    b = _write(tmp_path, "mod_b.py", MOD_B)
+    broken = _write(tmp_path, "mod_c.py", MOD_B_BROKEN)
+    pairs = [(a, b), (a, broken), (a, b), (tmp_path / "missing.py", b)]
+    results = sorted(check_many(pairs, max_workers=4))
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert [r.compatible for r in results] == [True, False, True, False]
+    assert isinstance(results[1].error, SignatureIncompatible)
+    assert isinstance(results[3].error, FileNotFoundError)
+
+
+def test_check_many_accepts_objects():
+    def f(a: int, b: int) -> int:
+        return a
+
+    def g(a: int, b: int = 0) -> int:
+        return a
+
+    (result,) = check_many([(f, g)])
+    assert result.compatible and result.a is f
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = VerdictCache()
+    calls = []
+
+    def slow(x):
+        calls.append(x)
+        time.sleep(0.05)
+        return x
+
+    threads = [
+        threading.Thread(target=cache.call, args=("k", slow, 1)) for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == [1]
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_unrelated_type_verdicts_are_shared_across_module_pairs():
+    type_verdicts.clear()
+    with module_alias("new_x", "old_x"):
+        is_type_compatible(bool, int)
+    with module_alias("new_y", "old_y"):
+        is_type_compatible(bool, int)
+    assert (type_verdicts.hits, type_verdicts.misses) == (1, 1)
+
+
+def test_analysis_waits_for_shared_holders():
+    lock = AnalysisLock()
+    events = []
+    entered = threading.Event()
+
+    def check():
+        with lock.shared():
+            entered.set()
+            time.sleep(0.05)
+            events.append("check done")
+
+    def analysis():
+        # Started inside a shared section, like a check that needs CrossHair.
+        with lock.shared(), lock.exclusive():
+            events.append("analysis")
+
+    worker = threading.Thread(target=check)
+    worker.start()
+    entered.wait()
+    analysis()
+    worker.join()
+    assert events == ["check done", "analysis"]
+
+
+def test_waiting_for_a_verdict_releases_the_shared_hold():
+    cache = VerdictCache()
+    started = threading.Event()
+
+    def needs_analysis():
+        started.set()
+        time.sleep(0.05)
+        with analysis_lock.exclusive():
+            return "verdict"
+
+    def owner():
+        with analysis_lock.shared():
+            cache.call("k", needs_analysis)
+
+    worker = threading.Thread(target=owner)
+    worker.start()
+    started.wait()
+    with analysis_lock.shared():
+        # Coalesces onto the owner's check, which needs this hold dropped.
+        assert cache.call("k", needs_analysis) == "verdict"
+    worker.join()
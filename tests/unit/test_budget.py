@@ -0,0 +1,89 @@
+import textwrap
+import time
+
+import pytest
+
+import zvic.crosshair_inprocess
+import zvic.witnesses
+from zvic import is_compatible, iter_compatibility, load_module
+from zvic.budget import CROSSHAIR_SECONDS, Budget, allot, using_budget
+from zvic.compatibility_constraints import crosshair_results, is_constraint_compatible
+from zvic.crosshair_inprocess import CrossHairResult
+from zvic.exception import CompatibilityUnknown, SignatureIncompatible
+
+A = {"name": "a", "constraint": "_ > 0"}
+B = {"name": "a", "constraint": "_ > 0 and _ != 3 * 7654321"}
+
+
+def test_allot_hands_out_half_of_what_is_left():
+    assert allot(CROSSHAIR_SECONDS) == CROSSHAIR_SECONDS
+    with using_budget(Budget(60)):
+        assert allot(CROSSHAIR_SECONDS) == CROSSHAIR_SECONDS
+    with using_budget(Budget(4)):
+        assert 1.9 < allot(CROSSHAIR_SECONDS) <= 2
+    with using_budget(Budget(0)):
+        assert allot(CROSSHAIR_SECONDS) is None
+
+
+def test_exhausted_budget_gives_unknown_and_is_not_memoized(no_crosshair):
+    crosshair_results.clear()
+    with using_budget(Budget(0)), pytest.raises(CompatibilityUnknown):
+        is_constraint_compatible(A, B)
+    assert len(crosshair_results) == 0
+
+
+def test_witness_search_stays_within_budget(monkeypatch, no_crosshair):
+    monkeypatch.setattr(zvic.witnesses, "fuzz_samples", 10**8)
+    crosshair_results.clear()
+    start = time.monotonic()
+    with using_budget(Budget(0.5)), pytest.raises(CompatibilityUnknown):
+        is_constraint_compatible(A, B)
+    assert time.monotonic() - start < 2
+
+
+def test_cheap_engines_run_without_budget(no_crosshair):
+    with using_budget(Budget(0)):
+        is_constraint_compatible(A, dict(A))
+        with pytest.raises(SignatureIncompatible):
+            is_constraint_compatible(
+                {"name": "a", "constraint": "_ < 20"},
+                {"name": "a", "constraint": "_ < 10"},
+            )
+
+
+def test_unconfirmed_crosshair_run_under_budget_is_unknown(monkeypatch):
+    def unconfirmed(pre, post, params, timeout):
+        assert timeout <= 15
+        return CrossHairResult(True, None, exhaustive=False)
+
+    monkeypatch.setattr(zvic.crosshair_inprocess, "check_implication", unconfirmed)
+    crosshair_results.clear()
+    with using_budget(Budget(30)), pytest.raises(CompatibilityUnknown):
+        is_constraint_compatible(A, B)
+    # Without a budget, no counterexample in time still counts as compatible.
+    is_constraint_compatible(A, B)
+
+
+def test_is_compatible_reports_unknown_after_definite_errors(tmp_path, no_crosshair):
+    crosshair_results.clear()
+    src_a = """
+        from zvic import _
+
+        def f(a: int(_ > 0)) -> int:
+            return a
+
+        def g(a: int, b: int) -> int:
+            return a
+    """
+    src_b = src_a.replace("_ > 0)", "_ > 0 and _ != 3 * 7654321)")
+    (tmp_path / "budget_a.py").write_text(textwrap.dedent(src_a), encoding="utf-8")
+    (tmp_path / "budget_b.py").write_text(textwrap.dedent(src_b), encoding="utf-8")
+    a = load_module(tmp_path / "budget_a.py", "budget_a")
+    b = load_module(tmp_path / "budget_b.py", "budget_b")
+    statuses = {r.name: r.status for r in iter_compatibility(a, b, budget=0)}
+    assert statuses["budget_a.f"] == "unknown"
+    assert statuses["budget_a.g"] == "compatible"
+    with pytest.raises(CompatibilityUnknown):
+        is_compatible(a, b, budget=0)
+    with pytest.raises(SignatureIncompatible):
+        is_compatible(a.f, b.g, budget=0)
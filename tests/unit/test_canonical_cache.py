@@ -0,0 +1,71 @@
+from zvic.canonical import compact_signature
+from zvic.main import canonical_signature, canonicalize, clear_signature_cache
+
+
+def test_repeated_canonicalization_is_cached():
+    def f(x: int, *, y: str = "a") -> int:
+        return x
+
+    first = compact_signature(f)
+    assert compact_signature(f) is first
+    assert canonical_signature(f) == canonical_signature(f)
+
+
+def test_mutating_a_result_leaves_the_cache_intact():
+    def f(x: int, *, y: str = "a") -> int:
+        return x
+
+    first = canonical_signature(f)
+    first["params"]["positional_or_keyword"].clear()
+    first["return"]["type"] = "str"
+    second = canonical_signature(f)
+    assert second["params"]["positional_or_keyword"] == [{"type": "int", "name": "x"}]
+    assert second["return"]["type"] == "int"
+
+    embedded = canonicalize(f)["__call__"]
+    embedded["params"]["keyword_only"][0]["type"] = "bytes"
+    assert canonical_signature(f)["params"]["keyword_only"][0]["type"] == "str"
+
+
+def test_editing_annotations_in_place_invalidates_cache():
+    def f(x: int, *, y: int = 1) -> int:
+        return x
+
+    canonical_signature(f)
+    f.__annotations__["x"] = str
+    f.__kwdefaults__["y"] = 2
+    second = canonical_signature(f)
+    assert second["params"]["positional_or_keyword"][0]["type"] == "str"
+    assert second["params"]["keyword_only"][0]["default"] == 2
+
+
+def test_rebinding_defaults_invalidates_cache():
+    def f(x: int = 1) -> int:
+        return x
+
+    first = canonical_signature(f)
+    f.__defaults__ = (2,)
+    second = canonical_signature(f)
+    assert second is not first
+    assert second["params"]["positional_or_keyword"][0]["default"] == 2
+
+
+def test_rebinding_annotations_invalidates_cache():
+    def f(x: int) -> int:
+        return x
+
+    first = canonical_signature(f)
+    f.__annotations__ = {"x": str, "return": str}
+    second = canonical_signature(f)
+    assert second["params"]["positional_or_keyword"][0]["type"] == "str"
+    assert first["params"]["positional_or_keyword"][0]["type"] == "int"
+
+
+def test_clear_signature_cache():
+    def f(x: int) -> int:
+        return x
+
+    first = canonical_signature(f)
+    clear_signature_cache()
+    second = canonical_signature(f)
+    assert second == first
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+from zvic.canonical import CanonicalParam, as_dict, compact_signature
+
+
+def f(a: int, /, b: Annotated[str, "len(_) > 2"], *, z: float = 1.0, y=None) -> int:
+    return a
+
+
+def g(a: int, /, b: Annotated[str, "len(_)>2"], *, z: float = 1.0, y=None) -> int:
+    return a
+
+
+def test_compact_signature_records():
+    record = compact_signature(f)
+    assert record.positional_only == (CanonicalParam(None, "int"),)
+    assert record.positional_or_keyword[0].constraint == "len(_) > 2"
+    assert [p.name for p in record.keyword_only] == ["y", "z"]
+    assert record.return_type == "int"
+
+
+def test_equal_signatures_share_interned_strings():
+    a, b = compact_signature(f), compact_signature(g)
+    assert a == b
+    assert (
+        a.positional_or_keyword[0].constraint is b.positional_or_keyword[0].constraint
+    )
+    assert a.positional_only[0].type is b.positional_only[0].type
+
+
+def test_as_dict_matches_canonical_signature_form():
+    assert as_dict(compact_signature(f)) == {
+        "params": {
+            "positional_only": [{"type": "int"}],
+            "positional_or_keyword": [
+                {"type": "str", "constraint": "len(_) > 2", "name": "b"}
+            ],
+            "keyword_only": [
+                {"name": "y", "default": None},
+                {"type": "float", "name": "z", "default": 1.0},
+            ],
+        },
+        "return": {"type": "int"},
+    }
+
+
+def test_annotations_that_fail_to_evaluate_stay_raw():
+    ns: dict = {}
+    exec(  # noqa: S102
+        "from __future__ import annotations\ndef g(x: int('abc'), y: 1/0): ...\n",
+        ns,
+    )
+    params = as_dict(compact_signature(ns["g"]))["params"]["positional_or_keyword"]
+    assert [p["type"] for p in params] == ["int('abc')", "1 / 0"]
@@ -0,0 +1,71 @@
+import sys
+import textwrap
+
+import pytest
+
+from zvic.compatibility import is_compatible
+from zvic.exception import SignatureIncompatible
+from zvic.main import canonicalize_package
+
+
+def _write_package(root, name, files):
+    for rel, source in files.items():
+        path = root / name / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(source), encoding="utf-8")
+
+
+@pytest.fixture
+def packages(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    base = {
+        "__init__.py": "def top(x: int) -> int:\n    return x\n",
+        "sub/__init__.py": "",
+        "sub/leaf.py": "def leaf(a: int, b: int) -> int:\n    return a + b\n",
+        "other.py": "def other(s: str) -> str:\n    return s\n",
+    }
+    _write_package(tmp_path, "zpkg_v1", base)
+    _write_package(tmp_path, "zpkg_ok", base)
+    _write_package(
+        tmp_path,
+        "zpkg_narrow",
+        {**base, "sub/leaf.py": "def leaf(a: int) -> int:\n    return a\n"},
+    )
+    _write_package(
+        tmp_path, "zpkg_missing", {k: v for k, v in base.items() if k != "other.py"}
+    )
+    yield
+    for name in list(sys.modules):
+        if name.startswith("zpkg_"):
+            del sys.modules[name]
+
+
+def test_canonicalize_package_walks_submodules(packages):
+    import zpkg_v1
+
+    tree = canonicalize_package(zpkg_v1)
+    assert list(tree) == ["zpkg_v1", "zpkg_v1.other", "zpkg_v1.sub", "zpkg_v1.sub.leaf"]
+    assert "leaf" in tree["zpkg_v1.sub.leaf"]
+    assert "top" in tree["zpkg_v1"]
+
+
+def test_canonicalize_package_uses_snapshot_without_importing(packages):
+    import zpkg_v1
+
+    snapshot = {"zpkg_v1.other": {"other": "from snapshot"}}
+    tree = canonicalize_package(zpkg_v1, snapshot=snapshot)
+    assert tree["zpkg_v1.other"] == {"other": "from snapshot"}
+    assert "zpkg_v1.other" not in sys.modules
+
+
+def test_is_compatible_recurses_into_packages(packages):
+    import zpkg_missing
+    import zpkg_narrow
+    import zpkg_ok
+    import zpkg_v1
+
+    is_compatible(zpkg_v1, zpkg_ok)
+    with pytest.raises(SignatureIncompatible):
+        is_compatible(zpkg_v1, zpkg_narrow)
+    with pytest.raises(SignatureIncompatible, match="Submodules missing"):
+        is_compatible(zpkg_v1, zpkg_missing)
@@ -0,0 +1,64 @@
+import ast
+
+import pytest
+
+from zvic.annotation_constraints import apply_annotation_constraints
+from zvic.constraint import parse_constraint
+from zvic.utils import normalize_constraint
+
+
+def test_parse_once_and_share():
+    c = parse_constraint("_<10")
+    assert c is parse_constraint("_<10")
+    assert c.source == "_ < 10" == normalize_constraint("_<10")
+    assert c == parse_constraint("_ < 10")
+    assert c.digest == parse_constraint("_ < 10").digest
+    assert c.digest != parse_constraint("_ < 11").digest
+
+
+def test_predicate():
+    c = parse_constraint("len(_) > 2")
+    assert c("abc")
+    assert not c([1])
+    assert c.predicate is c.predicate
+
+
+def test_rename_only_touches_the_subject():
+    c = parse_constraint("is_valid(_) and _ != 'a_b'")
+    renamed = c.rename("x")
+    assert renamed.source == "is_valid(x) and x != 'a_b'"
+    assert renamed.subject == "x"
+    assert renamed is c.rename("x")
+    assert renamed is parse_constraint(renamed.source, "x")
+    assert c.rename("_") is c
+
+
+def test_names():
+    c = parse_constraint("lo <= _ < len(hi)")
+    assert c.names == {"lo", "_", "len", "hi"}
+    assert c.free_names == {"lo", "hi"}
+
+
+def test_node_is_a_fresh_copy():
+    c = parse_constraint("_ > 0")
+    node = c.node()
+    assert isinstance(node, ast.Compare)
+    assert node is not c.tree.body
+    assert node is not c.node()
+
+
+def test_syntax_errors_propagate():
+    with pytest.raises(SyntaxError):
+        parse_constraint("_ >")
+
+
+def test_runtime_asserts_use_the_parsed_constraint():
+    src = "def f(is_ok: int(_ > 0 and _ != 3)) -> int(_ < 100):\n    return is_ok\n"
+    out = apply_annotation_constraints(src)
+    assert "assert is_ok > 0 and is_ok != 3" in out
+    assert "assert __return__ < 100" in out
+    ns: dict = {}
+    exec(out, ns)  # noqa: S102
+    assert ns["f"](5) == 5
+    with pytest.raises(AssertionError):
+        ns["f"](3)
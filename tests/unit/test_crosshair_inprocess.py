@@ -0,0 +1,39 @@
+import pytest
+
+from zvic.compatibility_constraints import crosshair_results, is_constraint_compatible
+from zvic.crosshair_inprocess import check_implication
+from zvic.exception import SignatureIncompatible
+
+pytest.importorskip("crosshair")
+
+
+def test_confirmed_implication():
+    result = check_implication("x > 0", "x >= 0", {"x": "int"}, timeout=5)
+    assert (result.holds, result.exhaustive) == (True, True)
+
+
+def test_refutation_carries_the_counterexample():
+    result = check_implication("x > 0", "x > 0 and x != 7", {"x": "int"}, timeout=5)
+    assert result.holds is False
+    assert result.counterexample == {"x": 7}
+
+
+def test_broken_check_is_not_a_refutation():
+    result = check_implication("x > 0", "y > 0", {"x": "int"}, timeout=5)
+    assert result.holds is None
+
+
+def test_constraint_mismatch_reports_counterexample():
+    crosshair_results.clear()
+    a = {"name": "a", "type": int, "constraint": "_ > 0"}
+    b = {"name": "a", "type": int, "constraint": "_ > 0 and _ % 2 == 0"}
+    with pytest.raises(SignatureIncompatible) as exc:
+        is_constraint_compatible(a, b)
+    witness = exc.value.context["counterexample"]["x"]
+    assert witness > 0 and witness % 2 == 1
+
+
+def test_constraints_on_strings():
+    crosshair_results.clear()
+    a = {"name": "s", "type": str, "constraint": "len(_) > 3"}
+    is_constraint_compatible(a, {"name": "s", "type": str, "constraint": "len(_) > 1"})
@@ -0,0 +1,114 @@
+import os
+import socket
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from zvic.daemon import Client, CompatibilityServer, default_socket_path
+
+MOD_A = "def f(a: int, b: int) -> int:\n    return a\n"
+MOD_B = "def f(a: int, b: int = 0) -> int:\n    return a\n"
+MOD_B_BROKEN = "def f(a: int, b: int, c: int) -> int:\n    return a\n"
+
+
+@pytest.fixture
+def daemon():
+    # Unix socket paths are limited to ~100 characters; keep it short.
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp:
+        server = CompatibilityServer(Path(tmp) / "zvic.sock")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        with Client(server.socket_path) as client:
+            yield client
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_check_reuses_loaded_modules(daemon, tmp_path):
+    a, b = tmp_path / "mod_a.py", tmp_path / "mod_b.py"
+    a.write_text(MOD_A, encoding="utf-8")
+    b.write_text(MOD_B, encoding="utf-8")
+    assert daemon.ping()["status"] == "ok"
+    assert daemon.check(a, b)["status"] == "compatible"
+    assert daemon.check(a, b, symbol="f")["status"] == "compatible"
+    stats = daemon.stats()
+    assert (stats["modules"], stats["checks"]) == (2, 2)
+
+
+def test_changed_files_are_reloaded(daemon, tmp_path):
+    a, b = tmp_path / "mod_a.py", tmp_path / "mod_b.py"
+    a.write_text(MOD_A, encoding="utf-8")
+    b.write_text(MOD_B, encoding="utf-8")
+    assert daemon.check(a, b)["status"] == "compatible"
+    b.write_text(MOD_B_BROKEN, encoding="utf-8")
+    res = daemon.check(a, b)
+    assert res["status"] == "incompatible"
+    assert "required" in res["message"]
+
+
+def test_errors_are_reported_not_fatal(daemon, tmp_path):
+    res = daemon.check(tmp_path / "missing.py", tmp_path / "missing.py")
+    assert res["status"] == "error"
+    assert daemon.request(op="nope")["status"] == "error"
+    assert daemon.ping()["status"] == "ok"
+
+
+def test_live_socket_is_not_taken_over(daemon):
+    path = Path(daemon._sock.getpeername())
+    with pytest.raises(OSError, match="already listening"):
+        CompatibilityServer(path)
+    assert daemon.ping()["status"] == "ok"
+
+
+def test_stale_socket_is_replaced():
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp:
+        path = Path(tmp) / "zvic.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()
+        server = CompatibilityServer(path)
+        server.server_close()
+        assert not path.exists()
+        path.write_text("not a socket")
+        with pytest.raises(OSError):
+            CompatibilityServer(path)
+        assert path.read_text() == "not a socket"
+
+
+def test_relative_paths_are_resolved_by_the_client(daemon, tmp_path, monkeypatch):
+    (tmp_path / "mod_a.py").write_text(MOD_A, encoding="utf-8")
+    (tmp_path / "mod_b.py").write_text(MOD_B, encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    sent = []
+    request = daemon.request
+    monkeypatch.setattr(daemon, "request", lambda **r: sent.append(r) or request(**r))
+    assert daemon.check("mod_a.py", "mod_b.py")["status"] == "compatible"
+    assert sent[0]["a"] == str(tmp_path.resolve() / "mod_a.py")
+    assert Path(sent[0]["b"]).is_absolute()
+
+
+def test_default_socket_lives_in_a_private_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    path = default_socket_path()
+    assert path.parent == tmp_path / f"zvic-{os.getuid()}"
+    assert path.parent.stat().st_mode & 0o777 == 0o700
+    assert default_socket_path() == path
+    path.parent.chmod(0o755)
+    with pytest.raises(PermissionError):
+        default_socket_path()
+
+
+def test_sockets_of_other_users_are_left_alone(daemon, monkeypatch):
+    path = Path(daemon._sock.getpeername())
+    monkeypatch.setattr(os, "getuid", lambda: path.stat().st_uid + 1)
+    with pytest.raises(PermissionError):
+        Client(path)
+    with pytest.raises(PermissionError):
+        CompatibilityServer(path)
+    monkeypatch.undo()
+    assert path.exists()
+    assert daemon.ping()["status"] == "ok"
@@ -0,0 +1,70 @@
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Literal, Optional, TypeVar, Union
+
+import pytest
+
+from zvic.compatibility_types import is_type_compatible
+from zvic.exception import SignatureIncompatible
+
+
+class Animal:
+    pass
+
+
+class Dog(Animal):
+    pass
+
+
+def compatible(a, b) -> bool:
+    try:
+        return bool(is_type_compatible(a, b))
+    except SignatureIncompatible:
+        return False
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        (list[Dog], list[Animal]),
+        (list[Dog], Sequence[Animal]),
+        (dict[str, list[Dog]], dict[str, list[Animal]]),
+        (dict[str, int], Mapping[str, int]),
+        (dict[str, int], Iterable[str]),
+        (list[int], list),
+        (tuple[int, int], tuple[int, ...]),
+        (Callable[[Animal], Dog], Callable[[Dog], Animal]),
+        (Callable[[int], int], Callable[..., int]),
+        (Literal[1, 2], Literal[1, 2, 3]),
+        (Literal["a"], str),
+        (int, Union[int, str]),
+        (Optional[int], Union[int, str, None]),
+        (TypeVar("T", bound=Dog), Animal),
+        (int, TypeVar("T")),
+    ],
+)
+def test_structurally_compatible(a, b):
+    assert compatible(a, b)
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        (list[Animal], list[Dog]),
+        (list[int], list[str]),
+        (list[int], set[int]),
+        (dict[str, int], dict[str, str]),
+        (list, list[int]),
+        (tuple[int, ...], tuple[int, int]),
+        (tuple[int, int], tuple[int]),
+        (Callable[[Dog], Animal], Callable[[Animal], Animal]),
+        (Callable[[Animal], Animal], Callable[[Animal], Dog]),
+        (Callable[[int], int], Callable[[int, int], int]),
+        (Literal[1, 2, 3], Literal[1, 2]),
+        (str, Literal["a"]),
+        (Optional[int], int),
+        (Union[int, str], int),
+        (TypeVar("T", int, str), int),
+    ],
+)
+def test_structurally_incompatible(a, b):
+    assert not compatible(a, b)
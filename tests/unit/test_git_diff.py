@@ -0,0 +1,98 @@
+import json
+import subprocess
+
+import pytest
+
+from zvic import git_diff
+from zvic.static_contract import CONTRACT_SCHEMA, extract_contract
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "zvic@example.com")
+    _git(tmp_path, "config", "user.name", "zvic")
+    files = {
+        "stable.py": "def s(x: int) -> int:\n    return x\n",
+        "narrowed.py": "def n(a, b=1):\n    return a\n",
+        "widened.py": "def w(a):\n    return a\n",
+        "gone.py": "def g(): ...\n",
+    }
+    for name, source in files.items():
+        (tmp_path / name).write_text(source)
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "v1")
+    (tmp_path / "narrowed.py").write_text("def n(a):\n    return a\n")
+    (tmp_path / "widened.py").write_text("def w(a, b=2):\n    return a\n")
+    (tmp_path / "new.py").write_text("def fresh(): ...\n")
+    (tmp_path / "gone.py").unlink()
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-qm", "v2")
+    git_diff._contract_cache.clear()
+    return tmp_path
+
+
+def test_only_changed_files_are_checked(repo):
+    report = git_diff.diff_revisions("HEAD~1", "HEAD", repo)
+    assert not report["ok"]
+    assert report["files"] == {
+        "gone.py": {"status": "removed"},
+        "narrowed.py": {
+            "status": "incompatible",
+            "message": report["files"]["narrowed.py"]["message"],
+        },
+        "new.py": {"status": "added"},
+        "widened.py": {"status": "compatible"},
+    }
+
+
+def test_blob_contracts_are_cached(repo, monkeypatch):
+    git_diff.diff_revisions("HEAD~1", "HEAD", repo)
+    cache_dir = git_diff._cache_dir(repo)
+    assert cache_dir.parent == repo / ".git" / git_diff.CACHE_DIRNAME
+    assert f"schema{CONTRACT_SCHEMA}" in cache_dir.name
+    assert list(cache_dir.glob("*.json"))
+    git_diff._contract_cache.clear()
+
+    shown = []
+    real_git = git_diff._git
+
+    def counting_git(repo, *args):
+        if args[0] == "show":
+            shown.append(args)
+        return real_git(repo, *args)
+
+    monkeypatch.setattr(git_diff, "_git", counting_git)
+    report = git_diff.diff_revisions("HEAD~1", "HEAD", repo)
+    assert report["files"]["widened.py"] == {"status": "compatible"}
+    assert shown == []
+
+
+def test_cache_files_keep_literal_types(tmp_path):
+    contract = extract_contract(
+        "def f(a=(1, 2), b={1: b'x'}, c=1j, d=..., e={'__zvic__': {2, 3}}): ...\n"
+    )
+    encoded = json.loads(json.dumps(git_diff._encode(contract)))
+    assert git_diff._decode(encoded) == contract
+
+
+def test_unexpected_errors_are_reported_per_file(repo, monkeypatch):
+    def broken(a, b, module_name):
+        if module_name == "narrowed.py":
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(git_diff, "is_contract_compatible", broken)
+    files = git_diff.diff_revisions("HEAD~1", "HEAD", repo)["files"]
+    assert files["narrowed.py"] == {"status": "error", "message": "RuntimeError: boom"}
+    assert files["widened.py"] == {"status": "compatible"}
+
+
+def test_main_exit_code(repo, capsys):
+    assert git_diff.main(["HEAD~1", "HEAD", "--repo", str(repo), "--no-cache"]) == 1
+    assert '"narrowed.py"' in capsys.readouterr().out
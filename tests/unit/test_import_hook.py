@@ -0,0 +1,34 @@
+import importlib
+import sys
+
+import pytest
+
+from zvic import install_import_hook
+from zvic.main import uninstall_import_hook
+
+
+@pytest.fixture
+def package_root(tmp_path):
+    pkg = tmp_path / "hooked_pkg"
+    (pkg / "sub").mkdir(parents=True)
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "sub" / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "sub" / "mod.py").write_text(
+        "from zvic import _\n\n\ndef f(x: int(_ > 0)) -> int:\n    return x\n",
+        encoding="utf-8",
+    )
+    sys.path.insert(0, str(tmp_path))
+    install_import_hook(allow_roots=[str(tmp_path)])
+    yield tmp_path
+    uninstall_import_hook()
+    sys.path.remove(str(tmp_path))
+    for name in [n for n in sys.modules if n.startswith("hooked_pkg")]:
+        del sys.modules[name]
+
+
+def test_packages_imported_through_the_hook_keep_their_submodules(package_root):
+    mod = importlib.import_module("hooked_pkg.sub.mod")
+    assert importlib.import_module("hooked_pkg").__path__
+    assert mod.f(1) == 1
+    with pytest.raises(AssertionError):
+        mod.f(0)
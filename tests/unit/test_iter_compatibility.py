@@ -0,0 +1,82 @@
+import itertools
+import textwrap
+
+import pytest
+
+from zvic import SignatureIncompatible, is_compatible, iter_compatibility, load_module
+
+MOD_A = """
+class Shape:
+    def area(self, scale: int) -> int:
+        return scale
+
+    def name(self) -> str:
+        return "shape"
+
+
+def f(a: int, b: int) -> int:
+    return a
+
+
+def g(a: int) -> int:
+    return a
+"""
+
+MOD_B = """
+class Shape:
+    def area(self, scale: int, extra: int) -> int:
+        return scale
+
+    def name(self) -> str:
+        return "shape"
+
+
+def f(a: int) -> int:
+    return a
+
+
+def g(a: int, b: int = 0) -> int:
+    return a
+"""
+
+
+@pytest.fixture
+def modules(tmp_path):
+    (tmp_path / "iter_a.py").write_text(textwrap.dedent(MOD_A), encoding="utf-8")
+    (tmp_path / "iter_b.py").write_text(textwrap.dedent(MOD_B), encoding="utf-8")
+    return (
+        load_module(tmp_path / "iter_a.py", "iter_a"),
+        load_module(tmp_path / "iter_b.py", "iter_b"),
+    )
+
+
+def test_yields_a_record_per_symbol_and_continues_past_errors(modules):
+    a, b = modules
+    results = {r.name: r for r in iter_compatibility(a, b)}
+    assert list(results) == [
+        "iter_a",
+        "iter_a.Shape",
+        "iter_a.Shape.__init__",
+        "iter_a.Shape.__call__",
+        "iter_a.Shape.area",
+        "iter_a.Shape.name",
+        "iter_a.f",
+        "iter_a.g",
+    ]
+    broken = sorted(name for name, r in results.items() if not r.compatible)
+    assert broken == ["iter_a.Shape.area", "iter_a.f"]
+    assert isinstance(results["iter_a.f"].error, SignatureIncompatible)
+    assert results["iter_a.g"].a is a.g and results["iter_a.g"].duration >= 0
+
+
+def test_is_compatible_raises_the_first_error(modules):
+    a, b = modules
+    first = next(r for r in iter_compatibility(a, b) if not r.compatible)
+    with pytest.raises(SignatureIncompatible) as exc:
+        is_compatible(a, b)
+    assert exc.value.message == first.error.message
+
+
+def test_stopping_early_skips_remaining_checks(modules):
+    a, b = modules
+    assert len(list(itertools.islice(iter_compatibility(a, b), 2))) == 2
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from zvic.main import LazyCanonical, canonicalize, load_module
+
+foo_path = Path(__file__).parent / "stuff" / "foo_module.py"
+
+
+def test_load_module_defers_canonicalization():
+    mod = load_module(foo_path, "foo_module_lazy")
+    lazy = mod._zvic_canonical
+    assert isinstance(lazy, LazyCanonical)
+    assert lazy._computed == {}
+    assert set(lazy) == {"foo", "bar", "baz", "Foo", "CallableClass"}
+    assert lazy._computed == {}
+
+
+def test_lazy_canonical_computes_per_symbol():
+    mod = load_module(foo_path, "foo_module_lazy")
+    lazy = mod._zvic_canonical
+    bar = lazy["bar"]
+    assert list(lazy._computed) == ["bar"]
+    assert lazy["bar"] is bar
+    assert "_" not in lazy
+
+
+def test_lazy_canonical_matches_eager_form():
+    mod = load_module(foo_path, "foo_module_lazy")
+    assert mod._zvic_canonical == canonicalize(mod)
@@ -0,0 +1,130 @@
+import gc
+import weakref
+from typing import Any, Protocol, SupportsAbs, SupportsInt
+
+import pytest
+
+from zvic.compatibility_protocols import (
+    check_conformance,
+    clear_protocol_cache,
+    conformance_verdicts,
+    conforms,
+    member_table,
+)
+from zvic.compatibility_types import is_type_compatible
+from zvic.exception import SignatureIncompatible
+from zvic.type_registry import module_alias
+
+
+class SupportsQuack(Protocol):
+    volume: int
+
+    def quack(self, times: int) -> str: ...
+
+
+class SupportsLoudQuack(SupportsQuack, Protocol):
+    def shout(self) -> str: ...
+
+
+class Duck:
+    volume = 3
+
+    def quack(self, times: int) -> str:
+        return "quack" * times
+
+
+class LoudDuck(Duck):
+    def shout(self) -> str:
+        return "QUACK"
+
+
+class Robot:
+    volume = 10
+
+    def quack(self, times: int, pitch: int) -> str:
+        return "beep"
+
+
+class Mute:
+    def quack(self, times: int) -> str:
+        return ""
+
+
+def test_concrete_class_conforms_to_protocol():
+    assert is_type_compatible(Duck, SupportsQuack)
+    assert is_type_compatible(LoudDuck, SupportsLoudQuack)
+    assert is_type_compatible(int, SupportsInt)
+
+
+def test_missing_member_is_incompatible():
+    with pytest.raises(SignatureIncompatible, match="volume"):
+        is_type_compatible(Mute, SupportsQuack)
+    with pytest.raises(SignatureIncompatible, match="shout"):
+        is_type_compatible(Duck, SupportsLoudQuack)
+
+
+def test_incompatible_method_signature_is_incompatible():
+    with pytest.raises(SignatureIncompatible, match="Robot.quack"):
+        is_type_compatible(Robot, SupportsQuack)
+
+
+def test_protocol_to_protocol_and_protocol_to_concrete():
+    assert is_type_compatible(SupportsLoudQuack, SupportsQuack)
+    with pytest.raises(SignatureIncompatible):
+        is_type_compatible(SupportsQuack, SupportsLoudQuack)
+    with pytest.raises(SignatureIncompatible):
+        is_type_compatible(SupportsQuack, Duck)
+
+
+def test_builtins_conform_to_protocols():
+    assert is_type_compatible(int, SupportsAbs)
+    assert is_type_compatible(float, SupportsInt)
+
+
+def test_protocol_widened_to_any_or_object():
+    # SupportsQuack is not runtime-checkable, so issubclass() would raise.
+    assert is_type_compatible(SupportsQuack, Any)
+    assert is_type_compatible(SupportsQuack, object)
+
+
+def test_protocols_inside_generics():
+    assert is_type_compatible(list[Duck], list[SupportsQuack])
+
+
+def test_member_tables_and_verdicts_are_cached():
+    clear_protocol_cache()
+    table = member_table(SupportsLoudQuack)
+    assert set(table) == {"volume", "quack", "shout"}
+    assert member_table(SupportsLoudQuack) is table
+    check_conformance(LoudDuck, SupportsLoudQuack)
+    check_conformance(LoudDuck, SupportsLoudQuack)
+    assert (conformance_verdicts.hits, conformance_verdicts.misses) == (1, 1)
+
+
+def test_verdicts_are_cached_per_module_alias():
+    clear_protocol_cache()
+    check_conformance(LoudDuck, SupportsLoudQuack)
+    with module_alias("other_version", __name__):
+        check_conformance(LoudDuck, SupportsLoudQuack)
+    check_conformance(LoudDuck, SupportsLoudQuack)
+    assert (conformance_verdicts.hits, conformance_verdicts.misses) == (1, 2)
+
+
+def test_verdicts_do_not_keep_classes_alive():
+    class Goose:
+        volume = 1
+
+        def quack(self, times: int) -> str:
+            return "honk"
+
+    class Silent:
+        pass
+
+    assert conforms(Goose, SupportsQuack)
+    with pytest.raises(SignatureIncompatible):
+        check_conformance(Silent, SupportsQuack)
+    assert not conforms(Silent, SupportsQuack)
+    refs = weakref.ref(Goose), weakref.ref(Silent)
+    del Goose, Silent
+    gc.collect()
+    assert [ref() for ref in refs] == [None, None]
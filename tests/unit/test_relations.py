@@ -0,0 +1,112 @@
+from typing import Annotated
+
+import pytest
+
+from zvic import canonical_signature, is_compatible
+from zvic.annotation_constraints import apply_annotation_constraints
+from zvic.constraint import conjunction, parse_constraint, relations
+from zvic.exception import SignatureIncompatible
+
+
+def a_range(lo: int, hi: Annotated[int, "_ > lo"]):
+    return hi - lo
+
+
+def b_gap(lo: int, hi: Annotated[int, "_ > lo + 1"]):
+    return hi - lo
+
+
+def b_wider(lo: int, hi: Annotated[int, "_ >= lo"]):
+    return hi - lo
+
+
+def a_posonly(lo: int, hi: Annotated[int, "_ > lo"], /):
+    return hi - lo
+
+
+def b_renamed(low: int, high: Annotated[int, "_ > low"], /):
+    return high - low
+
+
+def b_unconstrained(lo: int, hi: int):
+    return hi - lo
+
+
+def a_positive(lo: int, hi: Annotated[int, "_ > 0"]):
+    return hi
+
+
+def a_kwonly(*, lo: int, hi: Annotated[int, "_ > lo"]):
+    return hi - lo
+
+
+def b_kwonly_reordered(*, hi: Annotated[int, "_ > lo"], lo: int):
+    return hi - lo
+
+
+def test_relations_are_bound_to_their_parameter():
+    found = relations({"lo": "_ >= 0", "hi": "_ > lo", "n": "_ < LIMIT"})
+    assert found == {"hi": parse_constraint("hi > lo", "hi")}
+    both = conjunction([parse_constraint("lo >= 0"), found["hi"]])
+    assert both.source == "lo >= 0 and hi > lo"
+    assert both.evaluate({"lo": 0, "hi": 1})
+    assert not both.evaluate({"lo": 2, "hi": 1})
+    assert conjunction([]) is None
+
+
+def test_substitute_renames_simultaneously():
+    c = parse_constraint("hi > lo")
+    assert c.substitute({"hi": "lo", "lo": "hi"}).source == "lo > hi"
+    assert c.substitute({"x": "y"}) is c
+
+
+def test_narrowed_relation_is_refuted_without_crosshair(no_crosshair):
+    with pytest.raises(SignatureIncompatible) as exc:
+        is_compatible(a_range, b_gap)
+    example = exc.value.context["counterexample"]
+    assert example["hi"] == example["lo"] + 1
+    assert "parameters lo, hi" in exc.value.message
+
+
+def test_relation_replacing_a_bound_is_refuted(no_crosshair):
+    with pytest.raises(SignatureIncompatible):
+        is_compatible(a_positive, a_range)
+
+
+def test_renamed_parameters_keep_the_relation(no_crosshair):
+    assert is_compatible(a_posonly, b_renamed) is None
+    assert is_compatible(a_range, b_unconstrained) is None
+
+
+def test_relation_replaced_by_a_bound_is_refuted(no_crosshair):
+    with pytest.raises(SignatureIncompatible) as exc:
+        is_compatible(a_range, a_positive)
+    example = exc.value.context["counterexample"]
+    assert example["lo"] < example["hi"] <= 0
+
+
+def test_reordered_keyword_only_parameters_are_paired_by_name(no_crosshair):
+    assert is_compatible(a_kwonly, b_kwonly_reordered) is None
+
+
+def test_widened_relation_is_confirmed():
+    assert is_compatible(a_range, b_wider) is None
+
+
+def test_relations_are_canonicalized():
+    assert canonical_signature(a_range)["relations"] == ["hi > lo"]
+    assert "relations" not in canonical_signature(a_positive)
+
+
+def test_runtime_check_is_one_fused_assertion():
+    src = "def f(lo: int(_ >= 0), hi: int(_ > lo)):\n    return hi - lo\n"
+    out = apply_annotation_constraints(src)
+    assert out.count("assert lo >= 0") == 1
+    assert "assert hi" not in out
+    ns: dict = {}
+    exec(out, ns)  # noqa: S102
+    assert ns["f"](1, 2) == 1
+    with pytest.raises(AssertionError, match="'lo >= 0' not satisfied for lo=-1"):
+        ns["f"](-1, 2)
+    with pytest.raises(AssertionError, match="'hi > lo' not satisfied for hi=1"):
+        ns["f"](1, 1)
@@ -0,0 +1,53 @@
+from typing import Annotated
+
+import pytest
+
+from zvic import is_compatible
+from zvic.compatibility_constraints import is_return_constraint_compatible
+from zvic.exception import SignatureIncompatible
+
+
+def _ret(constraint, tp=int):
+    return {"name": "return", "type": tp, "constraint": constraint}
+
+
+def a_small(x: int) -> Annotated[int, "_ < 100"]:
+    return 0
+
+
+def b_smaller(x: int) -> Annotated[int, "_ < 10"]:
+    return 0
+
+
+def b_larger(x: int) -> Annotated[int, "_ < 1000"]:
+    return 0
+
+
+def b_plain(x: int) -> int:
+    return 0
+
+
+def test_narrowed_return_is_compatible():
+    assert is_compatible(a_small, b_smaller) is None
+    assert is_compatible(b_plain, a_small) is None
+
+
+def test_widened_return_is_incompatible():
+    with pytest.raises(SignatureIncompatible, match="B is wider"):
+        is_compatible(a_small, b_larger)
+
+
+def test_dropped_return_constraint_is_incompatible():
+    with pytest.raises(SignatureIncompatible, match="B drops return constraint"):
+        is_compatible(a_small, b_plain)
+
+
+def test_widened_return_is_refuted_by_a_witness(no_crosshair):
+    with pytest.raises(SignatureIncompatible) as exc:
+        is_return_constraint_compatible(_ret("_ > 0 and _ != 3"), _ret("_ > 0"))
+    assert exc.value.context["counterexample"] == {"x": 3}
+    assert "e.g. return=3" in exc.value.message
+
+
+def test_return_constraints_on_other_names_are_skipped(no_crosshair):
+    assert is_return_constraint_compatible(_ret("_ >= x"), _ret("_ >= x - 1")) is None
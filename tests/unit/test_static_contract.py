@@ -0,0 +1,137 @@
+from pathlib import Path
+
+import pytest
+
+from zvic.exception import SignatureIncompatible
+from zvic.main import canonicalize, load_module
+from zvic.static_contract import (
+    extract_contract,
+    extract_contract_from_path,
+    is_contract_compatible,
+)
+
+stuff = Path(__file__).parent.parent / "stuff"
+foo_path = Path(__file__).parent / "stuff" / "foo_module.py"
+
+static_a = extract_contract_from_path(stuff / "mod_a.py")
+static_b = extract_contract_from_path(stuff / "mod_b.py")
+
+
+def _only(contract, name):
+    return {**contract, "__all__": [name]}
+
+
+def test_extraction_does_not_execute_the_module():
+    source = (
+        "from zvic import _\n"
+        "raise RuntimeError('import side effect')\n"
+        "def f(x: int(_ > 0), *args, y: str = 'a', **kw) -> int:\n"
+        "    return x\n"
+    )
+    contract = extract_contract(source)
+    assert contract["__all__"] == ["f"]
+    params = contract["f"]["__call__"]["params"]
+    assert params["positional_or_keyword"] == [
+        {"type": "int", "constraint": "_ > 0", "name": "x"}
+    ]
+    assert params["keyword_only"] == [{"type": "str", "name": "y", "default": "a"}]
+    assert params["var_positional"] == "args"
+    assert params["var_keyword"] == "kw"
+
+
+def test_static_contract_matches_runtime_canonical_form():
+    static = extract_contract_from_path(foo_path)
+    runtime = canonicalize(load_module(foo_path, "foo_module_static"))
+    assert static["bar"] == runtime["bar"]
+    assert static["baz"] == runtime["baz"]
+    assert static["Foo"]["method_a"] == runtime["Foo"]["method_a"]
+    assert static["CallableClass"]["__call__"] == runtime["CallableClass"]["__call__"]
+
+
+def test_import_aliases_are_resolved():
+    contract = extract_contract(
+        "from typing import List as L\nimport collections.abc as cabc\n"
+        "def f(a: L[int], b: cabc.Sized) -> None: ...\n"
+    )
+    params = contract["f"]["__call__"]["params"]["positional_or_keyword"]
+    assert [p["type"] for p in params] == ["List[int]", "collections.abc.Sized"]
+
+
+@pytest.mark.parametrize("name", ["P1", "PK4", "T4", "T9", "AP4"])
+def test_static_compatible_scenarios(name):
+    is_contract_compatible(_only(static_a, name), _only(static_b, name))
+
+
+@pytest.mark.parametrize("name", ["P2", "PK5", "T2", "T6", "T8", "AK1"])
+def test_static_incompatible_scenarios(name):
+    with pytest.raises(SignatureIncompatible):
+        is_contract_compatible(_only(static_a, name), _only(static_b, name))
+
+
+def test_missing_public_name_is_reported():
+    a = extract_contract("def f(): ...\ndef g(): ...\n")
+    b = extract_contract("def f(): ...\n")
+    with pytest.raises(SignatureIncompatible, match="missing"):
+        is_contract_compatible(a, b)
+
+
+@pytest.mark.parametrize(
+    ("a_src", "b_src", "match"),
+    [
+        ("def f(): ...\n", "async def f(): ...\n", "async/sync mismatch"),
+        ("def f(): ...\n", "def f():\n    yield 1\n", "generator/non-generator"),
+        (
+            "class C:\n    pass\n",
+            "class C:\n    def __init__(self, y): ...\n",
+            "required",
+        ),
+        (
+            "from enum import Enum\nclass E(Enum):\n    A = 1\n    B = 2\n",
+            "from enum import Enum\nclass E(Enum):\n    A = 1\n",
+            "Enum members missing",
+        ),
+        (
+            "import enum\nclass E(enum.IntEnum):\n    A = 1\n",
+            "import enum\nclass E(enum.IntEnum):\n    A = 2\n",
+            "Enum member value changed",
+        ),
+        ("class C:\n    x = 1\n", "class C:\n    pass\n", "Attributes missing"),
+    ],
+)
+def test_static_checks_mirror_is_compatible(a_src, b_src, match):
+    with pytest.raises(SignatureIncompatible, match=match):
+        is_contract_compatible(extract_contract(a_src), extract_contract(b_src))
+
+
+def test_inherited_init_is_compared():
+    a = extract_contract("class C:\n    x: int = 0\n    def __init__(self, y=0): ...\n")
+    b = extract_contract(
+        "class Base:\n    def __init__(self, y=0): ...\n"
+        "class C(Base):\n    x: int = 0\n    def f(self):\n        yield 1\n"
+    )
+    is_contract_compatible(a, b)
+    assert b["C"]["f"]["generator"] is True
+    assert "async" not in extract_contract("async def g():\n    yield 1\n")["g"]
+
+
+ANIMALS = "from typing import Optional\nclass Animal: ...\nclass Dog(Animal): ...\n"
+
+
+@pytest.mark.parametrize(
+    ("a_type", "b_type"),
+    [
+        ("list[Animal]", "list[Dog]"),
+        ("Animal|None", "Dog|None"),
+        ("Animal | None", "Dog | None"),
+        ("Optional[Animal]", "Optional[Dog]"),
+        ("dict[str, Animal]", "dict[str, Dog]"),
+    ],
+)
+def test_generic_and_union_narrowing_of_contract_classes(a_type, b_type):
+    a = extract_contract(f"{ANIMALS}def f(x: {a_type}): ...\n")
+    b = extract_contract(f"{ANIMALS}def f(x: {b_type}): ...\n")
+    with pytest.raises(SignatureIncompatible):
+        is_contract_compatible(a, b)
+    # Widening the same way is fine, and unchanged contracts are compatible.
+    is_contract_compatible(b, a)
+    is_contract_compatible(a, extract_contract(f"{ANIMALS}def f(x: {a_type}): ...\n"))
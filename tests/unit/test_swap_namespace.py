@@ -0,0 +1,44 @@
+import threading
+
+from zvic.utils import swap_namespace
+
+
+def _make_namespace(generation: int, size: int = 50) -> dict:
+    ns = {"__name__": "swapped"}
+    for i in range(size):
+        ns[f"f{i}"] = lambda generation=generation: generation
+    return ns
+
+
+def test_swap_namespace_replaces_and_drops_stale_names():
+    target = {"__name__": "swapped", "__file__": "old.py", "keep": 1, "gone": 2}
+    swap_namespace(target, {"keep": 3, "new": 4, "__file__": "new.py"})
+    assert target == {"__name__": "swapped", "__file__": "old.py", "keep": 3, "new": 4}
+
+
+def test_concurrent_readers_never_see_mixed_generations():
+    target = _make_namespace(0)
+    stop = threading.Event()
+    mixed: list[set[int]] = []
+
+    def reader():
+        while not stop.is_set():
+            snapshot = dict(target)
+            generations = {
+                v() for k, v in snapshot.items() if k.startswith("f") and callable(v)
+            }
+            if len(generations) > 1:
+                mixed.append(generations)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    try:
+        for generation in range(1, 200):
+            swap_namespace(target, _make_namespace(generation))
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+    assert not mixed
+    assert target["f0"]() == 199
@@ -0,0 +1,65 @@
+import pytest
+
+from zvic import canonicalize, is_compatible
+from zvic.compatibility_types import is_type_compatible, type_verdicts
+from zvic.exception import SignatureIncompatible
+from zvic.tracing import collect_spans, span, tracing_enabled
+from zvic.utils import _
+
+
+def a_func(x: int(_ > 0), y: str = "") -> int:
+    return x
+
+
+def b_func(x: int(_ > 0), y: str = "", z: int = 0) -> int:
+    return x
+
+
+def test_spans_cover_the_pipeline():
+    type_verdicts.clear()
+    with collect_spans() as spans:
+        canonicalize(a_func)
+        is_compatible(a_func, b_func)
+    names = {s.name for s in spans}
+    assert {"canonicalize", "params", "types", "constraints"} <= names
+    assert all(s.duration >= 0 for s in spans)
+    types = [s for s in spans if s.name == "types"]
+    assert {s.cache_hit for s in types} <= {True, False}
+    assert not tracing_enabled()
+
+
+def test_type_spans_report_cache_hits_and_errors():
+    type_verdicts.clear()
+    with collect_spans() as spans:
+        is_type_compatible(int, int)
+        is_type_compatible(int, int)
+        with pytest.raises(SignatureIncompatible):
+            is_type_compatible(int, str)
+    assert [(s.cache_hit, s.error) for s in spans] == [
+        (False, None),
+        (True, None),
+        (False, "SignatureIncompatible"),
+    ]
+    assert spans[0].attrs == {"a": int, "b": int}
+
+
+def test_disabled_tracing_is_a_shared_no_op():
+    assert span("types") is span("params")
+    with span("types") as s:
+        s.cache_hit = True
+
+
+class _CountingRepr(type):
+    calls = 0
+
+    def __repr__(cls):
+        _CountingRepr.calls += 1
+        return "Counted"
+
+
+def test_disabled_debug_logging_does_not_format(caplog):
+    caplog.set_level("WARNING")
+    counted = _CountingRepr("Counted", (), {})
+    type_verdicts.clear()
+    is_type_compatible(counted, counted)
+    assert _CountingRepr.calls == 0
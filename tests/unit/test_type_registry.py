@@ -0,0 +1,114 @@
+import importlib
+import numbers
+import sys
+import types
+
+import pytest
+
+from zvic import type_registry, utils
+from zvic.compatibility_types import is_subtype, is_supertype, is_type_compatible
+from zvic.exception import SignatureIncompatible
+from zvic.type_registry import (
+    ancestors,
+    clear_type_registry,
+    is_qualified_subclass,
+    module_alias,
+    resolve_type_name,
+)
+
+
+class Animal:
+    pass
+
+
+class Cat(Animal):
+    pass
+
+
+def test_resolves_builtins_and_loaded_dotted_names():
+    clear_type_registry()
+    assert resolve_type_name("int") is int
+    assert resolve_type_name("numbers.Real") is numbers.Real
+    assert resolve_type_name(f"{__name__}.Cat") is Cat
+    assert resolve_type_name("Cat", {"Cat": Cat}) is Cat
+
+
+def test_never_evaluates_expressions():
+    assert resolve_type_name("__import__('os').system") is None
+    assert resolve_type_name("list[int]") is None
+    assert resolve_type_name("no_such_module.Thing") is None
+    assert resolve_type_name("len") is None
+
+
+def _version(module: str) -> dict[str, type]:
+    # The same source loaded under two module names, as load_module does.
+    animal = type("Animal", (), {"__module__": module})
+    cat = type("Cat", (animal,), {"__module__": module})
+    return {"Animal": animal, "Cat": cat}
+
+
+def test_ancestors_are_cached_fingerprints():
+    assert ancestors(Cat) == {
+        (__name__, "Cat"),
+        (__name__, "Animal"),
+        ("builtins", "object"),
+    }
+    assert ancestors(Cat) is ancestors(Cat)
+
+
+def test_same_named_classes_of_unrelated_modules_differ():
+    other = _version("elsewhere")
+    assert not is_subtype(other["Cat"], Animal)
+    assert not is_qualified_subclass(Cat, other["Animal"])
+
+
+def test_module_alias_matches_side_by_side_versions():
+    a, b = _version("mod_a"), _version("mod_b")
+    assert not is_qualified_subclass(a["Cat"], b["Animal"])
+    with module_alias("mod_b", "mod_a"):
+        assert is_qualified_subclass(a["Cat"], b["Animal"])
+        assert is_qualified_subclass(b["Cat"], a["Animal"])
+        assert is_type_compatible(a["Cat"], b["Animal"])
+        with pytest.raises(SignatureIncompatible):
+            is_type_compatible(a["Animal"], b["Cat"])
+    assert not is_qualified_subclass(a["Cat"], b["Animal"])
+
+
+def test_string_subtype_checks_without_eval():
+    assert is_supertype("int", "bool")
+    assert not is_supertype("bool", "int")
+    assert utils.is_subtype("bool", "int")
+    assert not utils.is_subtype("int", "str")
+    assert utils.is_supertype("numbers.Real", "int")
+
+
+def test_resolved_names_follow_reloaded_modules(tmp_path, monkeypatch):
+    (tmp_path / "reloaded_types.py").write_text("class Thing:\n    pass\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "reloaded_types", raising=False)
+    module = importlib.import_module("reloaded_types")
+    old = resolve_type_name("reloaded_types.Thing")
+    assert old is module.Thing
+    importlib.reload(module)
+    assert module.Thing is not old
+    assert resolve_type_name("reloaded_types.Thing") is module.Thing
+    replacement = types.ModuleType("reloaded_types")
+    replacement.Thing = type("Thing", (), {})
+    monkeypatch.setitem(sys.modules, "reloaded_types", replacement)
+    assert resolve_type_name("reloaded_types.Thing") is replacement.Thing
+
+
+def test_module_alias_forgets_names_of_its_modules():
+    a = types.ModuleType("alias_mod_a")
+    a.Thing = type("Thing", (), {})
+    sys.modules["alias_mod_a"] = a
+    try:
+        assert resolve_type_name("alias_mod_a.Thing") is a.Thing
+        with module_alias("alias_mod_b", "alias_mod_a"):
+            assert "alias_mod_a.Thing" not in type_registry._names
+            assert resolve_type_name("alias_mod_a.Thing") is a.Thing
+        # Only the first alias of a module pair forgets its names.
+        with module_alias("alias_mod_b", "alias_mod_a"):
+            assert "alias_mod_a.Thing" in type_registry._names
+    finally:
+        del sys.modules["alias_mod_a"]
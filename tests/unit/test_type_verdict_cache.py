@@ -0,0 +1,45 @@
+import pytest
+
+from zvic.compatibility_types import is_type_compatible, type_verdicts
+from zvic.exception import SignatureIncompatible
+from zvic.utils import VerdictCache
+
+
+class Animal:
+    pass
+
+
+class Cat(Animal):
+    pass
+
+
+def test_type_pairs_are_checked_once():
+    type_verdicts.clear()
+    assert is_type_compatible(Cat, Animal)
+    assert is_type_compatible(Cat, Animal)
+    assert (type_verdicts.hits, type_verdicts.misses) == (1, 1)
+
+
+def test_raised_verdicts_are_cached_and_reraised():
+    type_verdicts.clear()
+    with pytest.raises(SignatureIncompatible) as first:
+        is_type_compatible(Animal, Cat)
+    with pytest.raises(SignatureIncompatible) as second:
+        is_type_compatible(Animal, Cat)
+    assert type_verdicts.hits == 1
+    assert second.value is not first.value
+    assert second.value.message == first.value.message
+
+
+def test_unhashable_annotations_bypass_the_cache():
+    type_verdicts.clear()
+    assert is_type_compatible({"type": "any"}, {"type": "any"})
+    assert len(type_verdicts) == 0
+
+
+def test_verdict_cache_is_bounded():
+    cache = VerdictCache(maxsize=2)
+    for i in range(5):
+        cache.call(i, lambda x: x, i)
+    assert len(cache) == 2
+    assert cache.call(4, lambda x: -1, 4) == 4
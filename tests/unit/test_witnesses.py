@@ -0,0 +1,122 @@
+import time
+
+import pytest
+
+import zvic.crosshair_inprocess
+from zvic.compatibility_constraints import crosshair_results, is_constraint_compatible
+from zvic.crosshair_inprocess import CrossHairResult
+from zvic.exception import SignatureIncompatible
+from zvic.witnesses import (
+    annotation_of,
+    boundary_values,
+    find_counterexample,
+    random_values,
+    witnesses,
+)
+
+
+def _param(constraint, tp=int):
+    return {"name": "a", "type": tp, "constraint": constraint}
+
+
+@pytest.mark.parametrize(
+    ("pre", "post", "annotation", "expected"),
+    [
+        ("x >= 0", "x > 0", "int", 0),
+        ("x > -5", "x > -5 and x != 3", "int", 3),
+        ("len(x) >= 2", "len(x) > 2", "str", "aa"),
+        ("x <= 1.5", "x < 1.5", "float", 1.5),
+        ("x > 0", "x >= 0", "int", None),
+    ],
+)
+def test_boundary_values_refute_narrowing(pre, post, annotation, expected):
+    witnesses.clear()
+    found = find_counterexample(pre, post, annotation)
+    assert (found or {}).get("x") == expected
+
+
+def test_boundary_values_follow_the_annotation():
+    assert boundary_values(["x > 10"], "int") == [9, 10, 11]
+    assert boundary_values(["len(x) < 2"], "str") == ["a", "aa", "aaa"]
+    assert boundary_values(["x > 10"], "list") == []
+    assert boundary_values(["len(x) == 1"], "list[int]") == [[], [0], [0, 0]]
+
+
+@pytest.mark.parametrize(
+    ("tp", "expected"),
+    [
+        (int, "int"),
+        (None, "int"),
+        (list[int], "list[int]"),
+        (tuple[str, ...], "tuple[str, ...]"),
+        (dict[str, float], "dict[str, float]"),
+        (list[object], None),
+        (object, None),
+    ],
+)
+def test_annotation_of(tp, expected):
+    assert annotation_of(tp) == expected
+
+
+def test_random_values_are_reproducible_and_typed():
+    first = list(random_values(["len(x) < 5"], "list[int]", 50))
+    assert first == list(random_values(["len(x) < 5"], "list[int]", 50))
+    assert all(isinstance(v, list) for v in first)
+    assert all(isinstance(i, int) for v in first for i in v)
+    assert list(random_values(["x > 0"], "int", 0)) == []
+
+
+def test_fuzzing_refutes_what_boundaries_miss():
+    witnesses.clear()
+    pre, post = "len(x) >= 0", "all(v != 3 for v in x)"
+    assert find_counterexample(pre, post, "list[int]", samples=0) is None
+    found = find_counterexample(pre, post, "list[int]")
+    assert 3 in found["x"]
+    assert find_counterexample(pre, post, "list[int]") == found
+
+
+def test_expensive_operations_respect_the_timeout():
+    witnesses.clear()
+    witnesses.add("int", 2**31)
+    start = time.monotonic()
+    pre, post = "10 ** x < 1000000", "10 ** x < 10000000"
+    assert find_counterexample(pre, post, "int", timeout=1.0) is None
+    assert find_counterexample("2 ** x < 1000", "2 ** x < 100", "int") == {"x": 7}
+    assert time.monotonic() - start < 2
+    witnesses.clear()
+
+
+def test_container_parameters_are_checked(no_crosshair):
+    with pytest.raises(SignatureIncompatible) as exc:
+        is_constraint_compatible(
+            _param("len(_) > 1", list[int]), _param("len(_) > 2", list[int])
+        )
+    assert exc.value.context["counterexample"] == {"x": [0, 0]}
+
+
+def test_narrowing_is_refuted_without_crosshair(no_crosshair):
+    with pytest.raises(SignatureIncompatible) as exc:
+        is_constraint_compatible(_param("_ >= 0"), _param("_ > 0"))
+    assert exc.value.context["counterexample"] == {"x": 0}
+
+
+def test_crosshair_counterexamples_are_reused(monkeypatch, no_crosshair):
+    a, b = _param("_ > 1000"), _param("_ > 1000 and _ % 7 != 3")
+    assert (
+        find_counterexample("x > 1000", "x > 1000 and x % 7 != 3", "int", samples=0)
+        is None
+    )
+    witnesses.clear()
+    crosshair_results.clear()
+
+    def refute(pre, post, params, timeout):
+        return CrossHairResult(False, {"x": 1004}, True)
+
+    monkeypatch.setattr(zvic.crosshair_inprocess, "check_implication", refute)
+    with pytest.raises(SignatureIncompatible):
+        is_constraint_compatible(_param("_ > 0"), _param("_ > 0 and _ != 3 * 7654321"))
+    assert witnesses.values("int") == [1004]
+    monkeypatch.setattr(zvic.crosshair_inprocess, "check_implication", no_crosshair)
+    with pytest.raises(SignatureIncompatible) as exc:
+        is_constraint_compatible(a, b)
+    assert exc.value.context["counterexample"] == {"x": 1004}